@@ -9,14 +9,39 @@ from flask_login import LoginManager
 # Create login manager
 login_manager = LoginManager()
 
-def create_app():
+def create_app(test_config=None):
     app = Flask(__name__)
     app.config.from_object(Config)
+    if test_config:
+        app.config.update(test_config)
 
     # Initialise database
     init_db(app)
 
-    # Initialize Flask-Login
+    # Memoise repository reads for the lifetime of a request
+    from Splity.adapters.request_cache import init_request_cache
+    init_request_cache(app)
+
+    # Per-request SQL counts and timings (Server-Timing header + log line)
+    if app.config.get("SQL_INSTRUMENTATION"):
+        from Splity.adapters.instrumentation import init_instrumentation
+        init_instrumentation(app)
+
+    # Load the currency catalogue and start refreshing it in the background
+    from Splity.services import currency_service
+    currency_service.init_app(app)
+
+    # Group page fragments, cached per group version
+    from Splity.home import fragments
+    fragments.init_app(app)
+
+    # {{ amount|money(currency) }} renders stored minor units, e.g. 1250 -> 12.50
+    from Splity.domainmodel import money
+    app.add_template_filter(money.format_amount, "money")
+
+    # Initialize Flask-Login, with signed-in users cached per worker
+    from Splity.services import authentication_services
+    authentication_services.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = "authentication.login"
 
@@ -30,11 +55,17 @@ def create_app():
     from .bills import routes
     app.register_blueprint(routes.bills_blueprint)
 
+    from .api import routes
+    app.register_blueprint(routes.api_blueprint)
+
+    # Register CLI commands
+    from .commands import register_commands
+    register_commands(app)
+
     return app
 
 # User loader for Flask-Login
 @login_manager.user_loader
 def load_user(user_id):
-    from Splity.adapters.repository import UserRepository
-    user_repo = UserRepository()
-    return user_repo.get_by_id(int(user_id))
\ No newline at end of file
+    from Splity.services.authentication_services import load_session_user
+    return load_session_user(int(user_id))
\ No newline at end of file
@@ -0,0 +1,213 @@
+# /Splity_flask/Splity/adapters/cache.py
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Small thread-safe, size-bounded LRU map with hit/miss counters.
+
+    With ``ttl`` set (seconds), an entry older than that is a miss.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                expires, value = self._data[key]
+                if expires is None or time.monotonic() < expires:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def pop_matching(self, predicate) -> int:
+        """Removes every entry whose key satisfies ``predicate``; returns how many went."""
+        with self._lock:
+            doomed = [key for key in self._data if predicate(key)]
+            for key in doomed:
+                del self._data[key]
+            return len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+class FragmentCache:
+    """Rendered page fragments keyed by (name, version).
+
+    Entries never need invalidating: writers bump the version, and readers
+    simply stop asking for the old one. Memory is a bounded LRUCache. With
+    ``directory`` set, each name also keeps its latest version in one JSON
+    file there, so worker processes on the same host share renders; a file
+    holding another version is a miss and is overwritten by the next set().
+    Values must be JSON-serialisable when a directory is used. The number
+    of files is the number of names, so names must come from a bounded
+    set (never from request input); discard() and prune() remove files for
+    names that are gone.
+    """
+
+    def __init__(self, maxsize: int = 256, directory: str = None):
+        self.configure(maxsize, directory)
+
+    def configure(self, maxsize: int, directory: str = None):
+        """Resizes the cache, points it at ``directory`` and drops everything in memory."""
+        self.memory = LRUCache(maxsize)
+        self.directory = directory
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, name: str, version: int, default=None):
+        value = self.memory.get((name, version), _MISSING) if self.memory.maxsize else _MISSING
+        if value is _MISSING and self.directory:
+            value = self._read(name, version)
+            if value is not _MISSING:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(name, version, value)
+        if value is _MISSING:
+            with self._lock:
+                self.misses += 1
+            return default
+        return value
+
+    def set(self, name: str, version: int, value):
+        self._remember(name, version, value)
+        if self.directory:
+            self._write(name, version, value)
+
+    def get_or_set(self, name: str, version: int, render):
+        """Cached value, or ``render()`` stored under (name, version); returns (value, hit)."""
+        value = self.get(name, version, _MISSING)
+        if value is not _MISSING:
+            return value, True
+        value = render()
+        self.set(name, version, value)
+        return value, False
+
+    def discard(self, name: str):
+        """Removes every version of ``name``, in memory and on disk."""
+        self.memory.pop_matching(lambda key: key[0] == name)
+        if not self.directory:
+            return
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not remove fragment %s: %s", name, e)
+
+    def prune(self, live_names) -> int:
+        """Deletes every fragment file not belonging to one of ``live_names``; returns how many went."""
+        if not self.directory or not os.path.isdir(self.directory):
+            return 0
+        keep = {os.path.basename(self._path(name)) for name in live_names}
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json") and entry.name not in keep:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError as e:
+                    logger.warning("Could not remove fragment file %s: %s", entry.name, e)
+        return removed
+
+    def clear(self):
+        self.memory.clear()
+        with self._lock:
+            self.disk_hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        memory_hits = self.memory.stats()["hits"]
+        with self._lock:
+            hits = memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "size": len(self.memory),
+                "maxsize": self.memory.maxsize,
+                "memory_hits": memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, name, version, value):
+        if self.memory.maxsize:
+            self.memory.set((name, version), value)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_.-]", "_", name) + ".json")
+
+    def _read(self, name, version):
+        try:
+            with open(self._path(name), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return _MISSING
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read fragment %s: %s", name, e)
+            return _MISSING
+        return entry["value"] if entry.get("version") == version else _MISSING
+
+    def _write(self, name, version, value):
+        # Unique temp file per writer, then rename, so readers in other
+        # processes never see a half-written fragment
+        path = self._path(name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": version, "value": value}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write fragment %s: %s", name, e)
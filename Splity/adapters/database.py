@@ -1,18 +1,75 @@
 # /Splity_flask/Splity/adapters/database.py
 
+import os
+
+from flask_migrate import Migrate, stamp, upgrade
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, make_url
 
 db = SQLAlchemy()
+migrate = Migrate()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'migrations')
+# Revision matching the schema that db.create_all() produced before migrations existed
+BASELINE_REVISION = '1afbca912085'
+# Engine options that only mean something to a QueuePool
+POOL_SIZING_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
 
 def init_db(app):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+        app.config['SQLALCHEMY_DATABASE_URI'], app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
     db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
 
     with app.app_context():
+        pragmas = app.config.get('SQLITE_PRAGMAS')
+        if pragmas and db.engine.dialect.name == 'sqlite':
+            apply_sqlite_pragmas(db.engine, pragmas)
+
         # Import inside context to register models to this specific 'db' instance
-        from Splity.adapters.orm import UserORM, BillORM, BillParticipantORM, GroupORM
-        print(f"DEBUG: Database is at {app.instance_path}")
-        # Verification print
-        print(f">>> Tables in registry: {list(db.metadata.tables.keys())}")
+        from Splity.adapters.orm import UserORM, BillORM, BillParticipantORM, GroupORM, GroupBalanceORM
+        app.logger.debug("Database at %s, tables: %s", db.engine.url, list(db.metadata.tables.keys()))
+
+        if app.config.get("TESTING"):
+            # Tests build a throwaway schema straight from the models
+            db.create_all()
+        else:
+            upgrade_database()
+
+
+def engine_options(database_uri: str, options: dict) -> dict:
+    """``options`` fitted to the database: in-memory SQLite gets no pool sizing.
+
+    Flask-SQLAlchemy serves an in-memory database from one StaticPool
+    connection, which rejects QueuePool arguments.
+    """
+    url = make_url(database_uri)
+    in_memory = url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+    if not in_memory:
+        return dict(options)
+    return {name: value for name, value in options.items() if name not in POOL_SIZING_OPTIONS}
+
+
+def apply_sqlite_pragmas(engine, pragmas: dict):
+    """Runs ``PRAGMA name=value`` for each of ``pragmas`` on every new connection of ``engine``."""
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+def upgrade_database():
+    """Brings the database to the latest migration.
 
-        db.create_all()
-        print(">>> Database initialized!")
\ No newline at end of file
+    Databases created by db.create_all() before migrations were introduced
+    have the baseline tables but no alembic_version; they are stamped at the
+    baseline first so the later revisions apply on top.
+    """
+    tables = set(inspect(db.engine).get_table_names())
+    if 'users' in tables and 'alembic_version' not in tables:
+        stamp(directory=MIGRATIONS_DIR, revision=BASELINE_REVISION)
+    upgrade(directory=MIGRATIONS_DIR)
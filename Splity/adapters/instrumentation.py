@@ -0,0 +1,146 @@
+# /Splity_flask/Splity/adapters/instrumentation.py
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, request
+from sqlalchemy import event
+
+from Splity.adapters.database import db
+
+logger = logging.getLogger("Splity.sql")
+
+# QueryStats currently collecting on this thread (request, test helper, ...)
+_active = threading.local()
+
+
+class QueryStats:
+    """Query and commit counts, total DB time and the slowest statement for one scope."""
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.commits = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+        self.statements = [] if keep_statements else None
+
+    def add(self, statement: str, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    @property
+    def total_ms(self): return self.total_seconds * 1000
+
+    @property
+    def slowest_ms(self): return self.slowest_seconds * 1000
+
+
+def _collectors():
+    if not hasattr(_active, "stack"):
+        _active.stack = []
+    return _active.stack
+
+
+@contextmanager
+def record_queries(keep_statements: bool = True):
+    """Collects stats for every query run on this thread inside the block."""
+    stats = QueryStats(keep_statements=keep_statements)
+    _collectors().append(stats)
+    try:
+        yield stats
+    finally:
+        _collectors().remove(stats)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("splity_query_start", []).append(time.perf_counter())
+    if context is not None:
+        context.splity_timed = True
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.splity_timed = False
+    elapsed = time.perf_counter() - conn.info["splity_query_start"].pop()
+    for stats in _collectors():
+        stats.add(statement, elapsed)
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; take its start
+    # off the stack here, or every later timing pairs with the wrong one.
+    # Errors raised before before_cursor_execute ran pushed nothing.
+    if not getattr(context.execution_context, "splity_timed", False):
+        return
+    context.execution_context.splity_timed = False
+    elapsed = time.perf_counter() - context.connection.info["splity_query_start"].pop()
+    for stats in _collectors():
+        stats.add(context.statement, elapsed)
+
+
+def _on_commit(conn):
+    for stats in _collectors():
+        stats.commits += 1
+
+
+def init_instrumentation(app):
+    """Hooks the engine and request cycle to report per-request SQL usage.
+
+    Every response gets a Server-Timing header (total DB time, query count
+    and slowest statement time) and one JSON log line on ``Splity.sql``.
+    """
+    with app.app_context():
+        engine = db.engine
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+            event.listen(engine, "commit", _on_commit)
+
+    @app.before_request
+    def _start_sql_stats():
+        g.request_started = time.perf_counter()
+        g.sql_stats = QueryStats()
+        _collectors().append(g.sql_stats)
+
+    @app.after_request
+    def _report_sql_stats(response):
+        stats = g.pop("sql_stats", None)
+        if stats is None:
+            return response
+        _collectors().remove(stats)
+        total_ms = (time.perf_counter() - g.pop("request_started")) * 1000
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries", '
+            f'db-slowest;dur={stats.slowest_ms:.2f}, app;dur={total_ms:.2f}'
+        )
+        logger.info(json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "queries": stats.count,
+            "commits": stats.commits,
+            "db_ms": round(stats.total_ms, 2),
+            "slowest_ms": round(stats.slowest_ms, 2),
+            "slowest_sql": stats.slowest_statement,
+            "total_ms": round(total_ms, 2),
+        }))
+        return response
+
+    @app.teardown_request
+    def _discard_sql_stats(exc):
+        # after_request is skipped when a view raises; don't leak the collector
+        stats = g.pop("sql_stats", None)
+        if stats is not None and stats in _collectors():
+            _collectors().remove(stats)
@@ -5,11 +5,17 @@ from datetime import datetime, timezone
 
 user_groups = db.Table('user_groups',
     db.Column('user_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
-    db.Column('group_id', db.Integer, db.ForeignKey('groups.id'), primary_key=True)
+    db.Column('group_id', db.Integer, db.ForeignKey('groups.id'), primary_key=True),
+    # The primary key serves user -> groups; members of a group need the reverse
+    db.Index('ix_user_groups_group_id_user_id', 'group_id', 'user_id')
 )
 
 class GroupORM(db.Model):
     __tablename__ = 'groups'
+    __table_args__ = (
+        # Covers creator_id lookups and get_by_name_and_creator
+        db.Index('ix_groups_creator_id_name', 'creator_id', 'name'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.String(200), nullable=False)
@@ -17,6 +23,11 @@ class GroupORM(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     invite_code = db.Column(db.String(10), unique=True, nullable=False)
+    simplify_debts = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    # Bumped by every write that changes what the group page shows
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Last seq handed out in group_changes; appends claim theirs by bumping it
+    change_seq = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     members = db.relationship("UserORM", secondary=user_groups, backref="groups")
 
 class UserORM(db.Model):
@@ -31,20 +42,57 @@ class UserORM(db.Model):
 
 class BillORM(db.Model):
     __tablename__ = 'bills'
+    __table_args__ = (
+        # Covers get_all_bills and get_all_bills_in_group_by_user; with amount in
+        # it, spending totals and ledger recomputes never touch the table
+        db.Index('ix_bills_group_id_user_id_amount', 'group_id', 'user_id', 'amount'),
+        db.Index('ix_bills_group_id_description', 'group_id', 'description'),
+        db.Index('ix_bills_user_id', 'user_id'),
+        # Keyset pagination of a group's bill history, newest first
+        db.Index('ix_bills_group_id_date_id', 'group_id', 'date', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     description = db.Column(db.String(200), nullable=False)
     date = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
-    amount = db.Column(db.Float, nullable=False)
+    # Integer minor units of the group's currency (cents for USD, yen for JPY)
+    amount = db.Column(db.Integer, nullable=False)
     group_id = db.Column(db.Integer, db.ForeignKey('groups.id'), nullable=True)
 
 
 class BillParticipantORM(db.Model):
     __tablename__ = 'bill_participants'
+    __table_args__ = (
+        # Covers participants-of-bill lookups and mark_paid, and (with
+        # amount_owed) the owed side of a ledger recompute
+        db.Index('ix_bill_participants_bill_id_user_id_amount_owed', 'bill_id', 'user_id', 'amount_owed'),
+        db.Index('ix_bill_participants_user_id', 'user_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     bill_id = db.Column(db.Integer, db.ForeignKey('bills.id'), nullable=False)
-    amount_owed = db.Column(db.Float, nullable=False)
-    has_paid = db.Column(db.Boolean, nullable=False, default=False)
\ No newline at end of file
+    # Minor units; a bill's shares add up to its amount exactly
+    amount_owed = db.Column(db.Integer, nullable=False)
+    has_paid = db.Column(db.Boolean, nullable=False, default=False)
+
+class GroupBalanceORM(db.Model):
+    __tablename__ = 'group_balances'
+
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    # Minor units of the group's currency, despite the name
+    net_cents = db.Column(db.Integer, nullable=False, default=0)
+
+class GroupChangeORM(db.Model):
+    """Append-only log of what changed in a group, for clients syncing deltas"""
+    __tablename__ = 'group_changes'
+
+    group_id = db.Column(db.Integer, db.ForeignKey('groups.id'), primary_key=True)
+    # Per-group sequence: 1, 2, 3, ... in commit order
+    seq = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    kind = db.Column(db.String(40), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=True)
+    data = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
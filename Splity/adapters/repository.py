@@ -1,13 +1,38 @@
 # /Splity_flask/Splity/adapters/repository.py
 
+from typing import List, Tuple
+
+from sqlalchemy import insert, delete, update, select, exists, func, tuple_, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
+
 from Splity.adapters.database import db
-from Splity.adapters.orm import UserORM, BillORM, BillParticipantORM, GroupORM
-from Splity.domainmodel.models import User, Bill, BillParticipant, Group
+from Splity.adapters.orm import UserORM, BillORM, BillParticipantORM, GroupORM, GroupBalanceORM, GroupChangeORM, \
+    user_groups
+from Splity.adapters.request_cache import request_cached, invalidates_request_cache
+from Splity.domainmodel.models import User, Bill, BillParticipant, Group, UserSummary, BillSummary
+
+
+# Repository writes flush but never commit: the calling service owns the
+# transaction through Splity.adapters.unit_of_work.UnitOfWork.
+#
+# Hot reads run statements built once, at import, with bindparam()
+# placeholders. SQLAlchemy memoises the cache key on the statement object,
+# so each call skips building the tree and looks its compiled SQL up in
+# the engine's cache; only the parameters change.
 
 
 class UserRepository:
     """Handles all User database operations"""
 
+    _BY_USERNAME = select(UserORM).where(UserORM.username == bindparam("username")).limit(1)
+    _BY_EMAIL = select(UserORM).where(UserORM.email == bindparam("email")).limit(1)
+    _SUMMARY_BY_ID = select(UserORM.id, UserORM.name, UserORM.username, UserORM.email) \
+        .where(UserORM.id == bindparam("user_id"))
+    _LOGIN_BY_USERNAME = select(UserORM.id, UserORM.name, UserORM.username, UserORM.email, UserORM.password) \
+        .where(UserORM.username == bindparam("username")).limit(1)
+
+    @invalidates_request_cache
     def add(self, user: User):
         user_orm = UserORM(
             name=user.name,
@@ -16,22 +41,39 @@ class UserRepository:
             password=user.password
         )
         db.session.add(user_orm)
-        db.session.commit()
+        db.session.flush()
         return user_orm.id
 
+    @request_cached
     def get_by_id(self, user_id: int):
         user_orm = db.session.get(UserORM, user_id)
         return self._to_domain(user_orm) if user_orm else None
 
+    @request_cached
+    def get_summary_by_id(self, user_id: int):
+        """User without password or groups, for display-only lookups"""
+        row = db.session.execute(self._SUMMARY_BY_ID, {"user_id": user_id}).first()
+        return self.summary_from_row(*row) if row else None
+
+    def get_login_by_username(self, username: str):
+        """Row (id, name, username, email, password) for signing in, or None; skips the user's groups"""
+        return db.session.execute(self._LOGIN_BY_USERNAME, {"username": username}).first()
+
+    @staticmethod
+    def summary_from_row(user_id: int, name: str, username: str, email: str) -> User:
+        return User(user_id=user_id, name=name, username=username, email=email)
+
+    @request_cached
     def get_by_email(self, email: str):
         """Find user by email"""
-        user_orm = UserORM.query.filter_by(email=email).first()
+        user_orm = db.session.scalars(self._BY_EMAIL, {"email": email}).first()
         if user_orm:
             return self._to_domain(user_orm)
         return None
 
+    @request_cached
     def get_by_username(self, username: str):
-        user_orm = UserORM.query.filter_by(username=username).first()
+        user_orm = db.session.scalars(self._BY_USERNAME, {"username": username}).first()
         return self._to_domain(user_orm) if user_orm else None
 
     def get_all(self):
@@ -55,26 +97,120 @@ class UserRepository:
                 creator_id=group_orm.creator_id,
                 group_id=group_orm.id,
                 description=group_orm.description,
+                invite_code=group_orm.invite_code,
             )
             user.add_group(domain_group)
         return user
 
 
+def dialect_insert(dialect_name: str):
+    """INSERT construct with ON CONFLICT support for the backend (SQLite, or PostgreSQL via DATABASE_URL)"""
+    return postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+
+
+# Money columns hold integer minor units (see Splity.domainmodel.money), so
+# every SUM and ledger delta below is exact
+
+
+def bill_deltas(payer_id: int, amount: int, participants: List[Tuple[int, int]], deltas: dict = None) -> dict:
+    """Adds one bill's effect on the ledger (payer up, participants down) to ``deltas``"""
+    deltas = {} if deltas is None else deltas
+    deltas[payer_id] = deltas.get(payer_id, 0) + amount
+    for user_id, amount_owed in participants:
+        deltas[user_id] = deltas.get(user_id, 0) - amount_owed
+    return deltas
+
+
 class BillRepository:
     """Handles all Bill database operations"""
 
-    def create(self, bill: Bill):
+    _IN_GROUP = select(BillORM).where(BillORM.group_id == bindparam("group_id"))
+    _IN_GROUP_BY_USER = _IN_GROUP.where(BillORM.user_id == bindparam("user_id"))
+    _CREATED_BY_USER = select(BillORM).where(BillORM.user_id == bindparam("user_id"))
+    _BY_DESCRIPTION = _IN_GROUP.where(BillORM.description == bindparam("description")).limit(1)
+    _TOTAL_SPENDING = select(func.coalesce(func.sum(BillORM.amount), 0)) \
+        .where(BillORM.group_id == bindparam("group_id"))
+
+    # Columns behind the (BillSummary, UserSummary) pairs of the listings
+    _LISTING_COLUMNS = (BillORM.id, BillORM.user_id, BillORM.description, BillORM.amount, BillORM.date,
+                        BillORM.group_id, UserORM.id, UserORM.name, UserORM.username, UserORM.email)
+    _LISTING = select(*_LISTING_COLUMNS).join(UserORM, UserORM.id == BillORM.user_id) \
+        .where(BillORM.group_id == bindparam("group_id"))
+    _LISTING_BY_ID = _LISTING.order_by(BillORM.id)
+    _NEWEST_FIRST = (BillORM.date.desc(), BillORM.id.desc())
+    _FIRST_PAGE = _LISTING.order_by(*_NEWEST_FIRST).limit(bindparam("limit"))
+    _NEXT_PAGE = _LISTING.where(
+        tuple_(BillORM.date, BillORM.id)
+        < tuple_(bindparam("before_date", type_=BillORM.date.type), bindparam("before_id"))
+    ).order_by(*_NEWEST_FIRST).limit(bindparam("limit"))
+
+    @invalidates_request_cache
+    def create_with_participants(self, bill: Bill, participants: List[Tuple[int, int]]):
+        """Insert a bill, all of its participant rows and its ledger deltas.
+
+        Participants are (user_id, amount_owed) pairs and are written with a
+        single bulk INSERT.
+        """
         bill_orm = BillORM(
             user_id=bill.user_id,
             description=bill.description,
             date=bill.date,
             amount=bill.amount,
-            group_id = bill.group_id
+            group_id=bill.group_id
         )
         db.session.add(bill_orm)
-        db.session.commit()
+        db.session.flush()
+        if participants:
+            db.session.execute(
+                insert(BillParticipantORM),
+                [
+                    {"bill_id": bill_orm.id, "user_id": user_id, "amount_owed": amount_owed, "has_paid": False}
+                    for user_id, amount_owed in participants
+                ]
+            )
+        if bill.group_id is not None:
+            GroupBalanceRepository().apply_deltas(bill.group_id, bill_deltas(bill.user_id, bill.amount, participants))
+            GroupRepository().bump_version(bill.group_id)
         return bill_orm.id
 
+    @invalidates_request_cache
+    def create_many(self, group_id: int, bills: List[Tuple[Bill, List[Tuple[int, int]]]]):
+        """Bulk version of create_with_participants for one group.
+
+        One INSERT for the bills, one for all their participants, one
+        ledger update and one version bump, however many bills there are.
+        Descriptions must be unique within the group (add_bill_service's
+        rule): RETURNING order is not guaranteed on every backend, so new
+        ids are matched back to bills by description. Returns the new bill
+        ids in the order of ``bills``.
+        """
+        if not bills:
+            return []
+        returned = db.session.execute(
+            insert(BillORM).returning(BillORM.description, BillORM.id),
+            [
+                {"user_id": bill.user_id, "description": bill.description, "date": bill.date,
+                 "amount": bill.amount, "group_id": group_id}
+                for bill, _ in bills
+            ]
+        )
+        ids_by_description = {description: bill_id for description, bill_id in returned}
+        bill_ids = [ids_by_description[bill.description] for bill, _ in bills]
+        participant_rows = [
+            {"bill_id": bill_id, "user_id": user_id, "amount_owed": amount_owed, "has_paid": False}
+            for bill_id, (_, participants) in zip(bill_ids, bills)
+            for user_id, amount_owed in participants
+        ]
+        if participant_rows:
+            db.session.execute(insert(BillParticipantORM), participant_rows)
+        deltas = {}
+        for bill, participants in bills:
+            bill_deltas(bill.user_id, bill.amount, participants, deltas)
+        GroupBalanceRepository().apply_deltas(group_id, deltas)
+        GroupRepository().bump_version(group_id)
+        return bill_ids
+
+    @request_cached
     def get_by_id(self, bill_id: int):
         """Get bill by ID"""
         bill_orm = db.session.get(BillORM, bill_id)
@@ -90,30 +226,116 @@ class BillRepository:
         bills_orm = BillORM.query.filter(BillORM.id.in_(bill_ids)).all()
         return [self._to_domain(b) for b in bills_orm]
 
+    def get_existing_descriptions(self, group_id: int, descriptions) -> set:
+        """Which of ``descriptions`` are already used by a bill in the group, in one query"""
+        if not descriptions:
+            return set()
+        return set(db.session.scalars(
+            select(BillORM.description)
+            .where(BillORM.group_id == group_id, BillORM.description.in_(list(descriptions)))
+        ))
+
+    @request_cached
     def get_bill_by_name_and_group_id(self, description: str, group_id: int):
-        bill = BillORM.query.filter_by(description=description, group_id=group_id).first()
+        bill = db.session.scalars(self._BY_DESCRIPTION, {"group_id": group_id, "description": description}).first()
         return self._to_domain(bill) if bill else None
 
     def get_bills_created_by_user(self, user_id: int):
         """Get all bills created by user"""
-        bills_orm = BillORM.query.filter_by(user_id=user_id).all()
+        bills_orm = db.session.scalars(self._CREATED_BY_USER, {"user_id": user_id})
         return [self._to_domain(b) for b in bills_orm]
 
+    @request_cached
     def get_all_bills(self, group_id: int):
-        bills_orm = BillORM.query.filter_by(group_id=group_id).all()
-        return[self._to_domain(b) for b in bills_orm]
+        bills_orm = db.session.scalars(self._IN_GROUP, {"group_id": group_id})
+        return [self._to_domain(b) for b in bills_orm]
+
+    @staticmethod
+    def _listing_pair(row) -> Tuple[BillSummary, UserSummary]:
+        return BillSummary(*row[:6]), UserSummary(*row[6:])
+
+    @request_cached
+    def get_all_bills_with_creators(self, group_id: int):
+        """(bill, creator) pairs of read-only summaries for a group, in one joined query"""
+        rows = db.session.execute(self._LISTING_BY_ID, {"group_id": group_id}).all()
+        return [self._listing_pair(row) for row in rows]
+
+    @request_cached
+    def get_bills_page(self, group_id: int, limit: int, before: Tuple = None):
+        """Newest-first (bill, creator) summary pairs for a group, ``limit`` at a time.
+
+        ``before`` is the (date, id) of the last bill on the previous page.
+        The keyset condition and the ORDER BY both run on
+        ix_bills_group_id_date_id, so a page deep in the history costs the
+        same as the first one. Returns (pairs, has_more).
+        """
+        params = {"group_id": group_id, "limit": limit + 1}
+        if before is None:
+            rows = db.session.execute(self._FIRST_PAGE, params).all()
+        else:
+            params["before_date"], params["before_id"] = before
+            rows = db.session.execute(self._NEXT_PAGE, params).all()
+        page = [self._listing_pair(row) for row in rows[:limit]]
+        return page, len(rows) > limit
+
+    @request_cached
+    def get_total_spending(self, group_id: int):
+        """Sum of every bill in the group in minor units, without loading the bills"""
+        return db.session.execute(self._TOTAL_SPENDING, {"group_id": group_id}).scalar()
+
+    def iter_ledger_rows(self, group_id: int, batch_size: int = 1000):
+        """Streams one row per bill participant for the group, oldest bill first.
+
+        Rows are (bill_id, date, description, amount, paid_by, participant,
+        amount_owed, has_paid), with usernames for paid_by and participant;
+        a bill without participants yields one row with the last three
+        empty. The result is read through a server-side cursor and handed
+        out ``batch_size`` rows at a time, so memory stays flat however
+        big the group is. Never request-cached.
+        """
+        payer = aliased(UserORM)
+        participant = aliased(UserORM)
+        # Core execution on the session's connection: plain rows, no ORM loading overhead
+        result = db.session.connection().execute(
+            select(BillORM.id, BillORM.date, BillORM.description, BillORM.amount, payer.username,
+                   participant.username, BillParticipantORM.amount_owed, BillParticipantORM.has_paid)
+            .join(payer, payer.id == BillORM.user_id)
+            .outerjoin(BillParticipantORM, BillParticipantORM.bill_id == BillORM.id)
+            .outerjoin(participant, participant.id == BillParticipantORM.user_id)
+            .where(BillORM.group_id == group_id)
+            .order_by(BillORM.date, BillORM.id)
+            .execution_options(stream_results=True, yield_per=batch_size)
+        )
+        try:
+            for batch in result.partitions():
+                yield batch
+        finally:
+            result.close()
 
+    @request_cached
     def get_all_bills_in_group_by_user(self, group_id: int, user_id: int):
-        bills_orm = BillORM.query.filter_by(group_id=group_id, user_id=user_id).all()
-        return[self._to_domain(b) for b in bills_orm]
+        bills_orm = db.session.scalars(self._IN_GROUP_BY_USER, {"group_id": group_id, "user_id": user_id})
+        return [self._to_domain(b) for b in bills_orm]
 
 
+    @invalidates_request_cache
     def delete_bill(self, bill_id: int):
         bill_orm = db.session.get(BillORM, bill_id)
         if bill_orm:
+            if bill_orm.group_id is not None:
+                # Reverse the bill's effect on the ledger before its rows go
+                deltas = {bill_orm.user_id: -bill_orm.amount}
+                owed = db.session.execute(
+                    select(BillParticipantORM.user_id, BillParticipantORM.amount_owed)
+                    .where(BillParticipantORM.bill_id == bill_id)
+                ).all()
+                for user_id, amount_owed in owed:
+                    deltas[user_id] = deltas.get(user_id, 0) + amount_owed
+                GroupBalanceRepository().apply_deltas(bill_orm.group_id, deltas)
+                GroupRepository().bump_version(bill_orm.group_id)
             BillParticipantORM.query.filter_by(bill_id=bill_id).delete()
             db.session.delete(bill_orm)
-            db.session.commit()
+            db.session.flush()
             return True
         return False
 
@@ -130,21 +352,12 @@ class BillRepository:
 class BillParticipantRepository:
     """Handles BillParticipant operations"""
 
-    def add_participant(self, bill_id: int, user_id: int, amount_owed: float):
-        """Add a participant to a bill"""
-        participant = BillParticipantORM(
-            bill_id=bill_id,
-            user_id=user_id,
-            amount_owed=amount_owed,
-            has_paid=False
-        )
-        db.session.add(participant)
-        db.session.commit()
-        return participant.id
+    _FOR_BILL = select(BillParticipantORM).where(BillParticipantORM.bill_id == bindparam("bill_id"))
 
+    @request_cached
     def get_participants_for_bill(self, bill_id: int):
         """Get all participants for a bill"""
-        participants_orm = BillParticipantORM.query.filter_by(bill_id=bill_id).all()
+        participants_orm = db.session.scalars(self._FOR_BILL, {"bill_id": bill_id})
         return [self._to_domain(p) for p in participants_orm]
 
     def get_bills_for_user(self, user_id: int):
@@ -152,6 +365,7 @@ class BillParticipantRepository:
         participants_orm = BillParticipantORM.query.filter_by(user_id=user_id).all()
         return [self._to_domain(p) for p in participants_orm]
 
+    @invalidates_request_cache
     def mark_paid(self, bill_id: int, user_id: int):
         """Mark a participant as having paid"""
         participant = BillParticipantORM.query.filter_by(
@@ -160,14 +374,22 @@ class BillParticipantRepository:
         ).first()
         if participant:
             participant.has_paid = True
-            db.session.commit()
+            db.session.flush()
+            self._bump_group_version(bill_id)
             return True
         return False
 
+    @request_cached
     def all_participants_in_group(self, bill_id: int):
-        participants = BillParticipantORM.query.filter_by(bill_id=bill_id).all()
+        participants = db.session.scalars(self._FOR_BILL, {"bill_id": bill_id})
         return [self._to_domain(p) for p in participants]
 
+    @staticmethod
+    def _bump_group_version(bill_id: int):
+        bill_orm = db.session.get(BillORM, bill_id)
+        if bill_orm and bill_orm.group_id is not None:
+            GroupRepository().bump_version(bill_orm.group_id)
+
     def _to_domain(self, participant_orm: BillParticipantORM) -> BillParticipant:
         return BillParticipant(
             participant_id=participant_orm.id,
@@ -179,13 +401,30 @@ class BillParticipantRepository:
 
 
 class GroupRepository:
+    _BY_INVITE_CODE = select(GroupORM).where(GroupORM.invite_code == bindparam("invite_code")).limit(1)
+    _ID_BY_INVITE_CODE = select(GroupORM.id).where(GroupORM.invite_code == bindparam("invite_code"))
+    _BY_NAME_AND_CREATOR = select(GroupORM) \
+        .where(GroupORM.name == bindparam("name"), GroupORM.creator_id == bindparam("creator_id")).limit(1)
+    _BY_NAME_AND_MEMBERSHIP = select(GroupORM) \
+        .join(user_groups, user_groups.c.group_id == GroupORM.id) \
+        .where(GroupORM.name == bindparam("name"), user_groups.c.user_id == bindparam("user_id")).limit(1)
+    _MEMBERSHIP = exists().where(user_groups.c.group_id == bindparam("group_id"),
+                                 user_groups.c.user_id == bindparam("user_id"))
+    _IS_MEMBER = select(_MEMBERSHIP)
+    _VERSION_FOR_MEMBER = select(GroupORM.version).where(GroupORM.id == bindparam("group_id"), _MEMBERSHIP)
+    _MEMBERS = select(UserORM.id, UserORM.name, UserORM.username, UserORM.email) \
+        .join(user_groups, user_groups.c.user_id == UserORM.id) \
+        .where(user_groups.c.group_id == bindparam("group_id"))
+
+    @invalidates_request_cache
     def add(self, group: Group):
         group_orm = GroupORM(
             name=group.name,
             description=group.description,  # FIX: Save the description
             currency=group.currency,
             invite_code=group.invite_code,
-            creator_id=group.creator_id
+            creator_id=group.creator_id,
+            simplify_debts=group.simplify_debts
         )
         # Add the creator as the first member automatically
         creator_orm = db.session.get(UserORM, group.creator_id)
@@ -193,41 +432,59 @@ class GroupRepository:
             group_orm.members.append(creator_orm)
 
         db.session.add(group_orm)
-        db.session.commit()
+        db.session.flush()
         return group_orm.id
 
 
+    @invalidates_request_cache
     def join_by_code(self, user_id: int, invite_code: str):
-        group_orm = GroupORM.query.filter_by(invite_code=invite_code).first()
+        # Only the id is needed; no group entity is loaded
+        group_id = db.session.execute(self._ID_BY_INVITE_CODE, {"invite_code": invite_code}).scalar()
         user_orm = db.session.get(UserORM, user_id)
-        if group_orm and user_orm:
-            if user_orm not in group_orm.members:
-                group_orm.members.append(user_orm)
-                db.session.commit()
+        if group_id is not None and user_orm:
+            if not self.is_member(group_id, user_id):
+                # Insert the link row directly rather than loading every member
+                db.session.execute(insert(user_groups).values(user_id=user_id, group_id=group_id))
+                # A returning member picks their bill history back up
+                GroupBalanceRepository().refresh_member(group_id, user_id)
+                self.bump_version(group_id)
+                db.session.flush()
                 return True
         return False
 
+    @request_cached
+    def is_member(self, group_id: int, user_id: int) -> bool:
+        """Indexed EXISTS on user_groups; never loads the member list"""
+        return db.session.execute(self._IS_MEMBER, {"group_id": group_id, "user_id": user_id}).scalar()
+
+    @request_cached
+    def get_version_for_member(self, group_id: int, user_id: int):
+        """The group's version if the user is a member, else None; one indexed query"""
+        return db.session.execute(self._VERSION_FOR_MEMBER, {"group_id": group_id, "user_id": user_id}).scalar()
+
+    @request_cached
     def get_by_name_and_creator(self, name: str, creator_id: int):
         """Finds if this specific user already has a group with this name."""
-        group_orm = GroupORM.query.filter_by(name=name, creator_id=creator_id).first()
+        group_orm = db.session.scalars(self._BY_NAME_AND_CREATOR, {"name": name, "creator_id": creator_id}).first()
         return self._to_domain(group_orm) if group_orm else None
 
+    @request_cached
     def get_by_name_and_membership(self, name: str, user_id: int):
-        # We join GroupORM to its 'members' relationship
-        group_orm = db.session.query(GroupORM) \
-            .join(GroupORM.members) \
-            .filter(
-            GroupORM.name == name,
-            UserORM.id == user_id
-        ) \
-            .first()
+        # Through user_groups alone; the users table has nothing to add
+        group_orm = db.session.scalars(self._BY_NAME_AND_MEMBERSHIP, {"name": name, "user_id": user_id}).first()
 
         return self._to_domain(group_orm) if group_orm else None
 
+    @request_cached
     def get_by_invite_code(self, invite_code: str):
-        group_orm = GroupORM.query.filter_by(invite_code=invite_code.upper()).first()
+        group_orm = db.session.scalars(self._BY_INVITE_CODE, {"invite_code": invite_code.upper()}).first()
         return self._to_domain(group_orm) if group_orm else None
 
+    def get_fragment_keys(self):
+        """Rows (id, invite_code) of every group, what its page fragments are named by"""
+        return db.session.execute(select(GroupORM.id, GroupORM.invite_code)).all()
+
+    @request_cached
     def get_user_groups(self, user_id: int):
         user_orm = db.session.get(UserORM, user_id)
         if user_orm:
@@ -235,62 +492,92 @@ class GroupRepository:
         return []
 
 
+    @request_cached
     def get_by_id(self, group_id: int):
         group_orm = db.session.get(GroupORM, group_id)
         return self._to_domain(group_orm) if group_orm else None
 
-    def get_group_members(self, group_id: int):
-        group_orm = db.session.get(GroupORM, group_id)
-        if not group_orm:
-            return []
-
-        members = []
-        for user_orm in group_orm.members:
-            user = User(
-                user_id=user_orm.id,
-                name=user_orm.name,
-                username=user_orm.username,
-                email=user_orm.email,
-                password=user_orm.password
-            )
-            members.append(user)
+    def get_member_ids_by_username(self, group_id: int, usernames) -> dict:
+        """{username: user_id} for those of ``usernames`` who are in the group, in one query"""
+        if not usernames:
+            return {}
+        rows = db.session.execute(
+            select(UserORM.username, UserORM.id)
+            .join(user_groups, user_groups.c.user_id == UserORM.id)
+            .where(user_groups.c.group_id == group_id, UserORM.username.in_(list(usernames)))
+        )
+        return {username: user_id for username, user_id in rows}
 
-        return members
+    @request_cached
+    def get_group_members(self, group_id: int):
+        # Straight through user_groups; no need to load the group row first
+        rows = db.session.execute(self._MEMBERS, {"group_id": group_id})
+        return [UserSummary(*row) for row in rows]
 
 
+    @invalidates_request_cache
     def edit_group_name(self, group_id: int, new_name: str):
         group_orm = db.session.get(GroupORM, group_id)
         if group_orm:
             group_orm.name = new_name
-            db.session.commit()
+            group_orm.version += 1
+            db.session.flush()
             return True
         return False
 
 
+    @invalidates_request_cache
     def edit_group_description(self, group_id: int, new_description: str):
         group_orm = db.session.get(GroupORM, group_id)
         if group_orm:
             group_orm.description = new_description
-            db.session.commit()
+            group_orm.version += 1
+            db.session.flush()
             return True
         return False
 
-    def remove_member(self, group_id: int, user_id: int):
+    @invalidates_request_cache
+    def set_simplify_debts(self, group_id: int, simplify_debts: bool):
         group_orm = db.session.get(GroupORM, group_id)
-        user_orm = db.session.get(UserORM, user_id)
-        if group_orm and user_orm:
-            if user_orm in group_orm.members:
-                group_orm.members.remove(user_orm)
-                db.session.commit()
-                return True
+        if group_orm:
+            group_orm.simplify_debts = simplify_debts
+            group_orm.version += 1
+            db.session.flush()
+            return True
         return False
 
+    @invalidates_request_cache
+    def bump_version(self, group_id: int):
+        """Marks everything cached for the group's current version as stale"""
+        db.session.execute(
+            update(GroupORM).where(GroupORM.id == group_id).values(version=GroupORM.version + 1)
+        )
 
+    @invalidates_request_cache
+    def remove_member(self, group_id: int, user_id: int):
+        if self.is_member(group_id, user_id):
+            db.session.execute(
+                delete(user_groups).where(user_groups.c.group_id == group_id, user_groups.c.user_id == user_id)
+            )
+            GroupBalanceRepository().remove_member(group_id, user_id)
+            self.bump_version(group_id)
+            db.session.flush()
+            return True
+        return False
+
+
+    @invalidates_request_cache
     def delete_group(self, group_id: int):
         group_orm = db.session.get(GroupORM, group_id)
         if group_orm:
+            # SQLite gives the next group this id; nothing of this one may be left for it to inherit
+            bill_ids = select(BillORM.id).where(BillORM.group_id == group_id)
+            BillParticipantORM.query.filter(BillParticipantORM.bill_id.in_(bill_ids)).delete(synchronize_session=False)
+            BillORM.query.filter_by(group_id=group_id).delete()
+            GroupBalanceORM.query.filter_by(group_id=group_id).delete()
+            GroupChangeORM.query.filter_by(group_id=group_id).delete()
             db.session.delete(group_orm)
-            db.session.commit()
+            db.session.flush()
             return True
         return False
 
@@ -302,5 +589,148 @@ class GroupRepository:
             description=group_orm.description, # FIX: Pass description
             currency=group_orm.currency,
             creator_id=group_orm.creator_id,
-            invite_code=group_orm.invite_code   # FIX: Pass the code from DB
+            invite_code=group_orm.invite_code,   # FIX: Pass the code from DB
+            simplify_debts=group_orm.simplify_debts,
+            version=group_orm.version
+        )
+
+
+class GroupBalanceRepository:
+    """Materialised per-group net balances (paid minus owed, in minor units).
+
+    Rows exist for current members only. The write helpers are called from
+    the bill and membership writes so the ledger lands in the same
+    transaction.
+    """
+
+    _NET_CENTS = select(GroupBalanceORM.user_id, GroupBalanceORM.net_cents) \
+        .where(GroupBalanceORM.group_id == bindparam("group_id"))
+
+    @request_cached
+    def get_net_cents(self, group_id: int):
+        rows = db.session.execute(self._NET_CENTS, {"group_id": group_id})
+        return {user_id: net_cents for user_id, net_cents in rows}
+
+    def apply_deltas(self, group_id: int, deltas: dict):
+        """Add per-user minor-unit deltas to the group's ledger rows.
+
+        One upsert adding to the stored value in SQL. Reading the rows and
+        writing back a sum computed in Python lost any bill committed in
+        between: pysqlite only takes the write lock at the first DML, so
+        that read is not protected.
+        """
+        if not deltas:
+            return
+        balances = GroupBalanceORM.__table__
+        upsert = dialect_insert(db.engine.dialect.name)(balances)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[balances.c.group_id, balances.c.user_id],
+            set_={"net_cents": balances.c.net_cents + upsert.excluded.net_cents},
+        )
+        db.session.execute(upsert, [
+            {"group_id": group_id, "user_id": user_id, "net_cents": delta} for user_id, delta in deltas.items()
+        ])
+
+    def refresh_member(self, group_id: int, user_id: int):
+        """Recompute one member's row from their bills in the group"""
+        net_cents = self.recompute(group_id, user_ids=[user_id]).get(user_id, 0)
+        row = db.session.get(GroupBalanceORM, (group_id, user_id))
+        if row:
+            row.net_cents = net_cents
+        elif net_cents:
+            db.session.add(GroupBalanceORM(group_id=group_id, user_id=user_id, net_cents=net_cents))
+
+    def remove_member(self, group_id: int, user_id: int):
+        GroupBalanceORM.query.filter_by(group_id=group_id, user_id=user_id).delete()
+
+    def recompute(self, group_id: int, user_ids=None):
+        """Full recompute of net minor units from bills, for current members or ``user_ids``.
+
+        Paid and owed totals are two exact integer GROUP BYs, each answered
+        from a covering index, so no bill or participant row is loaded
+        into Python however large the group is.
+        """
+        if user_ids is None:
+            user_ids = select(user_groups.c.user_id).where(user_groups.c.group_id == group_id)
+        else:
+            user_ids = list(user_ids)
+        paid = db.session.execute(
+            select(BillORM.user_id, func.sum(BillORM.amount))
+            .where(BillORM.group_id == group_id, BillORM.user_id.in_(user_ids))
+            .group_by(BillORM.user_id)
+        )
+        net_cents = dict(paid.all())
+        owed = db.session.execute(
+            select(BillParticipantORM.user_id, func.sum(BillParticipantORM.amount_owed))
+            .join(BillORM, BillORM.id == BillParticipantORM.bill_id)
+            .where(BillORM.group_id == group_id)
+            .group_by(BillParticipantORM.user_id)
+            # Filtering members in WHERE would probe the index once per member per bill
+            .having(BillParticipantORM.user_id.in_(user_ids))
         )
+        for user_id, amount_owed in owed:
+            net_cents[user_id] = net_cents.get(user_id, 0) - amount_owed
+        return net_cents
+
+    @invalidates_request_cache
+    def rebuild(self, group_id: int):
+        """Replace the group's ledger rows with a full recompute"""
+        GroupBalanceORM.query.filter_by(group_id=group_id).delete()
+        for user_id, net_cents in self.recompute(group_id).items():
+            db.session.add(GroupBalanceORM(group_id=group_id, user_id=user_id, net_cents=net_cents))
+        GroupRepository().bump_version(group_id)
+        db.session.flush()
+
+    def get_all_group_ids(self):
+        return [group_id for group_id, in db.session.execute(select(GroupORM.id))]
+
+
+class GroupChangeRepository:
+    """Append-only per-group change log read by syncing clients.
+
+    Entries are (seq, kind, entity_id, data, created_at) where ``seq`` counts
+    up from 1 within each group. Services append in the same unit of work
+    as the write they describe, so an entry exists exactly when its change
+    was committed.
+    """
+
+    _CLAIM_SEQS = update(GroupORM).where(GroupORM.id == bindparam("group_id")) \
+        .values(change_seq=GroupORM.change_seq + bindparam("count")).returning(GroupORM.change_seq) \
+        .execution_options(synchronize_session=False)
+    _LATEST_SEQ = select(GroupORM.change_seq).where(GroupORM.id == bindparam("group_id"))
+
+    @invalidates_request_cache
+    def append(self, group_id: int, changes: List[Tuple[str, int, dict]]) -> int:
+        """Adds (kind, entity_id, data) entries in order; returns the last seq written.
+
+        Seqs are claimed by bumping groups.change_seq with UPDATE ... RETURNING
+        rather than read from max(seq): the update locks the group row until
+        commit, so concurrent writers to one group queue up instead of taking
+        the same seq and failing on the primary key.
+        """
+        if not changes:
+            return self.get_latest_seq(group_id)
+        last_seq = db.session.execute(self._CLAIM_SEQS, {"group_id": group_id, "count": len(changes)}).scalar_one()
+        last_seq -= len(changes)
+        db.session.execute(insert(GroupChangeORM), [
+            {"group_id": group_id, "seq": last_seq + offset, "kind": kind, "entity_id": entity_id, "data": data}
+            for offset, (kind, entity_id, data) in enumerate(changes, start=1)
+        ])
+        return last_seq + len(changes)
+
+    @request_cached
+    def get_latest_seq(self, group_id: int) -> int:
+        """Highest seq in the group's log, 0 when it is empty (or the group is gone)"""
+        return db.session.execute(self._LATEST_SEQ, {"group_id": group_id}).scalar() or 0
+
+    @request_cached
+    def get_since(self, group_id: int, since: int, limit: int):
+        """Entries after ``since`` in seq order, ``limit`` at a time; returns (rows, has_more)"""
+        rows = db.session.execute(
+            select(GroupChangeORM.seq, GroupChangeORM.kind, GroupChangeORM.entity_id, GroupChangeORM.data,
+                   GroupChangeORM.created_at)
+            .where(GroupChangeORM.group_id == group_id, GroupChangeORM.seq > since)
+            .order_by(GroupChangeORM.seq)
+            .limit(limit + 1)
+        ).all()
+        return rows[:limit], len(rows) > limit
@@ -0,0 +1,63 @@
+# /Splity_flask/Splity/adapters/request_cache.py
+
+from functools import wraps
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+def _cache():
+    if has_request_context():
+        return g.get("repository_reads")
+    return None
+
+
+def request_cached(method):
+    """Memoises a repository read for the rest of the current request.
+
+    Results are keyed by method and arguments and kept on ``flask.g``, so
+    the same logical read hits the database at most once per request.
+    Outside a request the method runs uncached.
+    """
+    @wraps(method)
+    def wrapped(self, *args, **kwargs):
+        cache = _cache()
+        if cache is None:
+            return method(self, *args, **kwargs)
+        key = (method.__qualname__, args, tuple(sorted(kwargs.items())))
+        if key not in cache:
+            cache[key] = method(self, *args, **kwargs)
+        return cache[key]
+    return wrapped
+
+
+def invalidates_request_cache(method):
+    """Drops every memoised read once a repository write has gone through."""
+    @wraps(method)
+    def wrapped(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            cache = _cache()
+            if cache is not None:
+                cache.clear()
+    return wrapped
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_reads_on_rollback(session, previous_transaction):
+    # Reads memoised after a flush saw rows the rollback just took back
+    cache = _cache()
+    if cache is not None:
+        cache.clear()
+
+
+def init_request_cache(app):
+    @app.before_request
+    def _start_request_cache():
+        g.repository_reads = {}
+
+    @app.teardown_request
+    def _drop_request_cache(exc):
+        g.pop("repository_reads", None)
@@ -0,0 +1,50 @@
+# /Splity_flask/Splity/adapters/unit_of_work.py
+
+from Splity.adapters.database import db
+
+
+class UnitOfWork:
+    """One transaction around a service call.
+
+    Repository writes only flush; the service opens a unit of work and the
+    outermost one commits once on a clean exit. Any exception rolls the
+    whole session back. A unit opened inside another one joins it, so a
+    service can call another service without splitting the transaction.
+
+        with UnitOfWork():
+            repo.edit_group_name(group_id, name)
+            repo.edit_group_description(group_id, description)
+    """
+
+    _DEPTH_KEY = "splity_uow_depth"
+
+    def __init__(self, session=None):
+        self._session = session
+
+    @property
+    def session(self):
+        return self._session if self._session is not None else db.session
+
+    def __enter__(self):
+        info = self.session.info
+        info[self._DEPTH_KEY] = info.get(self._DEPTH_KEY, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        info = self.session.info
+        info[self._DEPTH_KEY] -= 1
+        outermost = info[self._DEPTH_KEY] == 0
+        if exc_type is not None:
+            # Flushed rows from the failed unit must never reach a later commit
+            self.session.rollback()
+            return False
+        if outermost:
+            self.commit()
+        return False
+
+    def commit(self):
+        try:
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
@@ -0,0 +1,60 @@
+# /Splity_flask/Splity/api/routes.py
+
+from flask import Blueprint, current_app, jsonify, request
+from flask_login import current_user
+
+from Splity.authentication.guards import api_login_required
+from Splity.services import bill_services, change_services, groups_services
+
+api_blueprint = Blueprint("api", __name__, url_prefix="/api")
+
+
+def _not_found():
+    # Same answer for a missing group and someone else's, so ids can't be probed
+    return jsonify(error="Group not found."), 404
+
+
+def _with_validators(response, etag: str):
+    response.set_etag(etag)
+    # Clients may keep the body but must revalidate before using it
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@api_blueprint.route('/group/<int:group_id>/summary', strict_slashes=False)
+@api_login_required
+def group_summary(group_id):
+    """Totals, balances and transfers, with a strong ETag on the group version.
+
+    A matching If-None-Match costs one query (version plus membership) and
+    gets a 304; only a changed group pays for the balance computation.
+    """
+    version = groups_services.get_member_version(group_id, current_user.id)
+    if version is None:
+        return _not_found()
+    etag = f"group-{group_id}-v{version}"
+    if request.if_none_match.contains(etag):
+        return _with_validators(current_app.response_class(status=304), etag)
+    return _with_validators(jsonify(bill_services.group_summary(group_id)), etag)
+
+
+@api_blueprint.route('/group/<int:group_id>/changes', strict_slashes=False)
+@api_login_required
+def group_changes(group_id):
+    """Change log entries after ``since``, so a client refresh costs what changed, not the group size.
+
+    A client takes a summary, keeps its ``change_seq`` and polls with it as
+    ``since``; each answer's ``latest`` is the next ``since``.
+    """
+    if not groups_services.is_member(group_id, current_user.id):
+        return _not_found()
+    try:
+        since = int(request.args.get("since", 0))
+        limit = int(request.args.get("limit", change_services.CHANGES_PAGE_SIZE))
+    except ValueError:
+        return jsonify(error="'since' and 'limit' must be integers."), 400
+    try:
+        changes = change_services.get_changes_since(group_id, since, limit)
+    except change_services.ChangeServiceException as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(group_id=group_id, **changes)
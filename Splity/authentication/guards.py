@@ -0,0 +1,35 @@
+# /Splity_flask/Splity/authentication/guards.py
+
+from functools import wraps
+
+from flask import flash, jsonify, redirect, url_for
+from flask_login import current_user
+
+from Splity.services import groups_services
+
+
+def group_member_required(view):
+    """Only lets members of the route's ``group_id`` through.
+
+    Use below @login_required. Non-members are sent back to the dashboard
+    with the message require_membership gives.
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        try:
+            groups_services.require_membership(kwargs["group_id"], current_user.id)
+        except groups_services.GroupServiceException as e:
+            flash(str(e), "danger")
+            return redirect(url_for('home.home'))
+        return view(*args, **kwargs)
+    return wrapped
+
+
+def api_login_required(view):
+    """login_required for JSON routes: a 401 body instead of a redirect to the login page."""
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return jsonify(error="Authentication required."), 401
+        return view(*args, **kwargs)
+    return wrapped
@@ -1,11 +1,12 @@
 # /Splity_flask/Splity/bills/routes.py
 
 
-from flask import Blueprint, render_template, redirect, flash, url_for, request
+from flask import Blueprint, Response, render_template, redirect, flash, url_for, request, stream_with_context
 from flask_login import login_required, current_user
 
-from Splity.forms.forms import CreateBillForm
-from Splity.services import bill_services, groups_services
+from Splity.authentication.guards import group_member_required
+from Splity.forms.forms import CreateBillForm, ImportBillsForm
+from Splity.services import bill_services, groups_services, export_services, import_services
 
 
 
@@ -13,6 +14,7 @@ bills_blueprint = Blueprint('bills', __name__)
 
 @bills_blueprint.route('/group/<int:group_id>/create_bill', methods=['GET', 'POST'], strict_slashes=False)
 @login_required
+@group_member_required
 def create_bill(group_id):
     form = CreateBillForm()
     currency = groups_services.get_group(group_id).currency
@@ -36,6 +38,7 @@ def create_bill(group_id):
 
 @bills_blueprint.route('/group/<int:group_id>/delete_bill/<int:bill_id>', methods=['GET', 'POST'], strict_slashes=False)
 @login_required
+@group_member_required
 def delete_bill(bill_id, group_id):
     try:
         bill = bill_services.delete_bill_service(bill_id=bill_id, current_user_id=current_user.id, group_id=group_id)
@@ -44,3 +47,42 @@ def delete_bill(bill_id, group_id):
     except bill_services.BillServiceException as e:
         flash(str(e), 'danger')
         return redirect(url_for('home.group_details', group_id=group_id))
+
+
+@bills_blueprint.route('/group/<int:group_id>/import_bills', methods=['GET', 'POST'], strict_slashes=False)
+@login_required
+@group_member_required
+def import_bills(group_id):
+    form = ImportBillsForm()
+    if form.validate_on_submit():
+        try:
+            # The upload is parsed straight off its stream, a chunk of rows at a time
+            report = import_services.import_bills_file(group_id, form.file.data.stream, requester_id=current_user.id)
+            flash(f"Imported {report.imported} bill(s), skipped {report.skipped}.",
+                  'success' if not report.skipped else 'info')
+            for line, message in report.errors:
+                flash(f"Line {line}: {message}", 'danger')
+            return redirect(url_for('home.group_details', group_id=group_id))
+        except import_services.BillImportException as e:
+            flash(str(e), 'danger')
+    return render_template("bills/import_bills.html", form=form, group_id=group_id,
+                           columns=import_services.IMPORT_COLUMNS)
+
+
+EXPORT_FORMATS = {
+    "csv": (export_services.export_csv, "text/csv"),
+    "jsonl": (export_services.export_jsonl, "application/x-ndjson"),
+}
+
+
+@bills_blueprint.route('/group/<int:group_id>/export.<any(csv, jsonl):fmt>', strict_slashes=False)
+@login_required
+@group_member_required
+def export_group(group_id, fmt):
+    """Streams the group's full bill history; rows are never collected in memory"""
+    export, mimetype = EXPORT_FORMATS[fmt]
+    return Response(
+        stream_with_context(export(group_id)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="group-{group_id}-bills.{fmt}"'},
+    )
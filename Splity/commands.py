@@ -0,0 +1,51 @@
+# /Splity_flask/Splity/commands.py
+
+import click
+
+
+def register_commands(app):
+    """Attaches Splity's maintenance commands to ``flask``."""
+
+    @app.cli.command("rebuild-balances")
+    @click.option("--verify-only", is_flag=True, help="Only compare the ledger with a full recompute.")
+    def rebuild_balances_command(verify_only):
+        """Rebuild the group_balances ledger and verify it against the bills."""
+        from Splity.services import balance_services
+
+        if not verify_only:
+            count = balance_services.rebuild_balances()
+            click.echo(f"Rebuilt balances for {count} group(s).")
+        mismatches = balance_services.verify_balances()
+        for group_id, (ledger, recomputed) in mismatches.items():
+            click.echo(f"Group {group_id}: ledger {ledger} != recomputed {recomputed}", err=True)
+        if mismatches:
+            raise click.ClickException(f"{len(mismatches)} group(s) out of sync.")
+        click.echo("Balances verified.")
+
+    @app.cli.command("prune-fragments")
+    def prune_fragments_command():
+        """Delete fragment files in FRAGMENT_CACHE_DIR that no existing group uses."""
+        from Splity.adapters.repository import GroupRepository
+        from Splity.home import fragments
+
+        page_size = app.config["BILLS_PAGE_SIZE"]
+        live_names = [name for group in GroupRepository().get_fragment_keys()
+                      for name in fragments.group_fragment_names(group, page_size)]
+        removed = fragments.group_fragments.prune(live_names)
+        click.echo(f"Removed {removed} fragment file(s).")
+
+    @app.cli.command("import-bills")
+    @click.argument("group_id", type=int)
+    @click.argument("csv_file", type=click.File("rb"))
+    @click.option("--chunk-size", default=500, show_default=True, help="Rows per transaction.")
+    def import_bills_command(group_id, csv_file, chunk_size):
+        """Import bills into GROUP_ID from a CSV of payer,description,amount,participants."""
+        from Splity.services import import_services
+
+        try:
+            report = import_services.import_bills_file(group_id, csv_file, chunk_size=chunk_size)
+        except import_services.BillImportException as e:
+            raise click.ClickException(str(e))
+        for line, message in report.errors:
+            click.echo(f"Line {line}: {message}", err=True)
+        click.echo(f"Imported {report.imported} bill(s), skipped {report.skipped}.")
@@ -2,10 +2,19 @@
 
 import secrets
 from datetime import datetime, timezone
-from typing import Optional
+from typing import NamedTuple, Optional
+
+# The entities below declare __slots__: repositories build them row by row,
+# and without a per-instance __dict__ each one is about half the size.
+
+
+def new_invite_code() -> str:
+    return secrets.token_hex(3).upper()
 
 
 class User:
+    __slots__ = ("__id", "__name", "__username", "__email", "__password", "__groups")
+
     def __init__(self, name: str, username: str, email: str, password: str = None, user_id: Optional[int] = None):
         self.__id = user_id
         self.__name = name
@@ -63,7 +72,10 @@ class User:
 
 
 class Bill:
-    def __init__(self, user_id: int, description: str, amount: float, created_date: datetime = None,
+    # amount is in integer minor units of the group's currency (Splity.domainmodel.money)
+    __slots__ = ("__bill_id", "__user_id", "__description", "__amount", "__date", "__group_id")
+
+    def __init__(self, user_id: int, description: str, amount: int, created_date: datetime = None,
                  bill_id: Optional[int] = None, group_id: Optional[int] = None):
         self.__bill_id = bill_id
         self.__user_id = user_id
@@ -96,7 +108,10 @@ class Bill:
 
 
 class BillParticipant:
-    def __init__(self, bill_id: int, user_id: int, amount_owed: float, has_paid: bool = False,
+    # amount_owed is in minor units, like Bill.amount
+    __slots__ = ("__id", "__bill_id", "__user_id", "__amount_owed", "__has_paid")
+
+    def __init__(self, bill_id: int, user_id: int, amount_owed: int, has_paid: bool = False,
                  participant_id: Optional[int] = None):
         self.__id = participant_id
         self.__bill_id = bill_id
@@ -121,14 +136,25 @@ class BillParticipant:
 
 
 class Group:
+    __slots__ = ("__id", "__name", "__description", "__creator_id", "__currency", "__invite_code", "__simplify_debts",
+                 "__version")
+
     def __init__(self, name: str, description: str ,currency: str, creator_id: Optional[int] = None,
-                 group_id: int = None, invite_code: str = None):
+                 group_id: int = None, invite_code: str = None, simplify_debts: bool = False, version: int = 0):
         self.__id = group_id
         self.__name = name
         self.__description = description
         self.__creator_id = creator_id
         self.__currency = currency
-        self.__invite_code = invite_code if invite_code else secrets.token_hex(3).upper()
+        self.__invite_code = invite_code
+        self.__simplify_debts = simplify_debts
+        self.__version = version
+
+    @classmethod
+    def create(cls, name: str, description: str, currency: str, creator_id: int, simplify_debts: bool = False):
+        """A group about to be inserted, with a fresh invite code; groups loaded from the database keep theirs"""
+        return cls(name=name, description=description, currency=currency, creator_id=creator_id,
+                   invite_code=new_invite_code(), simplify_debts=simplify_debts)
 
     @property
     def id(self): return self.__id
@@ -148,6 +174,12 @@ class Group:
     @property
     def description(self): return self.__description
 
+    @property
+    def simplify_debts(self): return self.__simplify_debts
+
+    @property
+    def version(self): return self.__version
+
     @name.setter
     def name(self, name: str):
         self.__name = name
@@ -155,3 +187,29 @@ class Group:
     @description.setter
     def description(self, description: str):
         self.__description = description
+
+    @simplify_debts.setter
+    def simplify_debts(self, simplify_debts: bool):
+        self.__simplify_debts = simplify_debts
+
+
+# Read-only projections for list views. Plain tuples: built straight from
+# selected columns, with no ORM entity or domain object in between.
+
+
+class UserSummary(NamedTuple):
+    """A user as shown in member lists and next to bills: no password, no groups"""
+    id: int
+    name: str
+    username: str
+    email: str
+
+
+class BillSummary(NamedTuple):
+    """A bill as shown in a group's history; amount in minor units"""
+    id: int
+    user_id: int
+    description: str
+    amount: int
+    date: datetime
+    group_id: Optional[int]
@@ -0,0 +1,62 @@
+# /Splity_flask/Splity/domainmodel/money.py
+
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, List, Tuple
+
+# ISO 4217 minor-unit exponents that differ from the usual two decimals
+CURRENCY_EXPONENTS = {
+    **dict.fromkeys(("BIF", "CLP", "DJF", "GNF", "ISK", "JPY", "KMF", "KRW", "PYG", "RWF", "UGX", "UYI", "VND",
+                     "VUV", "XAF", "XOF", "XPF"), 0),
+    **dict.fromkeys(("BHD", "IQD", "JOD", "KWD", "LYD", "OMR", "TND"), 3),
+    **dict.fromkeys(("CLF", "UYW"), 4),
+}
+DEFAULT_EXPONENT = 2
+
+
+def exponent(currency: str) -> int:
+    """Decimal places of the currency's minor unit: 2 for USD, 0 for JPY, 3 for KWD"""
+    return CURRENCY_EXPONENTS.get((currency or "").upper(), DEFAULT_EXPONENT)
+
+
+def to_minor(amount, exp: int) -> int:
+    """Exact integer minor units for a major amount (12.5, '12.50', Decimal) at ``exp`` decimals.
+
+    Raises ValueError rather than rounding when the amount has more
+    decimals than the currency allows.
+    """
+    try:
+        value = Decimal(str(amount))
+    except InvalidOperation:
+        value = None
+    if value is None or not value.is_finite():
+        raise ValueError(f"Invalid amount '{amount}'.")
+    minor = value.scaleb(exp)
+    if minor != minor.to_integral_value():
+        raise ValueError(f"Amount can have at most {exp} decimal place(s).")
+    return int(minor)
+
+
+def to_major(minor: int, exp: int) -> float:
+    """Major-unit value for display and JSON; the arithmetic stays in minor units"""
+    return float(Decimal(minor).scaleb(-exp))
+
+
+def format_amount(minor: int, currency: str) -> str:
+    """Minor units as a display string with the currency's decimals: '12.50' USD, '1250' JPY"""
+    exp = exponent(currency)
+    return f"{Decimal(minor).scaleb(-exp):.{exp}f}"
+
+
+def split_evenly(total: int, user_ids: Iterable[int]) -> List[Tuple[int, int]]:
+    """Splits ``total`` minor units across users so the shares add up to it exactly.
+
+    Everyone gets ``total // n``; the ``total % n`` leftover units go one
+    each to the lowest user ids, so the same bill always splits the same
+    way. Returns (user_id, share) pairs in the order given.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return []
+    share, remainder = divmod(total, len(user_ids))
+    extra = set(sorted(user_ids)[:remainder])
+    return [(user_id, share + (1 if user_id in extra else 0)) for user_id in user_ids]
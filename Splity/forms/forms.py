@@ -1,6 +1,7 @@
 # /Splity_flask/Splity/forms/forms.py
 
 from flask_wtf import FlaskForm
+from flask_wtf.file import FileField, FileRequired, FileAllowed
 from wtforms import StringField, PasswordField, SubmitField, SelectField, TextAreaField, SelectMultipleField
 from wtforms.fields.numeric import DecimalField
 from wtforms.validators import DataRequired, Email, EqualTo, Length, NumberRange
@@ -51,3 +52,8 @@ class CreateBillForm(FlaskForm):
     names = SelectMultipleCheckboxesField('Select which people owe an equal share', choices=[], validators=[DataRequired()])
     amount = DecimalField('Amount', validators=[DataRequired(), NumberRange(min=1)])
     submit = SubmitField('Create Bill')
+
+
+class ImportBillsForm(FlaskForm):
+    file = FileField('CSV file', validators=[FileRequired(), FileAllowed(['csv'], 'Upload a .csv file.')])
+    submit = SubmitField('Import Bills')
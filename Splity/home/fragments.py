@@ -0,0 +1,76 @@
+# /Splity_flask/Splity/home/fragments.py
+
+from flask import current_app, get_template_attribute
+
+from Splity.adapters.cache import FragmentCache
+from Splity.services import bill_services
+
+# Viewer-independent parts of the group page, keyed by (group, version).
+# Names carry the invite code as well as the id: SQLite hands a deleted
+# group's id to the next group created, whose version starts again at 0.
+group_fragments = FragmentCache()
+
+
+def init_app(app):
+    group_fragments.configure(app.config.get("FRAGMENT_CACHE_SIZE", 256), app.config.get("FRAGMENT_CACHE_DIR"))
+
+
+def group_fragment_names(group, page_size: int):
+    """Every name the group's fragments are cached under; a fixed two per group"""
+    return [_ledger_name(group), _bill_page_name(group, page_size)]
+
+
+def forget_group(group):
+    """Drops a deleted group's fragments, from memory and the shared directory"""
+    for name in group_fragment_names(group, current_app.config["BILLS_PAGE_SIZE"]):
+        group_fragments.discard(name)
+
+
+def group_ledger(group):
+    """Total spend, per-member balances and the settle-up list; returns (ledger, hit).
+
+    Anything that depends on who is looking (their own balance, delete
+    buttons) stays out of the cached values and is applied by the template.
+    """
+    return group_fragments.get_or_set(_ledger_name(group), group.version, lambda: _render_group_ledger(group))
+
+
+def group_bill_page(group, cursor: str = None, page_size: int = 50):
+    """Rendered rows for one page of the bill history; returns (page, hit).
+
+    Only the first page is cached. Cursors come from the query string, and
+    any member could mint endless valid ones, each a new cache entry (and
+    file); older pages are a cheap keyset read, so they render every time.
+    """
+    if cursor:
+        return _render_bill_page(group, cursor, page_size), False
+    return group_fragments.get_or_set(_bill_page_name(group, page_size), group.version,
+                                      lambda: _render_bill_page(group, None, page_size))
+
+
+def _ledger_name(group) -> str:
+    return f"group-{group.id}-{group.invite_code}"
+
+
+def _bill_page_name(group, page_size: int) -> str:
+    return f"group-{group.id}-{group.invite_code}-bills-latest-{page_size}"
+
+
+def _render_group_ledger(group) -> dict:
+    settle, net_balances = bill_services.settling_algorithm(group.id, simplify_debts=group.simplify_debts)
+    settle_up = get_template_attribute("group/_ledger.html", "settle_up")
+    return {
+        "total_group_spending": bill_services.total_group_spending(group.id),
+        "net_balances": [[user_id, balance] for user_id, (_, balance) in net_balances.items()],
+        "settle_up": str(settle_up(settle, group.currency)),
+    }
+
+
+def _render_bill_page(group, cursor, page_size) -> dict:
+    bills_and_creator, next_cursor = bill_services.get_bills_page_service(group.id, cursor, page_size)
+    bill_row = get_template_attribute("group/_ledger.html", "bill_row")
+    return {
+        "bills": [[bill.id, creator.id, str(bill_row(bill, creator, group.currency))]
+                  for bill, creator in bills_and_creator],
+        "next_cursor": next_cursor,
+    }
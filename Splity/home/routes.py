@@ -1,8 +1,10 @@
 # /Splity_flask/Splity/home/routes.py
 
-from flask import Blueprint, render_template, redirect, flash, url_for
+from flask import Blueprint, render_template, redirect, flash, url_for, make_response, request, current_app
 from flask_login import login_required, current_user
 
+from Splity.authentication.guards import group_member_required
+from Splity.home import fragments
 from Splity.forms.forms import GroupCreationForm, JoinGroupForm, GroupEditForm
 from Splity.services import groups_services, currency_service, bill_services
 
@@ -70,31 +72,37 @@ def join_group():
 
 @home_blueprint.route('/group/<int:group_id>', strict_slashes=False)
 @login_required
+@group_member_required
 def group_details(group_id):
     try:
-        group, members = groups_services.get_group_details(group_id, current_user.id)
-        bills_and_creator = bill_services.get_bills_and_creators_service(group_id)
-        total = bill_services.total_group_spending(group_id)
-        settle, users_net_balance = bill_services.settling_algorithm(group_id)
-        user_net_balance = bill_services.get_user_net_balances(users_net_balance, current_user.id)[1]
-        print(user_net_balance)
-        print(settle)
-        return render_template('group/group_details.html',
-                               group=group,
-                               members=members,
-                               bill_data=bills_and_creator,
-                               total_group_spending=total,
-                               user_net_balance=round(user_net_balance, 2),
-                               settle_payments=settle)
+        # Membership was checked by group_member_required
+        group = groups_services.get_group(group_id)
+        cursor = request.args.get('before')
+        ledger, ledger_hit = fragments.group_ledger(group)
+        bill_page, page_hit = fragments.group_bill_page(group, cursor, current_app.config["BILLS_PAGE_SIZE"])
+        user_net_balance = dict(ledger["net_balances"]).get(current_user.id, 0)
+        response = make_response(render_template('group/group_details.html',
+                                                  group=group,
+                                                  ledger=ledger,
+                                                  bill_page=bill_page,
+                                                  is_first_page=not cursor,
+                                                  user_net_balance=user_net_balance))
+        response.headers.add("Server-Timing", f'fragment;desc="{"hit" if ledger_hit and page_hit else "miss"}"')
+        return response
     except groups_services.GroupServiceException as e:
         flash(str(e), "danger")
         return redirect(url_for('home.home'))
+    except bill_services.BillServiceException as e:
+        flash(str(e), "danger")
+        return redirect(url_for('home.group_details', group_id=group_id))
 
 
 @home_blueprint.route('/group/<int:group_id>/edit', methods=['GET', 'POST'], strict_slashes=False)
 @login_required
+@group_member_required
 def edit_group(group_id):
-    group, members = groups_services.get_group_details(group_id, current_user.id)
+    group = groups_services.get_group(group_id)
+    members = groups_services.get_group_members(group_id)
     form = GroupEditForm(name=group.name, description=group.description)
     # if current_user.id != group.creator_id:
     #     flash("You cannot edit this group", "danger")
@@ -113,10 +121,27 @@ def edit_group(group_id):
     return render_template('group/edit_group.html', form=form, members=members, group=group)
 
 
+@home_blueprint.route('/group/<int:group_id>/simplify_debts', methods=['GET', 'POST'], strict_slashes=False)
+@login_required
+@group_member_required
+def toggle_simplify_debts(group_id):
+    try:
+        group = groups_services.get_group(group_id)
+        if not group:
+            raise groups_services.GroupServiceException("Group not found.")
+        group = groups_services.set_simplify_debts(group_id, current_user.id, not group.simplify_debts)
+        mode = "on" if group.simplify_debts else "off"
+        flash(f"Simplify debts turned {mode} for Group '{group.name}'", "success")
+    except groups_services.GroupServiceException as e:
+        flash(str(e), "danger")
+    return redirect(url_for('home.group_details', group_id=group_id))
+
+
 @home_blueprint.route('/group/<int:group_id>/remove_user/<int:user_id>',
                       methods=['GET', 'POST'],
                       strict_slashes=False)
 @login_required
+@group_member_required
 def remove_user(group_id, user_id):
     try:
         member_remove = groups_services.remove_user(group_id, user_id, current_user.id)
@@ -128,6 +153,7 @@ def remove_user(group_id, user_id):
 
 @home_blueprint.route('/group/<int:group_id>/leave', methods=['GET', 'POST'], strict_slashes=False)
 @login_required
+@group_member_required
 def leave_group(group_id):
     try:
         user, group = groups_services.leave_from_group(group_id, current_user.id)
@@ -140,9 +166,11 @@ def leave_group(group_id):
 
 @home_blueprint.route('/group/<int:group_id>/delete', methods=['GET', 'POST'], strict_slashes=False)
 @login_required
+@group_member_required
 def delete_group(group_id):
     try:
         group = groups_services.delete_group(group_id, current_user.id)
+        fragments.forget_group(group)
         flash(f"Successfully deleted Group '{group.name}'", "success")
         return redirect(url_for('home.home'))
     except groups_services.GroupServiceException as e:
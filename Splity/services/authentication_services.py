@@ -1,9 +1,16 @@
 # /Splity_flask/Splity/services/authentication_services.py
 
+import threading
 from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 from werkzeug.security import generate_password_hash, check_password_hash
 
+from Splity.adapters.cache import LRUCache
+from Splity.adapters.orm import UserORM
 from Splity.adapters.repository import UserRepository
+from Splity.adapters.unit_of_work import UnitOfWork
 from Splity.domainmodel.models import User
 
 
@@ -13,21 +20,94 @@ class AuthenticationException(Exception):
 
 def add_user_service(name: str, username: str, email: str, password: str):
     repo = UserRepository()
-    if repo.get_by_username(username):
+    if repo.get_login_by_username(username):
         raise AuthenticationException(f"User {username} already exists")
 
     hashed_password = generate_password_hash(password)
     user = User(name=name, username=username, email=email, password=hashed_password)
-    repo.add(user)
+    with UnitOfWork():
+        repo.add(user)
 
 def authenticate_user_service(username: str, password: str) -> Optional[User]:
-    repo = UserRepository()
-    user = repo.get_by_username(username)
+    row = UserRepository().get_login_by_username(username)
 
-    if user is None:
+    if row is None:
         raise AuthenticationException("User not found.")
 
-    if not check_password_hash(user.password, password):
+    if not check_password_hash(row.password, password):
         raise AuthenticationException("Invalid password.")
 
-    return user
\ No newline at end of file
+    # The session only needs the slim user; the hash stays out of it
+    return UserRepository.summary_from_row(row.id, row.name, row.username, row.email)
+
+
+# Session users for Flask-Login, keyed by (user_id, version). A user write
+# bumps the version once it commits, so a loader that read the row before
+# the commit can only ever store its stale copy under a key nobody asks for
+# again. Versions are per process: writes from other workers or the CLI
+# show up here when the entry's TTL runs out.
+session_user_cache = LRUCache(maxsize=1024, ttl=60)
+_user_versions = {}
+_versions_lock = threading.Lock()
+
+
+def init_app(app):
+    session_user_cache.maxsize = app.config.get("SESSION_USER_CACHE_SIZE", session_user_cache.maxsize)
+    session_user_cache.ttl = app.config.get("SESSION_USER_CACHE_TTL", session_user_cache.ttl)
+
+
+def load_session_user(user_id: int) -> Optional[User]:
+    """Slim user (no groups, no password) for the current session, cached per process.
+
+    The cache holds the plain (id, name, username, email) row, and every
+    call builds a fresh User from it, so no two requests share an instance.
+    """
+    key = (user_id, _user_versions.get(user_id, 0))
+    row = session_user_cache.get(key)
+    if row is None:
+        user = UserRepository().get_summary_by_id(user_id)
+        if user is None:
+            return None
+        row = (user.id, user.name, user.username, user.email)
+        session_user_cache.set(key, row)
+    return UserRepository.summary_from_row(*row)
+
+
+def invalidate_session_user(user_id: int):
+    with _versions_lock:
+        version = _user_versions.get(user_id, 0)
+        _user_versions[user_id] = version + 1
+    session_user_cache.pop((user_id, version))
+
+
+def session_user_cache_stats() -> dict:
+    return session_user_cache.stats()
+
+
+def clear_session_user_cache():
+    with _versions_lock:
+        _user_versions.clear()
+    session_user_cache.clear()
+
+
+_WRITTEN_USERS_KEY = "splity_written_user_ids"
+
+
+@event.listens_for(UserORM, "after_update")
+@event.listens_for(UserORM, "after_delete")
+def _collect_user_write(mapper, connection, target):
+    # Flush time is too early to invalidate: until the commit, other
+    # connections still read the old row and would cache it under the new
+    # version. Note the id and invalidate once the write is visible.
+    object_session(target).info.setdefault(_WRITTEN_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_users(session):
+    for user_id in session.info.pop(_WRITTEN_USERS_KEY, ()):
+        invalidate_session_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_users(session):
+    session.info.pop(_WRITTEN_USERS_KEY, None)
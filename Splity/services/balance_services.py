@@ -0,0 +1,34 @@
+# /Splity_flask/Splity/services/balance_services.py
+
+from typing import Dict, Tuple
+
+from Splity.adapters.repository import GroupBalanceRepository
+from Splity.adapters.unit_of_work import UnitOfWork
+
+
+def rebuild_balances() -> int:
+    """Rebuilds the group_balances ledger for every group from its bills."""
+    repo = GroupBalanceRepository()
+    group_ids = repo.get_all_group_ids()
+    for group_id in group_ids:
+        # One transaction per group keeps a large rebuild from holding the write lock
+        with UnitOfWork():
+            repo.rebuild(group_id)
+    return len(group_ids)
+
+
+def verify_balances() -> Dict[int, Tuple[dict, dict]]:
+    """Compares the ledger with a full recompute.
+
+    Returns {group_id: (ledger, recomputed)} for every group that differs;
+    an empty dict means the ledger is correct. Zero balances are ignored on
+    both sides since members with nothing owed may or may not have a row.
+    """
+    repo = GroupBalanceRepository()
+    mismatches = {}
+    for group_id in repo.get_all_group_ids():
+        ledger = {user_id: cents for user_id, cents in repo.get_net_cents(group_id).items() if cents}
+        recomputed = {user_id: cents for user_id, cents in repo.recompute(group_id).items() if cents}
+        if ledger != recomputed:
+            mismatches[group_id] = (ledger, recomputed)
+    return mismatches
@@ -1,41 +1,52 @@
 # /Splity_flask/Splity/services/bill_services.py
+import base64
+from datetime import datetime
 from typing import List
 from collections import defaultdict
 
 from Splity.adapters.orm import BillParticipantORM
-from Splity.adapters.repository import BillRepository, BillParticipantRepository, UserRepository, GroupRepository
-from Splity.domainmodel.models import Bill, User, BillParticipant
-from Splity.services import groups_services
+from Splity.adapters.unit_of_work import UnitOfWork
+from Splity.adapters.repository import BillRepository, BillParticipantRepository, UserRepository, GroupRepository, \
+    GroupBalanceRepository
+from Splity.domainmodel import money
+from Splity.domainmodel.models import Bill, BillSummary, User, BillParticipant
+from Splity.services import change_services, groups_services, settlement_service
 
 
 class BillServiceException(Exception):
     pass
 
-def add_bill_service(user_id: int,description: str, amount: float, owe_members:List[int], group_id: int) -> Bill:
-    bill_repo = BillRepository()
-    bill = bill_repo.get_bill_by_name_and_group_id(description, group_id)
-    bill_participant_repo = BillParticipantRepository()
-    if bill:
-        if description.lower() == bill.description.lower():
-            raise BillServiceException(f"You already have a bill with the same description '{bill.description}'.")
+def check_bill_description(description: str, existing_description: str = None):
+    """Rules every new bill's description must pass.
+
+    ``existing_description`` is the description of a bill already in the
+    group that was found by looking ``description`` up, if any.
+    """
+    if existing_description is not None and description.lower() == existing_description.lower():
+        raise BillServiceException(f"You already have a bill with the same description '{existing_description}'.")
     if not description or not description.strip():
         raise BillServiceException("Bill description cannot be empty.")
+
+def add_bill_service(user_id: int,description: str, amount, owe_members:List[int], group_id: int) -> Bill:
+    """Adds a bill of ``amount`` major units (12.50) split equally; the returned Bill holds minor units."""
+    bill_repo = BillRepository()
+    bill = bill_repo.get_bill_by_name_and_group_id(description, group_id)
+    check_bill_description(description, bill.description if bill else None)
+    exp = money.exponent(GroupRepository().get_by_id(group_id).currency)
+    try:
+        amount = money.to_minor(amount, exp)
+    except ValueError as e:
+        raise BillServiceException(str(e))
     try:
         new_bill = Bill(user_id=user_id, description=description, amount=amount, group_id=group_id)
-        # FIX 1: Capture the ID returned by the database
-        created_bill_id = bill_repo.create(new_bill)
-
-        # FIX 2: Use the new ID to fetch the date and properties from the DB
-        # This also avoids the 'NoneType' has no attribute 'date' error
-        saved_bill = bill_repo.get_by_id(created_bill_id)
-
-        # FIX 3: Use the captured ID when adding participants
-        split_amount = amount / len(owe_members) if owe_members else 0
-        for participant_id in owe_members:
-            bill_participant_repo.add_participant(bill_id=saved_bill.id,
-                                                  user_id=participant_id,
-                                                  amount_owed=split_amount)
-        return new_bill
+        participants = money.split_evenly(amount, owe_members)
+        # Bill row and every participant row go in together with a single commit
+        with UnitOfWork():
+            created_bill_id = bill_repo.create_with_participants(new_bill, participants)
+            change_services.record_changes(
+                group_id, [change_services.bill_created(created_bill_id, new_bill, participants, exp)])
+        return Bill(user_id=user_id, description=description, amount=amount, created_date=new_bill.date,
+                    bill_id=created_bill_id, group_id=group_id)
     except Exception as e:
         raise BillServiceException(f"Failed to create group: {str(e)}")
 
@@ -50,7 +61,10 @@ def delete_bill_service(bill_id: int, current_user_id: int, group_id: int) -> Bi
         if current_user_id != group.creator_id:
             raise BillServiceException(f"User not authorised to delete bill.")
     try:
-        success = bill_repo.delete_bill(bill_id=bill.id)
+        with UnitOfWork():
+            success = bill_repo.delete_bill(bill_id=bill.id)
+            if success:
+                change_services.record_changes(group_id, [change_services.bill_deleted(bill.id)])
         if not success:
             raise BillServiceException("Bill was not deleted.")
         return bill
@@ -59,22 +73,40 @@ def delete_bill_service(bill_id: int, current_user_id: int, group_id: int) -> Bi
 
 def get_user_by_id_service(user_id: int) -> User:
     user_repo = UserRepository()
-    user = user_repo.get_by_id(user_id)
+    user = user_repo.get_summary_by_id(user_id)
     return user
 
 def get_bills_and_creators_service(group_id: int):
-    bills = groups_services.get_all_bills(group_id)
-    bill_data = []
-    for bill in bills:
-        creator = get_user_by_id_service(bill.user_id)
-        bill_data.append((bill, creator))
-    return bill_data
-
-def total_group_spending(group_id: int):
-    bills = groups_services.get_all_bills(group_id)
-    total = sum([bill.amount for bill in bills])
-    print(total)
-    return total
+    bill_repo = BillRepository()
+    return bill_repo.get_all_bills_with_creators(group_id)
+
+def encode_page_cursor(bill: BillSummary) -> str:
+    """Opaque cursor pointing just past ``bill`` in the newest-first listing"""
+    raw = f"{bill.date.isoformat()}|{bill.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_page_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date, bill_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date), int(bill_id)
+    except ValueError:
+        raise BillServiceException("Invalid page of bills.")
+
+
+def get_bills_page_service(group_id: int, cursor: str = None, limit: int = 50):
+    """One page of (bill, creator) pairs, newest first, and the cursor for the next page (or None)"""
+    bill_repo = BillRepository()
+    before = decode_page_cursor(cursor) if cursor else None
+    page, has_more = bill_repo.get_bills_page(group_id, limit, before)
+    next_cursor = encode_page_cursor(page[-1][0]) if has_more else None
+    return page, next_cursor
+
+def total_group_spending(group_id: int) -> int:
+    """Exact total of the group's bills in minor units, summed in SQL"""
+    bills_repo = BillRepository()
+    return bills_repo.get_total_spending(group_id)
 
 def total_user_spending(group_id: int, user_id: int):
     bills_repo = BillRepository()
@@ -98,32 +130,63 @@ def get_user_net_balances(users_net_balance: dict, user_id: int) -> dict:
 
 
 
-def calculate_net_balance(users, bills, participants):
-    user_balances = {user.id: [user.name, 0.0] for user in users}
-    for bill in bills:
-        if bill.user_id in user_balances:
-            user_balances[bill.user_id][1] += bill.amount
-    for participant in participants:
-        if participant.user_id in user_balances:
-            user_balances[participant.user_id][1] -= participant.amount_owed
-    return user_balances
+def calculate_net_balance(users, balances: dict):
+    """Pairs each member with their net total; members with no bills stay at zero."""
+    return {user.id: [user.name, balances.get(user.id, 0)] for user in users}
 
 
-def settling_algorithm(group_id: int):
+def _settle(group_id: int, simplify_debts: bool):
+    """(transfers as (debtor_id, amount, creditor_id), {user_id: [name, balance]}) in minor units"""
     users = groups_services.get_group_members(group_id)
-    bills = groups_services.get_all_bills(group_id)
-    participants = []
-    for bill in bills:
-        participants += get_all_bill_participants_service(bill.id)
-    final_dict = calculate_net_balance(users, bills, participants)
-    net_balances = final_dict
-    balances = {item[0]: item[1] for item in final_dict.values()}
-    texts = []
-    while max(balances.values()) > 0.01:
-        debtor_name, debtor_bal = min(balances.items(), key=lambda x: x[1])
-        creditor_name, creditor_bal = max(balances.items(), key=lambda x: x[1])
-        amount_to_transfer = min(abs(debtor_bal), creditor_bal)
-        balances[debtor_name] += amount_to_transfer
-        balances[creditor_name] -= amount_to_transfer
-        texts.append([debtor_name, round(amount_to_transfer, 2), creditor_name])
+    balance_repo = GroupBalanceRepository()
+    final_dict = calculate_net_balance(users, balance_repo.get_net_cents(group_id))
+    balances = {user_id: balance for user_id, (_, balance) in final_dict.items()}
+    if simplify_debts:
+        transfers = settlement_service.simplify_balances(balances)
+    else:
+        transfers = settlement_service.settle_balances(balances)
+    return transfers, final_dict
+
+
+def settling_algorithm(group_id: int, simplify_debts: bool = False):
+    transfers, net_balances = _settle(group_id, simplify_debts)
+    names = {user_id: name for user_id, (name, _) in net_balances.items()}
+    texts = [[names[debtor_id], amount, names[creditor_id]] for debtor_id, amount, creditor_id in transfers]
     return texts, net_balances
+
+
+def group_summary(group_id: int) -> dict:
+    """Totals, per-member net balance and settle-up transfers as plain data, for the JSON API.
+
+    Amounts are converted from minor units to the currency's major units
+    only here, at the edge.
+    """
+    # Read before anything else: the reads below are separate statements, not
+    # one snapshot, so a write landing between them must come after this seq.
+    # Clients then see it again from /changes (at least once, keyed by entity_id)
+    change_seq = change_services.latest_seq(group_id)
+    group = groups_services.get_group(group_id)
+    exp = money.exponent(group.currency)
+    transfers, net_balances = _settle(group_id, group.simplify_debts)
+    members = groups_services.get_group_members(group_id)
+    return {
+        "group": {
+            "id": group.id,
+            "name": group.name,
+            "currency": group.currency,
+            "simplify_debts": group.simplify_debts,
+            "version": group.version,
+            # Where a client starts polling /changes after taking this snapshot
+            "change_seq": change_seq,
+        },
+        "total_spending": money.to_major(total_group_spending(group_id), exp),
+        "members": [
+            {"id": member.id, "name": member.name, "username": member.username,
+             "net_balance": money.to_major(net_balances[member.id][1], exp)}
+            for member in members
+        ],
+        "transfers": [
+            {"from": debtor_id, "to": creditor_id, "amount": money.to_major(amount, exp)}
+            for debtor_id, amount, creditor_id in transfers
+        ],
+    }
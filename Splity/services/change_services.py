@@ -0,0 +1,79 @@
+# /Splity_flask/Splity/services/change_services.py
+from typing import List, Tuple
+
+from Splity.adapters.repository import GroupChangeRepository
+from Splity.domainmodel import money
+from Splity.domainmodel.models import Bill, User
+
+BILL_CREATED = "bill_created"
+BILL_DELETED = "bill_deleted"
+MEMBER_JOINED = "member_joined"
+MEMBER_LEFT = "member_left"
+GROUP_EDITED = "group_edited"
+
+CHANGES_PAGE_SIZE = 500
+
+
+class ChangeServiceException(Exception):
+    pass
+
+
+def record_changes(group_id: int, changes: List[Tuple[str, int, dict]]) -> int:
+    """Appends entries to the group's change log; call inside the write's UnitOfWork."""
+    return GroupChangeRepository().append(group_id, changes)
+
+
+def bill_created(bill_id: int, bill: Bill, participants: List[Tuple[int, int]], exp: int):
+    """Entry for a new bill; amounts go out in major units, like the summary's"""
+    return BILL_CREATED, bill_id, {
+        "id": bill_id,
+        "description": bill.description,
+        "amount": money.to_major(bill.amount, exp),
+        "paid_by": bill.user_id,
+        "date": bill.date.isoformat(),
+        "participants": [{"user_id": user_id, "amount_owed": money.to_major(amount_owed, exp)}
+                         for user_id, amount_owed in participants],
+    }
+
+
+def bill_deleted(bill_id: int):
+    return BILL_DELETED, bill_id, {"id": bill_id}
+
+
+def member_joined(user: User):
+    return MEMBER_JOINED, user.id, {"id": user.id, "name": user.name, "username": user.username}
+
+
+def member_left(user_id: int):
+    return MEMBER_LEFT, user_id, {"id": user_id}
+
+
+def group_edited(**fields):
+    return GROUP_EDITED, None, fields
+
+
+def latest_seq(group_id: int) -> int:
+    return GroupChangeRepository().get_latest_seq(group_id)
+
+
+def get_changes_since(group_id: int, since: int, limit: int = CHANGES_PAGE_SIZE) -> dict:
+    """Log entries after ``since`` as plain data, for the JSON API.
+
+    ``latest`` is the seq to send as ``since`` next time; with ``has_more``
+    set, the client should ask again straight away.
+    """
+    if since < 0:
+        raise ChangeServiceException("'since' cannot be negative.")
+    if limit < 1:
+        raise ChangeServiceException("'limit' must be at least 1.")
+    limit = min(limit, CHANGES_PAGE_SIZE)
+    rows, has_more = GroupChangeRepository().get_since(group_id, since, limit)
+    return {
+        "since": since,
+        "latest": rows[-1].seq if rows else since,
+        "has_more": has_more,
+        "changes": [
+            {"seq": seq, "kind": kind, "entity_id": entity_id, "data": data, "at": created_at.isoformat()}
+            for seq, kind, entity_id, data, created_at in rows
+        ],
+    }
@@ -1,15 +1,138 @@
-# /Splity_flask/Splity/services/currency_services.py
+# /Splity_flask/Splity/services/currency_service.py
+
+import json
+import logging
+import os
+import threading
+import time
 
 import requests
 
-def get_currency() -> list[tuple]:
-    """Fetches currency list and formats it for a SelectField dropdown."""
-    api_url = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies.json"
-    try:
-        response = requests.get(api_url)
-        data = response.json()
-        # Returns a list of tuples: [('USD', 'United States Dollar'), ...]
+logger = logging.getLogger(__name__)
+
+API_URL = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies.json"
+BUNDLED_SNAPSHOT = os.path.join(os.path.dirname(__file__), "data", "currencies.json")
+FALLBACK_CURRENCIES = [('USD', 'US Dollar'), ('EUR', 'Euro'), ('GBP', 'British Pound')]
+
+
+class CurrencyCatalogue:
+    """In-memory currency list backed by a JSON snapshot on disk.
+
+    Reads never touch the network: choices() serves whatever is in memory.
+    refresh() fetches the API with a timeout and, on success, swaps the
+    in-memory list and rewrites the on-disk snapshot. A background thread
+    calls refresh() whenever the data is older than ``ttl`` seconds, and
+    failures simply keep the last good list, so the app works offline.
+    """
+
+    def __init__(self, snapshot_path: str = None, url: str = API_URL, ttl: float = 24 * 60 * 60,
+                 timeout: float = 5):
+        self.snapshot_path = snapshot_path
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.fetched_at = 0.0
+        self._choices = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def choices(self) -> list[tuple]:
+        """Currency list formatted for a SelectField: [('USD', 'US Dollar'), ...]"""
+        if self._choices is None:
+            self.load()
+        return self._choices
+
+    def load(self):
+        """Loads the on-disk snapshot if there is one, otherwise the bundled copy."""
+        for path in (self.snapshot_path, BUNDLED_SNAPSHOT):
+            if path and os.path.exists(path):
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        self._choices = self._format(json.load(f))
+                    if path == self.snapshot_path:
+                        self.fetched_at = os.path.getmtime(path)
+                    return
+                except (OSError, ValueError) as e:
+                    logger.warning("Could not read currency snapshot %s: %s", path, e)
+        self._choices = list(FALLBACK_CURRENCIES)
+
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at >= self.ttl
+
+    def refresh(self) -> bool:
+        """Fetches the latest list; returns False and keeps the old one on any failure."""
+        with self._lock:
+            try:
+                response = requests.get(self.url, timeout=self.timeout)
+                response.raise_for_status()
+                data = response.json()
+                choices = self._format(data)
+            except Exception as e:
+                logger.warning("Currency refresh from %s failed: %s", self.url, e)
+                return False
+            self._choices = choices
+            self.fetched_at = time.time()
+            if self.snapshot_path:
+                self._persist(data)
+            return True
+
+    def start(self):
+        """Starts the background refresh thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="currency-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        if self._choices is None:
+            self.load()
+        while not self._stop.is_set():
+            if self.is_stale() and not self.refresh():
+                # Offline: retry sooner than a full TTL, but don't hammer the API
+                wait = min(self.ttl, 15 * 60)
+            else:
+                wait = max(self.fetched_at + self.ttl - time.time(), 0)
+            self._stop.wait(wait)
+
+    def _persist(self, data: dict):
+        # Write then rename so a crash never leaves a half-written snapshot
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning("Could not write currency snapshot %s: %s", self.snapshot_path, e)
+
+    @staticmethod
+    def _format(data: dict) -> list[tuple]:
+        if not isinstance(data, dict) or not data:
+            raise ValueError("currency data must be a non-empty object")
         return [(code.upper(), name) for code, name in data.items()]
-    except Exception:
 
-        return [('USD', 'US Dollar'), ('EUR', 'Euro'), ('GBP', 'British Pound')]
\ No newline at end of file
+
+catalogue = CurrencyCatalogue()
+
+
+def init_app(app):
+    """Points the catalogue at the instance snapshot and starts background refresh."""
+    catalogue.snapshot_path = os.path.join(app.instance_path, "currencies.json")
+    catalogue.url = app.config.get("CURRENCY_API_URL", API_URL)
+    catalogue.ttl = app.config.get("CURRENCY_TTL_SECONDS", catalogue.ttl)
+    catalogue.timeout = app.config.get("CURRENCY_REQUEST_TIMEOUT", catalogue.timeout)
+    catalogue.load()
+    if app.config.get("CURRENCY_BACKGROUND_REFRESH"):
+        catalogue.start()
+
+
+def get_currency() -> list[tuple]:
+    """Currency list for a SelectField dropdown, served from memory."""
+    return catalogue.choices()
@@ -0,0 +1,44 @@
+# /Splity_flask/Splity/services/export_services.py
+
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import Iterator
+
+from Splity.adapters.repository import BillRepository, GroupRepository
+from Splity.domainmodel import money
+
+EXPORT_COLUMNS = ("bill_id", "date", "description", "amount", "paid_by", "participant", "amount_owed", "has_paid")
+
+
+def _records(group_id: int, batch_size: int):
+    # Stored minor units go out as exact major-unit Decimals ('12.50'), which import_bills reads back
+    exp = -money.exponent(GroupRepository().get_by_id(group_id).currency)
+    for batch in BillRepository().iter_ledger_rows(group_id, batch_size):
+        yield [
+            (bill_id, date.isoformat(), description, Decimal(amount).scaleb(exp), paid_by, participant,
+             None if amount_owed is None else Decimal(amount_owed).scaleb(exp), has_paid)
+            for bill_id, date, description, amount, paid_by, participant, amount_owed, has_paid in batch
+        ]
+
+
+def export_csv(group_id: int, batch_size: int = 1000) -> Iterator[str]:
+    """The group's bill and participant history as CSV, one chunk per batch of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for records in _records(group_id, batch_size):
+        writer.writerows(records)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when the group has no bills
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_jsonl(group_id: int, batch_size: int = 1000) -> Iterator[str]:
+    """The same rows as export_csv, as one JSON object per line"""
+    for records in _records(group_id, batch_size):
+        yield "".join(json.dumps(dict(zip(EXPORT_COLUMNS, record)), default=float) + "\n" for record in records)
@@ -2,7 +2,9 @@
 from typing import List
 
 from Splity.adapters.repository import GroupRepository, UserRepository, BillRepository
-from Splity.domainmodel.models import Group, User, Bill
+from Splity.adapters.unit_of_work import UnitOfWork
+from Splity.domainmodel.models import Group, Bill, UserSummary
+from Splity.services import change_services
 
 
 class GroupServiceException(Exception):
@@ -17,24 +19,34 @@ def create_group(name: str, description: str, currency: str, creator_id: int) ->
     if not name or not name.strip():
         raise GroupServiceException("Group name cannot be empty.")
     try:
-        new_group = Group(name=name, description=description, currency=currency, creator_id=creator_id)
-        repo.add(new_group)
+        new_group = Group.create(name=name, description=description, currency=currency, creator_id=creator_id)
+        with UnitOfWork():
+            repo.add(new_group)
         return new_group
     except Exception as e:
         raise GroupServiceException(f"Failed to create group: {str(e)}")
 
 
-def get_group_details(group_id: int, user_id: int):
+def require_membership(group_id: int, user_id: int):
+    """Raises unless the user is in the group; the happy path is one EXISTS query."""
     repo = GroupRepository()
+    if repo.is_member(group_id, user_id):
+        return
     group = repo.get_by_id(group_id)
     if not group:
         raise GroupServiceException("Group not found.")
-    user_groups = repo.get_group_members(group_id)
-    user_groups_ids = [user.id for user in user_groups]
-    if user_id not in user_groups_ids:
-        raise GroupServiceException(f"You are not in Group {group.name}")
-    members = repo.get_group_members(group_id)
-    return group, members
+    raise GroupServiceException(f"You are not in Group {group.name}")
+
+
+def is_member(group_id: int, user_id: int) -> bool:
+    repo = GroupRepository()
+    return repo.is_member(group_id, user_id)
+
+
+def get_member_version(group_id: int, user_id: int):
+    """Version counter of a group the user belongs to, or None if they don't (or it doesn't exist)"""
+    repo = GroupRepository()
+    return repo.get_version_for_member(group_id, user_id)
 
 
 def join_group(invite_code: str, user_id: int) -> Group:
@@ -43,10 +55,14 @@ def join_group(invite_code: str, user_id: int) -> Group:
     if len(invite_code) != 6:
         raise GroupServiceException("Invalid invite code format.")
     try:
-        success = repo.join_by_code(user_id, invite_code)
+        with UnitOfWork():
+            success = repo.join_by_code(user_id, invite_code)
+            if success:
+                group = repo.get_by_invite_code(invite_code)
+                member = UserRepository().get_summary_by_id(user_id)
+                change_services.record_changes(group.id, [change_services.member_joined(member)])
         if not success:
             raise GroupServiceException("Invalid invite code or you're already in this group.")
-        group = repo.get_by_invite_code(invite_code)
         return group
     except Exception as e:
         raise GroupServiceException(f"Failed to join group: {str(e)}")
@@ -61,7 +77,10 @@ def leave_from_group(group_id, user_id: int):
     if user_id == existing_group.creator_id:
         raise GroupServiceException("You are not allowed to leave the group.")
     try:
-        member_removed = repo.remove_member(group_id, user_id)
+        with UnitOfWork():
+            member_removed = repo.remove_member(group_id, user_id)
+            if member_removed:
+                change_services.record_changes(group_id, [change_services.member_left(user_id)])
         return member_removed, existing_group
     except Exception as e:
         raise GroupServiceException(f"Failed to leave group: {str(e)}")
@@ -78,7 +97,10 @@ def remove_user(group_id: int, user_id: int, requester_id: int):
         raise GroupServiceException("Only the creator can remove members.")
     if user_id == group.creator_id:
         raise GroupServiceException("You cannot remove yourself from the group.")
-    success = repo.remove_member(group_id, user_id)
+    with UnitOfWork():
+        success = repo.remove_member(group_id, user_id)
+        if success:
+            change_services.record_changes(group_id, [change_services.member_left(user_id)])
     if not success:
         raise GroupServiceException("User is not a member of this group.")
     return user_to_remove  # Return the user so we can flash their name
@@ -91,7 +113,8 @@ def delete_group(group_id: int, user_id: int):
     if user_id != group.creator_id:
         raise GroupServiceException("Not authorised to delete this group.")
     try:
-        success = repo.delete_group(group_id)
+        with UnitOfWork():
+            success = repo.delete_group(group_id)
         if not success:
             raise GroupServiceException("Group was not deleted.")
         return group
@@ -112,15 +135,32 @@ def edit_group(name: str, description: str, group_id: int, creator_id: int) -> G
     if existing_group:
         raise GroupServiceException("Group name already exists.")
     try:
+        # Name and description land together or not at all
+        with UnitOfWork():
+            repo.edit_group_name(group_id, name)
+            repo.edit_group_description(group_id, description)
+            change_services.record_changes(group_id, [change_services.group_edited(name=name, description=description)])
         current_group.name = name
         current_group.description = description
-        repo.edit_group_name(group_id, name)
-        repo.edit_group_description(group_id, description)
         return current_group
     except Exception as e:
         raise GroupServiceException(f"Failed to edit group: {str(e)}")
 
 
+def set_simplify_debts(group_id: int, user_id: int, simplify_debts: bool) -> Group:
+    repo = GroupRepository()
+    group = repo.get_by_id(group_id)
+    if not group:
+        raise GroupServiceException("Group not found.")
+    if user_id != group.creator_id:
+        raise GroupServiceException("Only the creator can change how debts are settled.")
+    with UnitOfWork():
+        repo.set_simplify_debts(group_id, simplify_debts)
+        change_services.record_changes(group_id, [change_services.group_edited(simplify_debts=simplify_debts)])
+    group.simplify_debts = simplify_debts
+    return group
+
+
 def get_group(group_id: int) -> Group:
     repo = GroupRepository()
     group = repo.get_by_id(group_id)
@@ -131,7 +171,7 @@ def get_user_groups(user_id: int) -> List[Group]:
     groups = repo.get_user_groups(user_id)
     return groups
 
-def get_group_members(group_id: int) -> List[User]:
+def get_group_members(group_id: int) -> List[UserSummary]:
     repo = GroupRepository()
     members = repo.get_group_members(group_id)
     return members
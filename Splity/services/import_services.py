@@ -0,0 +1,146 @@
+# /Splity_flask/Splity/services/import_services.py
+
+import codecs
+import csv
+from typing import BinaryIO, Iterable
+
+from Splity.adapters.repository import BillRepository, GroupRepository
+from Splity.adapters.unit_of_work import UnitOfWork
+from Splity.domainmodel import money
+from Splity.domainmodel.models import Bill
+from Splity.services import change_services
+from Splity.services.bill_services import BillServiceException, check_bill_description
+
+IMPORT_COLUMNS = ("payer", "description", "amount", "participants")
+IMPORT_CHUNK_SIZE = 500
+# Only the first errors are kept so a badly broken file can't grow the report without bound
+MAX_REPORTED_ERRORS = 100
+
+
+class BillImportException(Exception):
+    pass
+
+
+class BillImportReport:
+    """How many bills went in, and why rows were skipped"""
+
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0
+        self.errors = []
+
+    def skip(self, line: int, message: str):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def import_bills_file(group_id: int, stream: BinaryIO, requester_id: int = None,
+                      chunk_size: int = IMPORT_CHUNK_SIZE) -> BillImportReport:
+    """import_bills over a UTF-8 byte stream (an upload or an open file), decoded as it is read."""
+    try:
+        return import_bills(group_id, codecs.iterdecode(stream, "utf-8-sig"), requester_id, chunk_size)
+    except UnicodeDecodeError:
+        raise BillImportException("The file is not valid UTF-8; rows before the bad byte were imported.")
+
+
+def import_bills(group_id: int, lines: Iterable[str], requester_id: int = None,
+                 chunk_size: int = IMPORT_CHUNK_SIZE) -> BillImportReport:
+    """Imports bills from CSV lines with columns payer, description, amount, participants.
+
+    Payer and participants are usernames of group members; participants
+    are separated by ';' and split the amount equally. Rows are read
+    lazily and handled ``chunk_size`` at a time: one query resolves the
+    chunk's new usernames, one finds duplicate descriptions, and the
+    valid bills go in with bulk inserts in one transaction per chunk.
+    Rows failing add_bill_service's rules are skipped and reported.
+    ``requester_id``, when given, must be the group's creator.
+    """
+    group = GroupRepository().get_by_id(group_id)
+    if not group:
+        raise BillImportException("Group not found.")
+    if requester_id is not None and requester_id != group.creator_id:
+        raise BillImportException("Only the creator can import bills.")
+
+    reader = csv.DictReader(lines)
+    missing = [column for column in IMPORT_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise BillImportException(f"The CSV is missing column(s): {', '.join(missing)}.")
+
+    exp = money.exponent(group.currency)
+    report = BillImportReport()
+    member_ids = {}  # username -> id, or None for someone not in the group
+    chunk = []
+    for row in reader:
+        chunk.append((reader.line_num, row))
+        if len(chunk) >= chunk_size:
+            _import_chunk(group_id, exp, chunk, member_ids, report)
+            chunk = []
+    if chunk:
+        _import_chunk(group_id, exp, chunk, member_ids, report)
+    return report
+
+
+def _import_chunk(group_id: int, exp: int, chunk, member_ids: dict, report: BillImportReport):
+    parsed = []
+    for line, row in chunk:
+        try:
+            parsed.append((line, *_parse_row(row, exp)))
+        except BillServiceException as e:
+            report.skip(line, str(e))
+
+    unresolved = {username for _, payer, _, _, participants in parsed for username in (payer, *participants)}
+    unresolved -= member_ids.keys()
+    if unresolved:
+        found = GroupRepository().get_member_ids_by_username(group_id, unresolved)
+        member_ids.update({username: found.get(username) for username in unresolved})
+
+    bill_repo = BillRepository()
+    taken = bill_repo.get_existing_descriptions(group_id, {description for _, _, description, _, _ in parsed})
+    bills = []
+    for line, payer, description, amount, participants in parsed:
+        try:
+            strangers = [username for username in (payer, *participants) if member_ids[username] is None]
+            if strangers:
+                raise BillServiceException(f"Not in this group: {', '.join(strangers)}.")
+            check_bill_description(description, description if description in taken else None)
+        except BillServiceException as e:
+            report.skip(line, str(e))
+            continue
+        taken.add(description)
+        bills.append((
+            Bill(user_id=member_ids[payer], description=description, amount=amount, group_id=group_id),
+            money.split_evenly(amount, [member_ids[username] for username in participants]),
+        ))
+
+    if bills:
+        with UnitOfWork():
+            bill_ids = bill_repo.create_many(group_id, bills)
+            change_services.record_changes(group_id, [
+                change_services.bill_created(bill_id, bill, participants, exp)
+                for bill_id, (bill, participants) in zip(bill_ids, bills)
+            ])
+        report.imported += len(bills)
+
+
+def _parse_row(row: dict, exp: int):
+    payer = _username(row.get("payer"))
+    if not payer:
+        raise BillServiceException("Payer is missing.")
+    description = (row.get("description") or "").strip()
+    try:
+        amount = money.to_minor((row.get("amount") or "").strip(), exp)
+    except ValueError as e:
+        raise BillServiceException(str(e))
+    if amount <= 0:
+        raise BillServiceException("Amount must be greater than zero.")
+    participants = list(dict.fromkeys(
+        username for username in map(_username, (row.get("participants") or "").split(";")) if username
+    ))
+    if not participants:
+        raise BillServiceException("A bill needs at least one participant.")
+    return payer, description, amount, participants
+
+
+def _username(value) -> str:
+    return (value or "").strip().lstrip("@")
@@ -0,0 +1,129 @@
+# /Splity_flask/Splity/services/settlement_service.py
+
+import heapq
+import time
+from typing import Dict, List
+
+def settle_balances(balances: Dict[int, int]) -> List[list]:
+    """Greedy settlement of net balances (integer minor units) keyed by user id.
+
+    Repeatedly pairs the largest debtor with the largest creditor, returning
+    [debtor_id, amount, creditor_id] rows. Creditors and debtors live in two
+    heaps, so each transfer costs O(log n) instead of a full rescan. Ties are
+    broken by the order of ``balances``, which keeps the output identical to
+    the original min()/max() scan. Integer balances settle exactly, so every
+    transfer zeroes a debtor or a creditor and no tolerance is needed.
+    """
+    creditors = []
+    debtors = []
+    for order, (user_id, balance) in enumerate(balances.items()):
+        if balance > 0:
+            creditors.append((-balance, order, user_id))
+        elif balance < 0:
+            debtors.append((balance, order, user_id))
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        creditor_bal, creditor_order, creditor_id = heapq.heappop(creditors)
+        debtor_bal, debtor_order, debtor_id = heapq.heappop(debtors)
+        creditor_bal = -creditor_bal
+        amount = min(abs(debtor_bal), creditor_bal)
+        debtor_bal += amount
+        creditor_bal -= amount
+        transfers.append([debtor_id, amount, creditor_id])
+        if debtor_bal < 0:
+            heapq.heappush(debtors, (debtor_bal, debtor_order, debtor_id))
+        if creditor_bal > 0:
+            heapq.heappush(creditors, (-creditor_bal, creditor_order, creditor_id))
+    return transfers
+
+
+# Bitmask DP is 2^n; past this many non-zero balances we go straight to greedy
+SIMPLIFY_MAX_BALANCES = 20
+# Seconds the DP may run before giving up and falling back to greedy
+SIMPLIFY_TIME_BUDGET = 0.25
+
+
+def simplify_balances(balances: Dict[int, int], time_budget: float = SIMPLIFY_TIME_BUDGET) -> List[list]:
+    """Minimal-transfer settlement ("simplify debts").
+
+    Splits the balances into as many independent zero-sum subgroups as
+    possible and settles each one greedily. A subgroup of k people needs at
+    most k - 1 transfers, so more subgroups means fewer payments overall.
+    Falls back to settle_balances when there are too many balances or the
+    DP runs over ``time_budget`` seconds.
+    """
+    remaining = [user_id for user_id, value in balances.items() if value != 0]
+
+    # An exact opposite pair is always its own subgroup in some optimal
+    # partition, so peel those off before the exponential part
+    groups = []
+    unmatched = {}
+    for user_id in remaining:
+        partner = unmatched.get(-balances[user_id])
+        if partner:
+            groups.append([partner.pop(), user_id])
+        else:
+            unmatched.setdefault(balances[user_id], []).append(user_id)
+    remaining = [user_id for user_ids in unmatched.values() for user_id in user_ids]
+
+    if len(remaining) > SIMPLIFY_MAX_BALANCES:
+        return settle_balances(balances)
+    partition = _zero_sum_partition([balances[user_id] for user_id in remaining], time_budget)
+    if partition is None:
+        return settle_balances(balances)
+    groups += [[remaining[i] for i in subset] for subset in partition]
+
+    # Settle subgroups in the order of their first member so output is stable
+    order = {user_id: index for index, user_id in enumerate(balances)}
+    transfers = []
+    for group in sorted(groups, key=lambda members: min(order[m] for m in members)):
+        members = sorted(group, key=order.get)
+        transfers += settle_balances({user_id: balances[user_id] for user_id in members})
+    return transfers
+
+
+def _zero_sum_partition(values: List[int], time_budget: float):
+    """Partition indexes of ``values`` into the most zero-sum subsets.
+
+    dp[mask] is the largest number of disjoint zero-sum subsets that can be
+    peeled off ``mask`` one element at a time; following the best choices
+    back from the full mask gives a chain whose zero-sum masks nest, and the
+    differences between consecutive ones are the subsets. Returns None if
+    ``time_budget`` runs out.
+    """
+    n = len(values)
+    if n == 0:
+        return []
+    deadline = time.perf_counter() + time_budget
+    size = 1 << n
+    sums = [0] * size
+    dp = [0] * size
+    choice = [0] * size
+    for mask in range(1, size):
+        if not mask & 0xFFF and time.perf_counter() > deadline:
+            return None
+        low = (mask & -mask).bit_length() - 1
+        sums[mask] = sums[mask & (mask - 1)] + values[low]
+        best, best_bit = -1, 0
+        bits = mask
+        while bits:
+            bit = bits & -bits
+            if dp[mask ^ bit] > best:
+                best, best_bit = dp[mask ^ bit], bit
+            bits ^= bit
+        dp[mask] = best + (1 if sums[mask] == 0 else 0)
+        choice[mask] = best_bit
+
+    subsets = []
+    mask = size - 1
+    boundary = mask
+    while mask:
+        mask ^= choice[mask]
+        if sums[mask] == 0:
+            diff = boundary ^ mask
+            subsets.append([i for i in range(n) if diff >> i & 1])
+            boundary = mask
+    return subsets
@@ -0,0 +1 @@
+# /Splity_flask/benchmarks/__init__.py
@@ -0,0 +1,113 @@
+# /Splity_flask/benchmarks/bench_add_bill.py
+"""Commits per bill and latency of add_bill_service against group size.
+
+Compares the bulk write path used by add_bill_service with the legacy
+one-commit-per-participant path. Runs against a throwaway file database so
+each commit pays a real fsync.
+
+    python -m benchmarks.bench_add_bill
+"""
+
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks import harness
+
+GROUP_SIZES = [2, 10, 40, 100]
+BILLS_PER_SIZE = 50
+
+
+def _setup_app():
+    db_dir = tempfile.mkdtemp(prefix="splity-bench-")
+    return harness.make_app(f"sqlite:///{os.path.join(db_dir, 'bench.db')}")
+
+
+def _seed_group(size: int):
+    from Splity.adapters.repository import UserRepository, GroupRepository
+    from Splity.adapters.unit_of_work import UnitOfWork
+    from Splity.domainmodel.models import User, Group
+
+    user_repo = UserRepository()
+    group_repo = GroupRepository()
+    with UnitOfWork():
+        user_ids = [
+            user_repo.add(User(name=f"User {size}-{i}", username=f"u{size}_{i}", email=f"u{size}_{i}@bench.test",
+                               password="x"))
+            for i in range(size)
+        ]
+        group_id = group_repo.add(Group.create(name=f"Bench {size}", description="bench", currency="USD",
+                                        creator_id=user_ids[0]))
+        for user_id in user_ids[1:]:
+            group_repo.join_by_code(user_id, group_repo.get_by_id(group_id).invite_code)
+    return group_id, user_ids
+
+
+def _legacy_add_bill(user_id, description, amount, owe_members, group_id):
+    from datetime import datetime, timezone
+
+    from Splity.adapters.database import db
+    from Splity.adapters.orm import BillORM, BillParticipantORM
+    from Splity.adapters.repository import BillRepository, GroupBalanceRepository, GroupRepository
+    from Splity.adapters.unit_of_work import UnitOfWork
+    from Splity.domainmodel import money
+
+    # The bill, then one row per participant, each in its own unit of work
+    # as when repositories committed. The ledger gets each row's share as it
+    # goes, so the bulk path that follows starts from consistent balances.
+    amount = money.to_minor(amount, 2)
+    with UnitOfWork():
+        bill_orm = BillORM(user_id=user_id, description=description, date=datetime.now(timezone.utc),
+                           amount=amount, group_id=group_id)
+        db.session.add(bill_orm)
+        db.session.flush()
+        bill_id = bill_orm.id
+        GroupBalanceRepository().apply_deltas(group_id, {user_id: amount})
+        GroupRepository().bump_version(group_id)
+    BillRepository().get_by_id(bill_id)
+    for participant_id, share in money.split_evenly(amount, owe_members):
+        with UnitOfWork():
+            db.session.add(BillParticipantORM(bill_id=bill_id, user_id=participant_id, amount_owed=share,
+                                              has_paid=False))
+            GroupBalanceRepository().apply_deltas(group_id, {participant_id: -share})
+            GroupRepository().bump_version(group_id)
+
+
+def _measure(add_bill, group_id, user_ids, label):
+    from sqlalchemy import event
+    from Splity.adapters.database import db
+
+    commits = 0
+
+    def _on_commit(conn):
+        nonlocal commits
+        commits += 1
+
+    event.listen(db.engine, "commit", _on_commit)
+    timings = []
+    try:
+        for i in range(BILLS_PER_SIZE):
+            start = time.perf_counter()
+            add_bill(user_ids[0], f"{label} bill {i}", 100.0, user_ids, group_id)
+            timings.append(time.perf_counter() - start)
+    finally:
+        event.remove(db.engine, "commit", _on_commit)
+    return commits / BILLS_PER_SIZE, statistics.median(timings) * 1000
+
+
+def main():
+    from Splity.services import bill_services
+
+    app = _setup_app()
+    with app.app_context():
+        print(f"{'members':>8} {'path':>7} {'commits/bill':>13} {'median ms':>10}")
+        for size in GROUP_SIZES:
+            group_id, user_ids = _seed_group(size)
+            for label, add_bill in (("legacy", _legacy_add_bill), ("bulk", bill_services.add_bill_service)):
+                commits, median_ms = _measure(add_bill, group_id, user_ids, label)
+                print(f"{size:>8} {label:>7} {commits:>13.1f} {median_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# /Splity_flask/benchmarks/bench_balances.py
+"""Ledger recompute in SQL against a columnar fetch-and-reduce in Python.
+
+For one group of growing size, times GroupBalanceRepository.recompute
+(two integer GROUP BYs on covering indexes) against fetching the raw
+(user_id, delta) columns and reducing them with a dict loop, or with a
+NumPy integer scatter-add when NumPy is installed. NumPy is optional:
+without it that column reads "skipped". Every strategy must agree with
+the ledger.
+
+    python -m benchmarks.bench_balances
+    python -m benchmarks.bench_balances --bills 2000 20000 --repeat 5
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks import harness
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bills", type=int, nargs="+", default=[2_000, 20_000, 60_000], help="bills in the group")
+    parser.add_argument("--participants", type=int, default=5, help="participants per bill")
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def _ledger_columns(group_id: int):
+    """(user_ids, deltas) for every paid and owed row of the group, read off the raw cursor"""
+    from sqlalchemy import select, union_all
+    from Splity.adapters.database import db
+    from Splity.adapters.orm import BillORM, BillParticipantORM
+
+    paid = select(BillORM.user_id, BillORM.amount).where(BillORM.group_id == group_id)
+    owed = select(BillParticipantORM.user_id, -BillParticipantORM.amount_owed) \
+        .join(BillORM, BillORM.id == BillParticipantORM.bill_id).where(BillORM.group_id == group_id)
+    rows = db.session.connection().execute(union_all(paid, owed)).cursor.fetchall()
+    return tuple(zip(*rows)) or ((), ())
+
+
+def _reduce_python(group_id: int):
+    user_ids, deltas = _ledger_columns(group_id)
+    net = {}
+    for user_id, delta in zip(user_ids, deltas):
+        net[user_id] = net.get(user_id, 0) + delta
+    return net
+
+
+def _reduce_numpy(group_id: int):
+    user_ids, deltas = _ledger_columns(group_id)
+    ids, slots = numpy.unique(numpy.asarray(user_ids, dtype=numpy.int64), return_inverse=True)
+    # add.at rather than bincount: bincount weights are float64 and round past 2**53
+    sums = numpy.zeros(len(ids), dtype=numpy.int64)
+    numpy.add.at(sums, slots, numpy.asarray(deltas, dtype=numpy.int64))
+    return dict(zip(ids.tolist(), sums.tolist()))
+
+
+def _time(run, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from Splity.adapters.repository import GroupBalanceRepository
+
+    print(f"{'rows':>8} {'sql ms':>10} {'python ms':>10} {'numpy ms':>10} {'same':>5}")
+    for bills in args.bills:
+        app = harness.make_app("sqlite:///:memory:")
+        group_id = harness.seed(app, 200, 1, 20, bills, args.participants)[0]
+        with app.app_context():
+            ledger = {user_id: cents for user_id, cents in GroupBalanceRepository().get_net_cents(group_id).items()
+                      if cents}
+            strategies = [lambda: GroupBalanceRepository().recompute(group_id), lambda: _reduce_python(group_id)]
+            if numpy is not None:
+                strategies.append(lambda: _reduce_numpy(group_id))
+            columns, same = [], True
+            for run in strategies:
+                ms, net = _time(run, args.repeat)
+                columns.append(f"{ms:.2f}")
+                same = same and {user_id: cents for user_id, cents in net.items() if cents} == ledger
+            if numpy is None:
+                columns.append("skipped")
+        rows = bills * (args.participants + 1)
+        print(f"{rows:>8} {columns[0]:>10} {columns[1]:>10} {columns[2]:>10} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# /Splity_flask/benchmarks/bench_commits.py
+"""Commits and latency per request for the main write routes.
+
+Measures POST /group/<id>/create_bill, POST /group/<id>/edit and
+POST /create_group on a file database, so every commit pays an fsync.
+Emits JSON; run it on two revisions to compare.
+
+    python -m benchmarks.bench_commits --output after.json
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks import harness
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=20, help="members in the benchmarked group")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def run(args):
+    database_uri = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='splity-bench-'), 'bench.db')}"
+    app = harness.make_app(database_uri)
+    group_id = harness.seed(app, users=args.members, groups=1, members=args.members, bills=0, participants=0)[0]
+    client = harness.login(app.test_client())
+
+    def create_bill(i):
+        client.post(f"/group/{group_id}/create_bill",
+                    data={"description": f"Bench bill {i}", "names": ["User 0 | @user0"], "amount": 42})
+
+    def edit_group(i):
+        client.post(f"/group/{group_id}/edit", data={"name": f"Renamed {i}", "description": f"Edited {i}"})
+
+    def create_group(i):
+        client.post("/create_group", data={"name": f"New group {i}", "description": "Bench", "currency": "USD"})
+
+    results = {
+        "POST /group/<id>/create_bill": harness.measure(create_bill, args.repeat),
+        "POST /group/<id>/edit": harness.measure(edit_group, args.repeat),
+        "POST /create_group": harness.measure(create_group, args.repeat),
+    }
+    return {
+        "benchmark": "commits",
+        "revision": harness.git_revision(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": results,
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    harness.emit(run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# /Splity_flask/benchmarks/bench_fragment_cache.py
+"""Group page latency and fragment-cache hit ratio under a read-mostly load.
+
+Views GET /group/<id> for ``--views`` requests, adding a bill every
+``--write-every`` views, once with the fragment cache disabled and once
+with it enabled (optionally backed by a directory).
+
+    python -m benchmarks.bench_fragment_cache --bills 2000 --write-every 20
+"""
+
+import argparse
+import tempfile
+
+from benchmarks import harness
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--members", type=int, default=20)
+    parser.add_argument("--bills", type=int, default=500)
+    parser.add_argument("--participants", type=int, default=5)
+    parser.add_argument("--views", type=int, default=200)
+    parser.add_argument("--write-every", type=int, default=20, help="add a bill after this many views")
+    parser.add_argument("--disk", action="store_true", help="also store fragments in a temporary directory")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def _run_mode(args, **overrides):
+    from Splity.home import fragments
+
+    app = harness.make_app(**overrides)
+    group_id = harness.seed(app, args.users, 1, args.members, args.bills, args.participants)[0]
+    client = harness.login(app.test_client())
+
+    def view(i):
+        if args.write_every and i and i % args.write_every == 0:
+            client.post(f"/group/{group_id}/create_bill",
+                        data={"description": f"Bench bill {i}", "names": ["User 0 | @user0"], "amount": 42})
+        client.get(f"/group/{group_id}")
+
+    result = harness.measure(view, args.views)
+    result["cache"] = fragments.group_fragments.stats()
+    return result
+
+
+def run(args):
+    cached = {"FRAGMENT_CACHE_DIR": tempfile.mkdtemp(prefix="splity-fragments-")} if args.disk else {}
+    return {
+        "benchmark": "fragment_cache",
+        "revision": harness.git_revision(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": {
+            "uncached": _run_mode(args, FRAGMENT_CACHE_SIZE=0),
+            "cached": _run_mode(args, **cached),
+        },
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    harness.emit(run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# /Splity_flask/benchmarks/bench_group_details.py
+"""Latency and query counts for the group details hot path.
+
+Seeds a synthetic database, then measures GET /group/<id>, GET /,
+POST /group/<id>/create_bill, the JSON summary (fresh and revalidated
+with If-None-Match), a /changes poll that picks up one new bill and
+settling_algorithm called directly.
+Results are JSON so runs can be diffed across commits.
+
+    python -m benchmarks.bench_group_details --bills 2000 --output before.json
+    python -m benchmarks.bench_group_details --db file --bills 2000 --output after.json
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks import harness
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--groups", type=int, default=5)
+    parser.add_argument("--members", type=int, default=20, help="members per group")
+    parser.add_argument("--bills", type=int, default=500, help="bills per group")
+    parser.add_argument("--participants", type=int, default=5, help="participants per bill")
+    parser.add_argument("--db", choices=["memory", "file"], default="memory")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def run(args):
+    if args.db == "file":
+        database_uri = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='splity-bench-'), 'bench.db')}"
+    else:
+        database_uri = "sqlite:///:memory:"
+    app = harness.make_app(database_uri)
+    group_ids = harness.seed(app, args.users, args.groups, args.members, args.bills, args.participants)
+    group_id = group_ids[0]
+    client = harness.login(app.test_client())
+
+    def settle(_):
+        from Splity.services import bill_services
+        with app.app_context():
+            bill_services.settling_algorithm(group_id)
+
+    def create_bill(i):
+        client.post(f"/group/{group_id}/create_bill",
+                    data={"description": f"Bench bill {i}", "names": ["User 0 | @user0"], "amount": 42})
+
+    summary_url = f"/api/group/{group_id}/summary"
+
+    results = {
+        "GET /group/<id>": harness.measure(lambda _: client.get(f"/group/{group_id}"), args.repeat),
+        "GET /": harness.measure(lambda _: client.get("/"), args.repeat),
+        "POST /group/<id>/create_bill": harness.measure(create_bill, args.repeat),
+    }
+    summary = client.get(summary_url)
+    etag = summary.headers["ETag"]
+    # The create_bill runs above logged one change each; ask for the last one only
+    changes_url = f"/api/group/{group_id}/changes?since={summary.get_json()['group']['change_seq'] - 1}"
+    results.update({
+        "GET /api/group/<id>/summary": harness.measure(lambda _: client.get(summary_url), args.repeat),
+        "GET /api/group/<id>/summary (304)": harness.measure(
+            lambda _: client.get(summary_url, headers={"If-None-Match": etag}), args.repeat),
+        "GET /api/group/<id>/changes (1 new)": harness.measure(lambda _: client.get(changes_url), args.repeat),
+        "settling_algorithm": harness.measure(settle, args.repeat),
+    })
+    return {
+        "benchmark": "group_details",
+        "revision": harness.git_revision(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": results,
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    harness.emit(run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# /Splity_flask/benchmarks/bench_import.py
+"""Bulk CSV import against one add_bill_service call per row.
+
+Both paths insert the same bills into a fresh group on a file database
+and report rows per second, queries and commits.
+
+    python -m benchmarks.bench_import --rows 5000
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from benchmarks import harness
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=10)
+    parser.add_argument("--participants", type=int, default=4, help="participants per bill")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def _csv(args):
+    lines = ["payer,description,amount,participants"]
+    for i in range(args.rows):
+        participants = ";".join(f"user{(i + k) % args.members}" for k in range(args.participants))
+        lines.append(f"user{i % args.members},Imported bill {i},{10 + i % 90}.50,{participants}")
+    return "\n".join(lines) + "\n"
+
+
+def _run(args, label, load):
+    from Splity.adapters.instrumentation import record_queries
+
+    database_uri = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='splity-bench-'), 'bench.db')}"
+    app = harness.make_app(database_uri)
+    group_id = harness.seed(app, users=args.members, groups=1, members=args.members, bills=0, participants=0)[0]
+    with app.app_context(), record_queries(keep_statements=False) as stats:
+        start = time.perf_counter()
+        load(group_id)
+        elapsed = time.perf_counter() - start
+    return {
+        "path": label,
+        "rows_per_second": round(args.rows / elapsed, 1),
+        "seconds": round(elapsed, 3),
+        "queries": stats.count,
+        "commits": stats.commits,
+    }
+
+
+def run(args):
+    from decimal import Decimal
+
+    from Splity.services import bill_services, import_services
+
+    data = _csv(args)
+
+    def per_row(group_id):
+        for i in range(args.rows):
+            owe = [(i + k) % args.members + 1 for k in range(args.participants)]
+            bill_services.add_bill_service(i % args.members + 1, f"Imported bill {i}",
+                                           Decimal(f"{10 + i % 90}.50"), owe, group_id)
+
+    def bulk(group_id):
+        import_services.import_bills(group_id, io.StringIO(data), chunk_size=args.chunk_size)
+
+    return {
+        "benchmark": "import",
+        "revision": harness.git_revision(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": [_run(args, "add_bill_service per row", per_row), _run(args, "import_bills", bulk)],
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    harness.emit(run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
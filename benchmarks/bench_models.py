@@ -0,0 +1,103 @@
+# /Splity_flask/benchmarks/bench_models.py
+"""Memory per domain object, construction throughput, and listing reads.
+
+Builds N of each domain entity the way the repositories do and reports
+bytes per object (tracemalloc) and constructions per second. Then times
+the list reads that now return tuple projections (bills with creators,
+group members) on a seeded database.
+
+    python -m benchmarks.bench_models
+    python -m benchmarks.bench_models --objects 200000 --bills 20000
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks import harness
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=int, default=100_000, help="instances built per entity")
+    parser.add_argument("--bills", type=int, default=20_000, help="bills in the seeded group")
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def _builders():
+    from Splity.domainmodel.models import Bill, BillParticipant, Group, User
+
+    now = datetime.now(timezone.utc)
+    return {
+        "User": lambda i: User(user_id=i, name="User", username=f"user{i}", email="u@bench.test", password="x"),
+        "Bill": lambda i: Bill(bill_id=i, user_id=1, description="Dinner", amount=1250, created_date=now,
+                               group_id=1),
+        "BillParticipant": lambda i: BillParticipant(participant_id=i, bill_id=i, user_id=1, amount_owed=250),
+        # No invite code, as UserRepository builds a user's groups
+        "Group": lambda i: Group(group_id=i, name="Trip", description="bench", currency="USD", creator_id=1),
+    }
+
+
+def _bytes_per_object(build, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    # The list holding them costs 8 bytes a slot; leave it out
+    return (size - 8 * count) / count
+
+
+def _per_second(build, count: int, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(count):
+            build(i)
+        timings.append(time.perf_counter() - start)
+    return count / statistics.median(timings)
+
+
+def _time_ms(run, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print(f"{'entity':<16} {'bytes/obj':>10} {'builds/s':>12}")
+    for name, build in _builders().items():
+        size = _bytes_per_object(build, args.objects)
+        rate = _per_second(build, args.objects, args.repeat)
+        print(f"{name:<16} {size:>10.0f} {rate:>12,.0f}")
+
+    from Splity.adapters.repository import BillRepository, GroupRepository
+
+    app = harness.make_app("sqlite:///:memory:")
+    group_id = harness.seed(app, 2_000, 1, 1_000, args.bills, 5)[0]
+    reads = {
+        "bills with creators": lambda: BillRepository().get_all_bills_with_creators(group_id),
+        "first bill page (50)": lambda: BillRepository().get_bills_page(group_id, 50),
+        "group members": lambda: GroupRepository().get_group_members(group_id),
+    }
+    print(f"\n{'read':<24} {'ms':>8}")
+    for name, read in reads.items():
+        def run():
+            # A fresh context each time, so the per-request cache starts empty
+            with app.app_context():
+                read()
+        print(f"{name:<24} {_time_ms(run, args.repeat):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
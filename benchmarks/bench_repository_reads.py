@@ -0,0 +1,79 @@
+# /Splity_flask/benchmarks/bench_repository_reads.py
+"""Per-call overhead of the hot repository reads.
+
+Calls each read many times on a small seeded database, outside a request
+so the per-request cache never answers, and reports microseconds per
+call. The data is small on purpose: what is left is statement building,
+compilation lookup and result handling.
+
+    python -m benchmarks.bench_repository_reads
+    python -m benchmarks.bench_repository_reads --calls 5000 --repeat 5
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks import harness
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2_000, help="calls per read and repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def _reads(group_id: int):
+    from Splity.adapters.repository import (
+        BillParticipantRepository,
+        BillRepository,
+        GroupBalanceRepository,
+        GroupRepository,
+        UserRepository,
+    )
+
+    users, groups, bills = UserRepository(), GroupRepository(), BillRepository()
+    invite_code = groups.get_by_id(group_id).invite_code
+    return {
+        "User.get_by_username": lambda i: users.get_by_username(f"user{i % 20}"),
+        "User.get_summary_by_id": lambda i: users.get_summary_by_id(i % 20 + 1),
+        "Group.get_by_invite_code": lambda i: groups.get_by_invite_code(invite_code),
+        "Group.get_by_name_and_membership": lambda i: groups.get_by_name_and_membership("Group 0", 1),
+        "Group.is_member": lambda i: groups.is_member(group_id, i % 20 + 1),
+        "Group.get_version_for_member": lambda i: groups.get_version_for_member(group_id, 1),
+        "Group.get_group_members": lambda i: groups.get_group_members(group_id),
+        "Bill.get_bill_by_name_and_group_id": lambda i: bills.get_bill_by_name_and_group_id(f"Bill {i % 50}", group_id),
+        "Bill.get_all_bills": lambda i: bills.get_all_bills(group_id),
+        "Bill.get_total_spending": lambda i: bills.get_total_spending(group_id),
+        "Bill.get_bills_page": lambda i: bills.get_bills_page(group_id, 10),
+        "Participant.get_participants_for_bill": lambda i: BillParticipantRepository().get_participants_for_bill(i % 50 + 1),
+        "Balance.get_net_cents": lambda i: GroupBalanceRepository().get_net_cents(group_id),
+    }
+
+
+def _microseconds_per_call(read, calls: int, repeat: int) -> float:
+    for i in range(100):
+        read(i)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(calls):
+            read(i)
+        timings.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = harness.make_app("sqlite:///:memory:")
+    group_id = harness.seed(app, 20, 1, 20, 50, 3)[0]
+
+    print(f"{'read':<40} {'us/call':>9}")
+    with app.app_context():
+        for name, read in _reads(group_id).items():
+            print(f"{name:<40} {_microseconds_per_call(read, args.calls, args.repeat):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
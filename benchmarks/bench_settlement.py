@@ -0,0 +1,60 @@
+# /Splity_flask/benchmarks/bench_settlement.py
+"""Heap-based settlement solver against the original min()/max() scan.
+
+Synthetic groups of 10, 1,000 and 100,000 members with random balances
+that sum to zero. The scan is O(n^2), so it is only timed up to
+LEGACY_MAX_MEMBERS.
+
+    python -m benchmarks.bench_settlement
+"""
+
+import random
+import time
+
+from Splity.services import settlement_service
+
+GROUP_SIZES = [10, 1_000, 100_000]
+LEGACY_MAX_MEMBERS = 1_000
+
+
+def _legacy_greedy(balances):
+    balances = dict(balances)
+    texts = []
+    while max(balances.values()) > 0.01:
+        debtor_id, debtor_bal = min(balances.items(), key=lambda x: x[1])
+        creditor_id, creditor_bal = max(balances.items(), key=lambda x: x[1])
+        amount_to_transfer = min(abs(debtor_bal), creditor_bal)
+        balances[debtor_id] += amount_to_transfer
+        balances[creditor_id] -= amount_to_transfer
+        texts.append([debtor_id, round(amount_to_transfer, 2), creditor_id])
+    return texts
+
+
+def _synthetic_balances(size: int, seed: int = 235):
+    rng = random.Random(seed)
+    balances = {user_id: rng.randint(-50000, 50000) for user_id in range(1, size)}  # cents
+    balances[size] = -sum(balances.values())
+    return balances
+
+
+def _time(solver, balances):
+    start = time.perf_counter()
+    transfers = solver(balances)
+    return (time.perf_counter() - start) * 1000, transfers
+
+
+def main():
+    print(f"{'members':>8} {'heap ms':>10} {'scan ms':>10} {'transfers':>10} {'same':>5}")
+    for size in GROUP_SIZES:
+        balances = _synthetic_balances(size)
+        heap_ms, transfers = _time(settlement_service.settle_balances, balances)
+        if size <= LEGACY_MAX_MEMBERS:
+            scan_ms, legacy_transfers = _time(_legacy_greedy, balances)
+            scan, same = f"{scan_ms:.2f}", str(transfers == legacy_transfers)
+        else:
+            scan, same = "skipped", "-"
+        print(f"{size:>8} {heap_ms:>10.2f} {scan:>10} {len(transfers):>10} {same:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# /Splity_flask/benchmarks/bench_sqlite_concurrency.py
+"""Reads under concurrent writes on a SQLite file: driver defaults against the production profile.
+
+Two scenarios, each run with the profile off (rollback journal, default
+pool) and on (config.Config's SQLITE_PRAGMAS and pool sizing):
+
+  * importers: writer threads bulk-import bills while reader threads fetch
+    the first bill page and the spending total; reports reads per second
+    and read latency while the writes are in flight.
+  * export: a streaming CSV-style export holds its read cursor open while
+    one bill is added; reports whether and how fast that write commits.
+
+    python -m benchmarks.bench_sqlite_concurrency
+    python -m benchmarks.bench_sqlite_concurrency --writers 4 --readers 8
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+
+from benchmarks import harness
+
+PROFILES = {
+    "driver defaults": {"SQLITE_PRAGMAS": {}, "SQLALCHEMY_ENGINE_OPTIONS": {}},
+    "production profile": {},
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bills", type=int, default=20_000, help="bills seeded into the group")
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--imports", type=int, default=3, help="CSV files each writer imports")
+    parser.add_argument("--rows", type=int, default=2_000, help="bills per imported file")
+    return parser.parse_args(argv)
+
+
+def _seeded_app(directory: str, overrides: dict, bills: int):
+    app = harness.make_app(f"sqlite:///{directory}/bench.db", **overrides)
+    group_id = harness.seed(app, 50, 1, 20, bills, 3)[0]
+    return app, group_id
+
+
+def _usernames(app, group_id: int):
+    from Splity.adapters.repository import GroupRepository
+
+    with app.app_context():
+        return [member.username for member in GroupRepository().get_group_members(group_id)]
+
+
+def _importers(app, group_id: int, args) -> dict:
+    from Splity.adapters.database import db
+    from Splity.services import bill_services, import_services
+
+    usernames = _usernames(app, group_id)
+    latencies, errors = [], []
+    done = threading.Event()
+
+    def write(n):
+        with app.app_context():
+            for f in range(args.imports):
+                lines = ["payer,description,amount,participants"] + [
+                    f"{usernames[n]},Writer {n} file {f} row {i},10.00,{';'.join(usernames[:4])}"
+                    for i in range(args.rows)
+                ]
+                try:
+                    import_services.import_bills(group_id, lines, chunk_size=args.rows)
+                except Exception as e:
+                    errors.append(e)
+                db.session.remove()
+
+    def read():
+        with app.app_context():
+            while not done.is_set():
+                start = time.perf_counter()
+                try:
+                    bill_services.get_bills_page_service(group_id, None, 50)
+                    bill_services.total_group_spending(group_id)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                except Exception as e:
+                    errors.append(e)
+                db.session.remove()
+
+    writers = [threading.Thread(target=write, args=(n,)) for n in range(args.writers)]
+    readers = [threading.Thread(target=read) for _ in range(args.readers)]
+    start = time.perf_counter()
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    latencies.sort()
+    return {
+        "reads/s": len(latencies) / elapsed,
+        "p50 ms": latencies[len(latencies) // 2] if latencies else None,
+        "p95 ms": latencies[int(len(latencies) * 0.95)] if latencies else None,
+        "errors": len(errors),
+    }
+
+
+def _write_during_export(app, group_id: int) -> str:
+    from Splity.adapters.repository import BillRepository, GroupRepository
+    from Splity.services import bill_services
+
+    with app.app_context():
+        member_ids = [member.id for member in GroupRepository().get_group_members(group_id)]
+    streaming, written = threading.Event(), threading.Event()
+
+    def export():
+        with app.app_context():
+            batches = BillRepository().iter_ledger_rows(group_id, batch_size=100)
+            next(batches)
+            streaming.set()
+            written.wait(60)
+            for _ in batches:
+                pass
+
+    reader = threading.Thread(target=export)
+    reader.start()
+    streaming.wait(60)
+    start = time.perf_counter()
+    try:
+        with app.app_context():
+            bill_services.add_bill_service(member_ids[0], "During export", "10.00", member_ids[:3], group_id)
+        outcome = "committed"
+    except Exception:
+        outcome = "locked"
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    written.set()
+    reader.join()
+    return f"{outcome} after {elapsed_ms:.0f} ms"
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    from Splity.adapters.database import db
+
+    print(f"{'profile':<20} {'reads/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}  write during export")
+    for name, overrides in PROFILES.items():
+        with tempfile.TemporaryDirectory() as directory:
+            app, group_id = _seeded_app(directory, overrides, args.bills)
+            result = _importers(app, group_id, args)
+            export = _write_during_export(app, group_id)
+            with app.app_context():
+                db.engine.dispose()
+        print(f"{name:<20} {result['reads/s']:>8.0f} {result['p50 ms']:>8.1f} {result['p95 ms']:>8.1f} "
+              f"{result['errors']:>7}  {export}")
+
+
+if __name__ == "__main__":
+    main()
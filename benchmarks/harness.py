@@ -0,0 +1,131 @@
+# /Splity_flask/benchmarks/harness.py
+"""Shared setup for the benchmark scripts.
+
+Apps are built with the same create_app overrides as the ``app`` fixture in
+tests/conftest.py, and clients log in the way ``authenticated_client`` does.
+"""
+
+import json
+import random
+import statistics
+import subprocess
+import time
+
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+
+BENCH_PASSWORD = "Password123"
+
+
+def make_app(database_uri: str = "sqlite:///:memory:", **overrides):
+    from Splity import create_app
+
+    config = {
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": database_uri,
+        "WTF_CSRF_ENABLED": False,
+        "CURRENCY_BACKGROUND_REFRESH": False,
+    }
+    config.update(overrides)
+    return create_app(config)
+
+
+def login(client, username: str = "user0", password: str = BENCH_PASSWORD):
+    client.post("/login", data={"username": username, "password": password})
+    return client
+
+
+def seed(app, users: int, groups: int, members: int, bills: int, participants: int, seed: int = 235):
+    """Fills the database with synthetic users, groups, bills and participants.
+
+    Every group contains user0 (the creator of the first group) plus random
+    other members. Bills are paid by a random member and split equally among
+    ``participants`` random members. Writes go through bulk inserts and the
+    balance ledger is rebuilt at the end. Returns the group ids.
+    """
+    from Splity.adapters.database import db
+    from Splity.adapters.orm import UserORM, GroupORM, BillORM, BillParticipantORM, user_groups
+    from Splity.domainmodel import money
+    from Splity.services import balance_services
+
+    rng = random.Random(seed)
+    members = min(members, users)
+    participants = min(participants, members)
+    password = generate_password_hash(BENCH_PASSWORD)
+    with app.app_context():
+        db.session.execute(insert(UserORM), [
+            {"id": i + 1, "name": f"User {i}", "username": f"user{i}", "email": f"user{i}@bench.test",
+             "password": password}
+            for i in range(users)
+        ])
+        group_members = {}
+        for g in range(groups):
+            group_id = g + 1
+            others = rng.sample(range(2, users + 1), members - 1)
+            group_members[group_id] = [1] + others
+            db.session.execute(insert(GroupORM).values(
+                id=group_id, name=f"Group {g}", description="Synthetic", currency="USD",
+                creator_id=1, invite_code=f"B{group_id:05d}"
+            ))
+        db.session.execute(insert(user_groups), [
+            {"group_id": group_id, "user_id": user_id}
+            for group_id, ids in group_members.items() for user_id in ids
+        ])
+        bill_id = 0
+        for group_id, ids in group_members.items():
+            bill_rows, participant_rows = [], []
+            for b in range(bills):
+                bill_id += 1
+                amount = rng.randint(500, 30000)  # cents
+                bill_rows.append({"id": bill_id, "user_id": rng.choice(ids), "description": f"Bill {b}",
+                                  "amount": amount, "group_id": group_id})
+                for user_id, share in money.split_evenly(amount, rng.sample(ids, participants)):
+                    participant_rows.append({"bill_id": bill_id, "user_id": user_id,
+                                             "amount_owed": share, "has_paid": False})
+            if bill_rows:
+                db.session.execute(insert(BillORM), bill_rows)
+                db.session.execute(insert(BillParticipantORM), participant_rows)
+        db.session.commit()
+        balance_services.rebuild_balances()
+    return list(group_members)
+
+
+def measure(run, repeat: int):
+    """Runs ``run`` ``repeat`` times; returns latency percentiles and mean query and commit counts."""
+    from Splity.adapters.instrumentation import record_queries
+
+    timings, queries, commits = [], [], []
+    for i in range(repeat):
+        with record_queries(keep_statements=False) as stats:
+            start = time.perf_counter()
+            run(i)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(stats.count)
+        commits.append(stats.commits)
+    timings.sort()
+    return {
+        "runs": repeat,
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "max_ms": round(timings[-1], 3),
+        "queries": round(statistics.mean(queries), 2),
+        "commits": round(statistics.mean(commits), 2),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def emit(report: dict, output: str = None):
+    """Writes the report as JSON to ``output`` or stdout."""
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
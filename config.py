@@ -6,3 +6,35 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'you-will-never-guess'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///splity.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Sized pool for the threaded server; Splity.adapters.database drops the
+    # sizing for in-memory SQLite, which lives on a single shared connection
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+    }
+    # Run on every new SQLite connection: readers never wait for the writer
+    # (WAL), commits skip the fsync that WAL makes unnecessary for safety
+    # (NORMAL), and a locked database is waited on rather than reported
+    SQLITE_PRAGMAS = {
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64 * 1024,  # KiB, so 64 MiB per connection
+        'mmap_size': 256 * 1024 * 1024,
+    }
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', '1') != '0'
+    # Currency catalogue: served from memory, refreshed in the background
+    CURRENCY_API_URL = os.environ.get('CURRENCY_API_URL') or \
+        'https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies.json'
+    CURRENCY_TTL_SECONDS = int(os.environ.get('CURRENCY_TTL_SECONDS', 24 * 60 * 60))
+    CURRENCY_REQUEST_TIMEOUT = 5
+    CURRENCY_BACKGROUND_REFRESH = os.environ.get('CURRENCY_BACKGROUND_REFRESH', '1') != '0'
+    # Group page fragment cache; set FRAGMENT_CACHE_DIR to share renders between workers
+    FRAGMENT_CACHE_SIZE = int(os.environ.get('FRAGMENT_CACHE_SIZE', 256))
+    FRAGMENT_CACHE_DIR = os.environ.get('FRAGMENT_CACHE_DIR') or None
+    # Signed-in users cached per worker; edits made by other workers show after the TTL
+    SESSION_USER_CACHE_SIZE = int(os.environ.get('SESSION_USER_CACHE_SIZE', 1024))
+    SESSION_USER_CACHE_TTL = int(os.environ.get('SESSION_USER_CACHE_TTL', 60))
+    # Bills per page of a group's history
+    BILLS_PAGE_SIZE = int(os.environ.get('BILLS_PAGE_SIZE', 50))
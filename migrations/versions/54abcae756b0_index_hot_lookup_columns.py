@@ -0,0 +1,50 @@
+"""Index hot lookup columns
+
+Revision ID: 54abcae756b0
+Revises: 9546ba995039
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '54abcae756b0'
+down_revision = '9546ba995039'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.create_index('ix_bills_group_id_user_id', ['group_id', 'user_id'], unique=False)
+        batch_op.create_index('ix_bills_group_id_description', ['group_id', 'description'], unique=False)
+        batch_op.create_index('ix_bills_user_id', ['user_id'], unique=False)
+
+    with op.batch_alter_table('bill_participants', schema=None) as batch_op:
+        batch_op.create_index('ix_bill_participants_bill_id_user_id', ['bill_id', 'user_id'], unique=False)
+        batch_op.create_index('ix_bill_participants_user_id', ['user_id'], unique=False)
+
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.create_index('ix_groups_creator_id_name', ['creator_id', 'name'], unique=False)
+
+    with op.batch_alter_table('user_groups', schema=None) as batch_op:
+        batch_op.create_index('ix_user_groups_group_id_user_id', ['group_id', 'user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_groups', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_groups_group_id_user_id')
+
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.drop_index('ix_groups_creator_id_name')
+
+    with op.batch_alter_table('bill_participants', schema=None) as batch_op:
+        batch_op.drop_index('ix_bill_participants_user_id')
+        batch_op.drop_index('ix_bill_participants_bill_id_user_id')
+
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.drop_index('ix_bills_user_id')
+        batch_op.drop_index('ix_bills_group_id_description')
+        batch_op.drop_index('ix_bills_group_id_user_id')
@@ -0,0 +1,26 @@
+"""Index bills for keyset pagination
+
+Revision ID: 8d41b6e0c2f7
+Revises: 3c7e52d1f9a4
+Create Date: 2026-10-18 15:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41b6e0c2f7'
+down_revision = '3c7e52d1f9a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.create_index('ix_bills_group_id_date_id', ['group_id', 'date', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.drop_index('ix_bills_group_id_date_id')
@@ -0,0 +1,59 @@
+"""Group balance ledger and simplify debts
+
+Revision ID: 9546ba995039
+Revises: 1afbca912085
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9546ba995039'
+down_revision = '1afbca912085'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('simplify_debts', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    group_balances = op.create_table('group_balances',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('net_cents', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('group_id', 'user_id')
+    )
+
+    # Seed the ledger from existing bills, current members only, rounding
+    # each row to cents the same way the application does
+    conn = op.get_bind()
+    members = {(group_id, user_id) for user_id, group_id in conn.execute(
+        sa.text("SELECT user_id, group_id FROM user_groups"))}
+    net_cents = {}
+    paid = conn.execute(sa.text("SELECT group_id, user_id, amount FROM bills WHERE group_id IS NOT NULL"))
+    for group_id, user_id, amount in paid:
+        net_cents[(group_id, user_id)] = net_cents.get((group_id, user_id), 0) + round(float(amount) * 100)
+    owed = conn.execute(sa.text(
+        "SELECT bills.group_id, bill_participants.user_id, bill_participants.amount_owed "
+        "FROM bill_participants JOIN bills ON bills.id = bill_participants.bill_id "
+        "WHERE bills.group_id IS NOT NULL"))
+    for group_id, user_id, amount_owed in owed:
+        net_cents[(group_id, user_id)] = net_cents.get((group_id, user_id), 0) - round(float(amount_owed) * 100)
+    rows = [
+        {'group_id': group_id, 'user_id': user_id, 'net_cents': cents}
+        for (group_id, user_id), cents in net_cents.items()
+        if (group_id, user_id) in members
+    ]
+    if rows:
+        op.bulk_insert(group_balances, rows)
+
+
+def downgrade():
+    op.drop_table('group_balances')
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.drop_column('simplify_debts')
@@ -0,0 +1,30 @@
+"""Remove bills of deleted groups
+
+Revision ID: a8e1d2c7b4f9
+Revises: f3c81a5e6d20
+Create Date: 2026-10-19 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e1d2c7b4f9'
+down_revision = 'f3c81a5e6d20'
+branch_labels = None
+depends_on = None
+
+# Deleting a group used to leave its bills behind, and SQLite hands the
+# deleted group's id to the next group created, which then showed them
+_ORPHANED_BILLS = "SELECT id FROM bills WHERE group_id IS NOT NULL AND group_id NOT IN (SELECT id FROM groups)"
+
+
+def upgrade():
+    op.execute(sa.text(f"DELETE FROM bill_participants WHERE bill_id IN ({_ORPHANED_BILLS})"))
+    op.execute(sa.text(f"DELETE FROM bills WHERE id IN ({_ORPHANED_BILLS})"))
+
+
+def downgrade():
+    # The rows are gone; there is nothing to put back
+    pass
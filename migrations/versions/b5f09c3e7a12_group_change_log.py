@@ -0,0 +1,33 @@
+"""Group change log
+
+Revision ID: b5f09c3e7a12
+Revises: 8d41b6e0c2f7
+Create Date: 2026-10-18 17:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5f09c3e7a12'
+down_revision = '8d41b6e0c2f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('group_changes',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('seq', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('kind', sa.String(length=40), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['groups.id'], ),
+    sa.PrimaryKeyConstraint('group_id', 'seq')
+    )
+
+
+def downgrade():
+    op.drop_table('group_changes')
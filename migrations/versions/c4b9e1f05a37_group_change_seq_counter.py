@@ -0,0 +1,30 @@
+"""Group change seq counter
+
+Revision ID: c4b9e1f05a37
+Revises: a8e1d2c7b4f9
+Create Date: 2026-10-19 11:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4b9e1f05a37'
+down_revision = 'a8e1d2c7b4f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False))
+    # Carry on from where each group's log already is
+    op.execute(sa.text(
+        "UPDATE groups SET change_seq = "
+        "COALESCE((SELECT MAX(seq) FROM group_changes WHERE group_changes.group_id = groups.id), 0)"))
+
+
+def downgrade():
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.drop_column('change_seq')
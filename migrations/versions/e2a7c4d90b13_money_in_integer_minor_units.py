@@ -0,0 +1,120 @@
+"""Money in integer minor units
+
+Revision ID: e2a7c4d90b13
+Revises: b5f09c3e7a12
+Create Date: 2026-10-18 18:40:00.000000
+
+"""
+from decimal import Decimal
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c4d90b13'
+down_revision = 'b5f09c3e7a12'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of Splity.domainmodel.money.CURRENCY_EXPONENTS as of this revision
+CURRENCY_EXPONENTS = {
+    **dict.fromkeys(("BIF", "CLP", "DJF", "GNF", "ISK", "JPY", "KMF", "KRW", "PYG", "RWF", "UGX", "UYI", "VND",
+                     "VUV", "XAF", "XOF", "XPF"), 0),
+    **dict.fromkeys(("BHD", "IQD", "JOD", "KWD", "LYD", "OMR", "TND"), 3),
+    **dict.fromkeys(("CLF", "UYW"), 4),
+}
+
+
+def _exponent(currency):
+    return CURRENCY_EXPONENTS.get((currency or "").upper(), 2)
+
+
+def _bill_exponents(conn):
+    return {bill_id: _exponent(currency) for bill_id, currency in conn.execute(sa.text(
+        "SELECT bills.id, groups.currency FROM bills LEFT JOIN groups ON groups.id = bills.group_id"))}
+
+
+def upgrade():
+    conn = op.get_bind()
+    exponents = _bill_exponents(conn)
+    bills = {bill_id: round(Decimal(repr(amount)).scaleb(exponents[bill_id]))
+             for bill_id, amount in conn.execute(sa.text("SELECT id, amount FROM bills"))}
+    shares = {}
+    for row_id, bill_id, user_id, amount_owed in conn.execute(sa.text(
+            "SELECT id, bill_id, user_id, amount_owed FROM bill_participants ORDER BY bill_id, user_id")):
+        shares.setdefault(bill_id, []).append([row_id, round(Decimal(repr(amount_owed)).scaleb(exponents[bill_id]))])
+
+    # Equal float splits (10 / 3) round to shares that miss the bill by a
+    # unit or two; hand the difference out one unit at a time from the
+    # lowest user id, as money.split_evenly does for new bills
+    for bill_id, rows in shares.items():
+        difference = bills.get(bill_id, 0) - sum(share for _, share in rows)
+        if 0 < abs(difference) <= len(rows):
+            step = 1 if difference > 0 else -1
+            for row in rows[:abs(difference)]:
+                row[1] += step
+
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.alter_column('amount', existing_type=sa.Float(), type_=sa.Integer(), existing_nullable=False)
+    with op.batch_alter_table('bill_participants', schema=None) as batch_op:
+        batch_op.alter_column('amount_owed', existing_type=sa.Float(), type_=sa.Integer(), existing_nullable=False)
+
+    if bills:
+        conn.execute(sa.text("UPDATE bills SET amount = :amount WHERE id = :id"),
+                     [{"id": bill_id, "amount": amount} for bill_id, amount in bills.items()])
+    participant_rows = [{"id": row_id, "amount_owed": share} for rows in shares.values() for row_id, share in rows]
+    if participant_rows:
+        conn.execute(sa.text("UPDATE bill_participants SET amount_owed = :amount_owed WHERE id = :id"),
+                     participant_rows)
+
+    # The ledger was kept in hundredths whatever the currency; rebuild it
+    # from the exact amounts for current members
+    conn.execute(sa.text("DELETE FROM group_balances"))
+    conn.execute(sa.text(
+        "INSERT INTO group_balances (group_id, user_id, net_cents) "
+        "SELECT ledger.group_id, ledger.user_id, SUM(ledger.delta) FROM ("
+        "  SELECT group_id, user_id, amount AS delta FROM bills WHERE group_id IS NOT NULL"
+        "  UNION ALL"
+        "  SELECT bills.group_id, bill_participants.user_id, -bill_participants.amount_owed"
+        "  FROM bill_participants JOIN bills ON bills.id = bill_participants.bill_id"
+        "  WHERE bills.group_id IS NOT NULL"
+        ") AS ledger JOIN user_groups ON user_groups.group_id = ledger.group_id "
+        "AND user_groups.user_id = ledger.user_id "
+        "GROUP BY ledger.group_id, ledger.user_id"))
+    # Page fragments cached on disk hold the old float amounts
+    conn.execute(sa.text("UPDATE groups SET version = version + 1"))
+
+
+def downgrade():
+    conn = op.get_bind()
+    exponents = _bill_exponents(conn)
+    bills = [{"id": bill_id, "amount": float(Decimal(amount).scaleb(-exponents[bill_id]))}
+             for bill_id, amount in conn.execute(sa.text("SELECT id, amount FROM bills"))]
+    participants = [{"id": row_id, "amount_owed": float(Decimal(amount_owed).scaleb(-exponents[bill_id]))}
+                    for row_id, bill_id, amount_owed in conn.execute(sa.text(
+                        "SELECT id, bill_id, amount_owed FROM bill_participants"))]
+
+    with op.batch_alter_table('bill_participants', schema=None) as batch_op:
+        batch_op.alter_column('amount_owed', existing_type=sa.Integer(), type_=sa.Float(), existing_nullable=False)
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.alter_column('amount', existing_type=sa.Integer(), type_=sa.Float(), existing_nullable=False)
+
+    if bills:
+        conn.execute(sa.text("UPDATE bills SET amount = :amount WHERE id = :id"), bills)
+    if participants:
+        conn.execute(sa.text("UPDATE bill_participants SET amount_owed = :amount_owed WHERE id = :id"), participants)
+    # Back to hundredths, the only unit the older code knows
+    conn.execute(sa.text("DELETE FROM group_balances"))
+    conn.execute(sa.text(
+        "INSERT INTO group_balances (group_id, user_id, net_cents) "
+        "SELECT ledger.group_id, ledger.user_id, SUM(ledger.delta) FROM ("
+        "  SELECT group_id, user_id, ROUND(amount * 100) AS delta FROM bills WHERE group_id IS NOT NULL"
+        "  UNION ALL"
+        "  SELECT bills.group_id, bill_participants.user_id, -ROUND(bill_participants.amount_owed * 100)"
+        "  FROM bill_participants JOIN bills ON bills.id = bill_participants.bill_id"
+        "  WHERE bills.group_id IS NOT NULL"
+        ") AS ledger JOIN user_groups ON user_groups.group_id = ledger.group_id "
+        "AND user_groups.user_id = ledger.user_id "
+        "GROUP BY ledger.group_id, ledger.user_id"))
+    conn.execute(sa.text("UPDATE groups SET version = version + 1"))
@@ -0,0 +1,37 @@
+"""Covering indexes for ledger sums
+
+Revision ID: f3c81a5e6d20
+Revises: e2a7c4d90b13
+Create Date: 2026-10-18 20:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c81a5e6d20'
+down_revision = 'e2a7c4d90b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.drop_index('ix_bills_group_id_user_id')
+        batch_op.create_index('ix_bills_group_id_user_id_amount', ['group_id', 'user_id', 'amount'], unique=False)
+
+    with op.batch_alter_table('bill_participants', schema=None) as batch_op:
+        batch_op.drop_index('ix_bill_participants_bill_id_user_id')
+        batch_op.create_index('ix_bill_participants_bill_id_user_id_amount_owed',
+                              ['bill_id', 'user_id', 'amount_owed'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bill_participants', schema=None) as batch_op:
+        batch_op.drop_index('ix_bill_participants_bill_id_user_id_amount_owed')
+        batch_op.create_index('ix_bill_participants_bill_id_user_id', ['bill_id', 'user_id'], unique=False)
+
+    with op.batch_alter_table('bills', schema=None) as batch_op:
+        batch_op.drop_index('ix_bills_group_id_user_id_amount')
+        batch_op.create_index('ix_bills_group_id_user_id', ['group_id', 'user_id'], unique=False)
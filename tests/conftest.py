@@ -1,15 +1,16 @@
 import pytest
 from Splity import create_app
 from Splity.adapters.database import db
-from Splity.services import currency_service
+from Splity.home import fragments
+from Splity.services import currency_service, authentication_services
 
 @pytest.fixture
 def app():
-    app = create_app()
-    app.config.update({
+    app = create_app({
         "TESTING": True,
         "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-        "WTF_CSRF_ENABLED": False  # Makes testing forms much easier
+        "WTF_CSRF_ENABLED": False,  # Makes testing forms much easier
+        "CURRENCY_BACKGROUND_REFRESH": False
     })
 
     with app.app_context():
@@ -17,6 +18,25 @@ def app():
         yield app
         db.session.remove()
         db.drop_all()
+    # Ids are reused by the next test's fresh database
+    authentication_services.clear_session_user_cache()
+    fragments.group_fragments.clear()
+
+@pytest.fixture
+def file_app(tmp_path):
+    """The app on a SQLite file: real locking between threads, and the production profile applies"""
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'splity.db'}",
+        "WTF_CSRF_ENABLED": False,
+        "CURRENCY_BACKGROUND_REFRESH": False,
+    })
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+    authentication_services.clear_session_user_cache()
+    fragments.group_fragments.clear()
 
 @pytest.fixture(autouse=True)
 def mock_currency_choices(monkeypatch):
@@ -74,3 +94,25 @@ def login_user(client):
         )
 
     return _login_user
+
+
+@pytest.fixture
+def assert_max_queries(app):
+    """Fails if the block runs more than ``limit`` SQL statements.
+
+        with assert_max_queries(8):
+            client.get(f"/group/{group_id}")
+    """
+    from contextlib import contextmanager
+    from Splity.adapters.instrumentation import record_queries
+
+    @contextmanager
+    def _assert_max_queries(limit):
+        db.session.expire_all()
+        with record_queries() as stats:
+            yield stats
+        assert stats.count <= limit, (
+            f"{stats.count} queries, expected at most {limit}:\n" + "\n".join(stats.statements)
+        )
+
+    return _assert_max_queries
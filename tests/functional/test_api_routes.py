@@ -0,0 +1,101 @@
+from Splity.adapters.repository import GroupRepository, UserRepository
+
+
+def _create_group(client, name="Api Group"):
+    client.post('/create_group', data={"name": name, "description": "JSON", "currency": "USD"})
+    creator = UserRepository().get_by_username("testuser")
+    return GroupRepository().get_by_name_and_creator(name, creator.id)
+
+
+def _switch_user(client, username):
+    client.get('/logout')
+    client.post('/register', data={
+        "name": username.title(), "username": username, "email": f"{username}@test.com",
+        "password": "Password123", "password2": "Password123"
+    })
+    client.post('/login', data={"username": username, "password": "Password123"})
+
+
+def test_group_summary_returns_totals_balances_and_transfers(authenticated_client):
+    group = _create_group(authenticated_client)
+    _switch_user(authenticated_client, "friend")
+    authenticated_client.post('/join_group', data={"invite_code": group.invite_code})
+    authenticated_client.post(f'/group/{group.id}/create_bill', data={
+        "description": "Dinner",
+        "names": ["Test User | @testuser", "Friend | @friend"],
+        "amount": 30,
+    })
+
+    response = authenticated_client.get(f'/api/group/{group.id}/summary')
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"group-')
+    body = response.get_json()
+    assert body["total_spending"] == 30
+    balances = {member["username"]: member["net_balance"] for member in body["members"]}
+    assert balances == {"testuser": -15.0, "friend": 15.0}
+    friend_id = next(member["id"] for member in body["members"] if member["username"] == "friend")
+    assert body["transfers"] == [{"from": group.creator_id, "to": friend_id, "amount": 15.0}]
+
+
+def test_unchanged_group_answers_304_with_one_query(authenticated_client, assert_max_queries):
+    group = _create_group(authenticated_client)
+    etag = authenticated_client.get(f'/api/group/{group.id}/summary').headers["ETag"]
+
+    with assert_max_queries(1):
+        response = authenticated_client.get(f'/api/group/{group.id}/summary', headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.data == b""
+
+
+def test_group_change_moves_the_etag(authenticated_client):
+    group = _create_group(authenticated_client)
+    etag = authenticated_client.get(f'/api/group/{group.id}/summary').headers["ETag"]
+    authenticated_client.post(f'/group/{group.id}/create_bill', data={
+        "description": "Taxi", "names": ["Test User | @testuser"], "amount": 12,
+    })
+
+    response = authenticated_client.get(f'/api/group/{group.id}/summary', headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.get_json()["total_spending"] == 12
+
+
+def test_group_summary_needs_login_and_membership(authenticated_client):
+    group = _create_group(authenticated_client)
+    assert authenticated_client.get('/api/group/999/summary').status_code == 404
+
+    _switch_user(authenticated_client, "outsider")
+    assert authenticated_client.get(f'/api/group/{group.id}/summary').status_code == 404
+
+    authenticated_client.get('/logout')
+    response = authenticated_client.get(f'/api/group/{group.id}/summary')
+    assert response.status_code == 401
+    assert response.get_json() == {"error": "Authentication required."}
+
+
+def test_group_changes_returns_deltas_since_a_summary(authenticated_client):
+    group = _create_group(authenticated_client)
+    since = authenticated_client.get(f'/api/group/{group.id}/summary').get_json()["group"]["change_seq"]
+    authenticated_client.post(f'/group/{group.id}/create_bill', data={
+        "description": "Taxi", "names": ["Test User | @testuser"], "amount": 12,
+    })
+
+    body = authenticated_client.get(f'/api/group/{group.id}/changes?since={since}').get_json()
+
+    assert [(change["kind"], change["data"]["description"]) for change in body["changes"]] == [("bill_created", "Taxi")]
+    assert body["latest"] == since + 1 and body["has_more"] is False
+    caught_up = authenticated_client.get(f'/api/group/{group.id}/changes?since={body["latest"]}').get_json()
+    assert caught_up["changes"] == [] and caught_up["latest"] == body["latest"]
+
+
+def test_group_changes_rejects_bad_since_and_outsiders(authenticated_client):
+    group = _create_group(authenticated_client)
+    assert authenticated_client.get(f'/api/group/{group.id}/changes?since=abc').status_code == 400
+    assert authenticated_client.get(f'/api/group/{group.id}/changes?since=-1').status_code == 400
+
+    _switch_user(authenticated_client, "outsider")
+    assert authenticated_client.get(f'/api/group/{group.id}/changes').status_code == 404
@@ -70,6 +70,7 @@ def test_delete_bill_requires_creator_or_owner(authenticated_client):
         "username": "otheruser",
         "password": "Password123"
     }, follow_redirects=True)
+    authenticated_client.post('/join_group', data={"invite_code": group.invite_code}, follow_redirects=True)
 
     response = authenticated_client.get(
         f'/group/{group.id}/delete_bill/{bill.id}',
@@ -77,3 +78,109 @@ def test_delete_bill_requires_creator_or_owner(authenticated_client):
     )
 
     assert "not authorised" in response.get_data(as_text=True).lower()
+
+
+def test_non_member_cannot_create_bill(authenticated_client):
+    authenticated_client.post('/create_group', data={
+        "name": "Members Only",
+        "description": "Shared bills",
+        "currency": "USD"
+    }, follow_redirects=True)
+
+    creator = UserRepository().get_by_username("testuser")
+    group = GroupRepository().get_user_groups(creator.id)[0]
+
+    authenticated_client.get('/logout', follow_redirects=True)
+    authenticated_client.post('/register', data={
+        "name": "Outsider", "username": "outsider",
+        "email": "outsider@test.com", "password": "Password123",
+        "password2": "Password123"
+    }, follow_redirects=True)
+    authenticated_client.post('/login', data={
+        "username": "outsider",
+        "password": "Password123"
+    }, follow_redirects=True)
+
+    response = authenticated_client.post(
+        f'/group/{group.id}/create_bill',
+        data={"description": "Sneaky", "names": ["Outsider | @outsider"], "amount": 5},
+        follow_redirects=True,
+    )
+
+    assert "you are not in group" in response.get_data(as_text=True).lower()
+    assert BillRepository().get_bill_by_name_and_group_id("Sneaky", group.id) is None
+
+
+def test_export_streams_group_bills(authenticated_client):
+    authenticated_client.post('/create_group', data={
+        "name": "Export Group",
+        "description": "Shared bills",
+        "currency": "USD"
+    }, follow_redirects=True)
+    creator = UserRepository().get_by_username("testuser")
+    group = GroupRepository().get_user_groups(creator.id)[0]
+    authenticated_client.post(f'/group/{group.id}/create_bill', data={
+        "description": "Dinner",
+        "names": _group_members_choices(group.id),
+        "amount": 42,
+    })
+
+    response = authenticated_client.get(f'/group/{group.id}/export.csv')
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert "attachment" in response.headers["Content-Disposition"]
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0].startswith("bill_id,date,description")
+    assert ",Dinner,42.00,testuser,testuser,42.00,False" in lines[1]
+
+    response = authenticated_client.get(f'/group/{group.id}/export.jsonl')
+    assert response.mimetype == "application/x-ndjson"
+    assert '"description": "Dinner"' in response.get_data(as_text=True)
+
+
+def test_non_member_cannot_export(authenticated_client):
+    authenticated_client.post('/create_group', data={
+        "name": "Private Export",
+        "description": "Shared bills",
+        "currency": "USD"
+    }, follow_redirects=True)
+    creator = UserRepository().get_by_username("testuser")
+    group = GroupRepository().get_user_groups(creator.id)[0]
+
+    authenticated_client.get('/logout', follow_redirects=True)
+    authenticated_client.post('/register', data={
+        "name": "Outsider", "username": "outsider",
+        "email": "outsider@test.com", "password": "Password123",
+        "password2": "Password123"
+    }, follow_redirects=True)
+    authenticated_client.post('/login', data={"username": "outsider", "password": "Password123"})
+
+    response = authenticated_client.get(f'/group/{group.id}/export.csv')
+    assert response.status_code == 302
+
+
+def test_import_bills_upload(authenticated_client):
+    import io
+
+    authenticated_client.post('/create_group', data={
+        "name": "Import Group",
+        "description": "Shared bills",
+        "currency": "USD"
+    }, follow_redirects=True)
+    creator = UserRepository().get_by_username("testuser")
+    group = GroupRepository().get_user_groups(creator.id)[0]
+    upload = io.BytesIO(b"payer,description,amount,participants\n"
+                        b"testuser,Groceries,25.40,testuser\n"
+                        b"testuser,Groceries,3,testuser\n")
+
+    response = authenticated_client.post(
+        f'/group/{group.id}/import_bills',
+        data={"file": (upload, "bills.csv")},
+        content_type="multipart/form-data",
+        follow_redirects=True,
+    )
+
+    text = response.get_data(as_text=True)
+    assert "Imported 1 bill(s), skipped 1." in text
+    assert "Line 3: You already have a bill with the same description" in text
+    assert BillRepository().get_bill_by_name_and_group_id("Groceries", group.id).amount == 2540
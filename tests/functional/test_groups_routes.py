@@ -544,6 +544,54 @@ def test_delete_group_requires_creator(authenticated_client):
         "username": "otheruser",
         "password": "Password123"
     }, follow_redirects=True)
+    authenticated_client.post('/join_group', data={"invite_code": group.invite_code}, follow_redirects=True)
 
     response = authenticated_client.get(f'/group/{group.id}/delete', follow_redirects=True)
     assert "not authorised" in response.get_data(as_text=True).lower()
+
+
+def test_creator_can_toggle_simplify_debts(authenticated_client):
+    authenticated_client.post('/create_group', data={
+        "name": "Simplify Group",
+        "description": "Fewer payments",
+        "currency": "USD"
+    }, follow_redirects=True)
+
+    group_repo = GroupRepository()
+    creator = UserRepository().get_by_username("testuser")
+    group = group_repo.get_user_groups(creator.id)[0]
+    assert group.simplify_debts is False
+
+    response = authenticated_client.get(f'/group/{group.id}/simplify_debts', follow_redirects=True)
+
+    assert "simplify debts turned on" in response.get_data(as_text=True).lower()
+    assert group_repo.get_by_id(group.id).simplify_debts is True
+
+
+def test_member_cannot_toggle_simplify_debts(authenticated_client):
+    authenticated_client.post('/create_group', data={
+        "name": "Creator Only",
+        "description": "Settings",
+        "currency": "USD"
+    }, follow_redirects=True)
+
+    group_repo = GroupRepository()
+    creator = UserRepository().get_by_username("testuser")
+    group = group_repo.get_user_groups(creator.id)[0]
+
+    authenticated_client.get('/logout', follow_redirects=True)
+    authenticated_client.post('/register', data={
+        "name": "Member User", "username": "memberuser",
+        "email": "member@test.com", "password": "Password123",
+        "password2": "Password123"
+    }, follow_redirects=True)
+    authenticated_client.post('/login', data={
+        "username": "memberuser",
+        "password": "Password123"
+    }, follow_redirects=True)
+    authenticated_client.post('/join_group', data={"invite_code": group.invite_code}, follow_redirects=True)
+
+    response = authenticated_client.get(f'/group/{group.id}/simplify_debts', follow_redirects=True)
+
+    assert "only the creator" in response.get_data(as_text=True).lower()
+    assert group_repo.get_by_id(group.id).simplify_debts is False
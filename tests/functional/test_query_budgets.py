@@ -0,0 +1,165 @@
+import base64
+import json
+import logging
+import re
+
+from Splity.adapters.repository import GroupRepository, UserRepository
+
+
+def _create_group_with_bills(client, bill_count):
+    client.post('/create_group', data={
+        "name": "Budget Group",
+        "description": "Query budgets",
+        "currency": "USD"
+    }, follow_redirects=True)
+    creator = UserRepository().get_by_username("testuser")
+    group = GroupRepository().get_user_groups(creator.id)[0]
+    for i in range(bill_count):
+        client.post(f'/group/{group.id}/create_bill', data={
+            "description": f"Bill {i}",
+            "names": ["Test User | @testuser"],
+            "amount": 10,
+        })
+    return group
+
+
+def test_responses_carry_server_timing_header(authenticated_client):
+    response = authenticated_client.get('/')
+
+    server_timing = response.headers["Server-Timing"]
+    assert server_timing.startswith("db;dur=")
+    assert "queries" in server_timing
+    assert "app;dur=" in server_timing
+
+
+def test_request_logs_structured_sql_line(authenticated_client, caplog):
+    with caplog.at_level(logging.INFO, logger="Splity.sql"):
+        authenticated_client.get('/')
+
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["path"] == "/"
+    assert line["status"] == 200
+    assert line["queries"] >= 1
+    assert "db_ms" in line and "slowest_sql" in line
+
+
+def test_group_details_query_budget(authenticated_client, assert_max_queries):
+    group = _create_group_with_bills(authenticated_client, 2)
+    with assert_max_queries(12) as few_bills:
+        authenticated_client.get(f'/group/{group.id}')
+
+    for i in range(2, 20):
+        authenticated_client.post(f'/group/{group.id}/create_bill', data={
+            "description": f"Bill {i}",
+            "names": ["Test User | @testuser"],
+            "amount": 10,
+        })
+    with assert_max_queries(few_bills.count):
+        response = authenticated_client.get(f'/group/{group.id}')
+    assert b"Bill 19" in response.data
+
+
+def test_home_query_budget(authenticated_client, assert_max_queries):
+    _create_group_with_bills(authenticated_client, 1)
+    with assert_max_queries(4):
+        authenticated_client.get('/')
+
+
+def test_group_details_served_from_fragment_cache(authenticated_client, assert_max_queries):
+    group = _create_group_with_bills(authenticated_client, 3)
+    first = authenticated_client.get(f'/group/{group.id}')
+    assert 'fragment;desc="miss"' in first.headers.get_all("Server-Timing")
+
+    with assert_max_queries(4):
+        second = authenticated_client.get(f'/group/{group.id}')
+    assert 'fragment;desc="hit"' in second.headers.get_all("Server-Timing")
+    assert b"Bill 2" in second.data
+
+
+def test_group_writes_invalidate_fragment_cache(authenticated_client):
+    group = _create_group_with_bills(authenticated_client, 1)
+    authenticated_client.get(f'/group/{group.id}')
+
+    authenticated_client.post(f'/group/{group.id}/create_bill', data={
+        "description": "Late bill",
+        "names": ["Test User | @testuser"],
+        "amount": 10,
+    })
+    response = authenticated_client.get(f'/group/{group.id}')
+    assert 'fragment;desc="miss"' in response.headers.get_all("Server-Timing")
+    assert b"Late bill" in response.data
+
+    authenticated_client.post(f'/group/{group.id}/edit', data={"name": "Renamed", "description": "Edited"})
+    response = authenticated_client.get(f'/group/{group.id}')
+    assert 'fragment;desc="miss"' in response.headers.get_all("Server-Timing")
+
+
+def test_group_details_pages_bill_history(authenticated_client, app):
+    app.config["BILLS_PAGE_SIZE"] = 2
+    group = _create_group_with_bills(authenticated_client, 5)
+
+    first = authenticated_client.get(f'/group/{group.id}')
+    assert b"<strong>Bill 4</strong>" in first.data and b"<strong>Bill 2</strong>" not in first.data
+    # Totals cover every bill, not just the page on screen
+    assert b"50.00 USD" in first.data
+
+    older = re.search(rb'href="([^"]*before=[^"]*)"', first.data).group(1).decode().replace("&amp;", "&")
+    second = authenticated_client.get(older)
+    assert b"<strong>Bill 2</strong>" in second.data and b"<strong>Bill 4</strong>" not in second.data
+    assert b"Newest Bills" in second.data
+
+
+def test_fragment_files_stay_bounded_per_group(authenticated_client, app, tmp_path):
+    from Splity.home import fragments
+
+    app.config["BILLS_PAGE_SIZE"] = 2
+    fragments.group_fragments.configure(8, str(tmp_path))
+    group = _create_group_with_bills(authenticated_client, 5)
+
+    authenticated_client.get(f'/group/{group.id}')
+    # Every (date, id) is a valid cursor, so a client can mint as many as it likes
+    for bill_id in range(1, 6):
+        cursor = base64.urlsafe_b64encode(f"2099-01-01T00:00:00|{bill_id}".encode()).decode()
+        response = authenticated_client.get(f'/group/{group.id}?before={cursor}')
+        assert 'fragment;desc="miss"' in response.headers.get_all("Server-Timing")
+    # The ledger and the first page, whatever cursors were asked for
+    assert len(list(tmp_path.iterdir())) == 2
+
+    authenticated_client.post(f'/group/{group.id}/delete')
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_recreated_group_never_sees_deleted_groups_fragments(authenticated_client):
+    group = _create_group_with_bills(authenticated_client, 0)
+    authenticated_client.post(f'/group/{group.id}/create_bill', data={
+        "description": "PrivateDinner",
+        "names": ["Test User | @testuser"],
+        "amount": 10,
+    })
+    assert b"PrivateDinner" in authenticated_client.get(f'/group/{group.id}').data
+    authenticated_client.post(f'/group/{group.id}/delete')
+
+    # SQLite reuses the highest deleted id, and the new group's version starts over
+    recreated = _create_group_with_bills(authenticated_client, 1)
+    assert recreated.id == group.id
+    response = authenticated_client.get(f'/group/{recreated.id}')
+    assert b"PrivateDinner" not in response.data
+    assert b"Bill 0" in response.data
+
+
+def test_failed_statement_leaves_no_timing_behind(app):
+    from sqlalchemy import exc, text
+
+    from Splity.adapters.database import db
+    from Splity.adapters.instrumentation import record_queries
+
+    with record_queries() as stats:
+        for _ in range(3):
+            try:
+                db.session.execute(text("SELECT * FROM no_such_table"))
+            except exc.OperationalError:
+                db.session.rollback()
+        db.session.execute(text("SELECT 1"))
+
+    assert db.session.connection().info.get("splity_query_start") == []
+    assert stats.count == 4
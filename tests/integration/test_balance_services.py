@@ -0,0 +1,150 @@
+import random
+import threading
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from Splity.adapters.database import db
+from Splity.adapters.orm import GroupBalanceORM
+from Splity.adapters.repository import GroupBalanceRepository, GroupRepository, UserRepository
+from Splity.domainmodel.models import User
+from Splity.services import balance_services, bill_services, groups_services
+
+
+def _add_user(user_repo, name, username, email, password="Pass123"):
+    return user_repo.add(User(name=name, username=username, email=email, password=password))
+
+
+def _group_of_three():
+    user_repo = UserRepository()
+    group_repo = GroupRepository()
+    user_ids = [
+        _add_user(user_repo, "User One", "user1", "user1@test.com"),
+        _add_user(user_repo, "User Two", "user2", "user2@test.com"),
+        _add_user(user_repo, "User Three", "user3", "user3@test.com"),
+    ]
+    groups_services.create_group("Ledger", "Group", "USD", user_ids[0])
+    group = group_repo.get_by_name_and_creator("Ledger", user_ids[0])
+    for user_id in user_ids[1:]:
+        group_repo.join_by_code(user_id, group.invite_code)
+    return group, user_ids
+
+
+def test_ledger_tracks_bill_writes(app):
+    group, (user1_id, user2_id, user3_id) = _group_of_three()
+    balance_repo = GroupBalanceRepository()
+
+    bill_services.add_bill_service(user1_id, "Dinner", 30, [user1_id, user2_id, user3_id], group.id)
+    taxi = bill_services.add_bill_service(user2_id, "Taxi", 12, [user2_id, user3_id], group.id)
+
+    assert balance_repo.get_net_cents(group.id) == {user1_id: 2000, user2_id: -400, user3_id: -1600}
+
+    bill_services.delete_bill_service(taxi.id, user2_id, group.id)
+
+    assert balance_repo.get_net_cents(group.id) == {user1_id: 2000, user2_id: -1000, user3_id: -1000}
+    assert balance_services.verify_balances() == {}
+
+
+def test_ledger_drops_removed_member_and_restores_on_rejoin(app):
+    group, (user1_id, user2_id, user3_id) = _group_of_three()
+    balance_repo = GroupBalanceRepository()
+    bill_services.add_bill_service(user1_id, "Dinner", 30, [user1_id, user2_id, user3_id], group.id)
+
+    groups_services.remove_user(group.id, user3_id, user1_id)
+    assert user3_id not in balance_repo.get_net_cents(group.id)
+    assert balance_services.verify_balances() == {}
+
+    groups_services.join_group(group.invite_code, user3_id)
+    assert balance_repo.get_net_cents(group.id)[user3_id] == -1000
+    assert balance_services.verify_balances() == {}
+
+
+def test_rebuild_balances_command_repairs_ledger(app):
+    group, (user1_id, user2_id, _) = _group_of_three()
+    bill_services.add_bill_service(user1_id, "Dinner", 20, [user1_id, user2_id], group.id)
+
+    GroupBalanceORM.query.delete()
+    db.session.commit()
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["rebuild-balances", "--verify-only"])
+    assert result.exit_code != 0
+    assert "out of sync" in result.output
+
+    result = runner.invoke(args=["rebuild-balances"])
+    assert result.exit_code == 0
+    assert "Balances verified." in result.output
+    assert GroupBalanceRepository().get_net_cents(group.id) == {user1_id: 1000, user2_id: -1000}
+
+
+def test_balances_always_sum_to_zero(app):
+    # Property test over random bills: odd amounts, uneven splits, deletes,
+    # and a currency without minor units. Integer minor units mean the
+    # ledger must net to exactly zero and settle-up must leave no residue.
+    rng = random.Random(2024)
+    user_repo = UserRepository()
+    user_ids = [_add_user(user_repo, f"User {i}", f"user{i}", f"user{i}@test.com") for i in range(1, 8)]
+    for currency, exp in (("USD", 2), ("JPY", 0)):
+        groups_services.create_group(currency, "Group", currency, user_ids[0])
+        group = GroupRepository().get_by_name_and_creator(currency, user_ids[0])
+        for user_id in user_ids[1:]:
+            groups_services.join_group(group.invite_code, user_id)
+
+        bills = []
+        for i in range(60):
+            if bills and rng.random() < 0.2:
+                bill = bills.pop(rng.randrange(len(bills)))
+                bill_services.delete_bill_service(bill.id, bill.user_id, group.id)
+            else:
+                amount = Decimal(rng.randint(1, 100000)).scaleb(-exp)
+                participants = rng.sample(user_ids, rng.randint(1, len(user_ids)))
+                bills.append(bill_services.add_bill_service(rng.choice(user_ids), f"Bill {i}", amount,
+                                                            participants, group.id))
+
+            transfers, balances = bill_services.settling_algorithm(group.id, simplify_debts=rng.random() < 0.5)
+            remaining = {name: balance for name, balance in balances.values()}
+            assert sum(remaining.values()) == 0
+            for debtor, amount, creditor in transfers:
+                remaining[debtor] += amount
+                remaining[creditor] -= amount
+            assert set(remaining.values()) == {0}
+        assert bill_services.total_group_spending(group.id) == sum(bill.amount for bill in bills)
+    assert balance_services.verify_balances() == {}
+
+
+def test_ledger_keeps_a_bill_committed_while_another_is_deleted(file_app):
+    group, (user1_id, user2_id, _) = _group_of_three()
+    db.session.commit()
+    taxi = bill_services.add_bill_service(user2_id, "Taxi", 12, [user1_id, user2_id], group.id)
+    db.session.remove()
+
+    # Every read the delete makes before its first write lets another
+    # request commit a bill, as a concurrent add_bill_service could
+    committed, writing = [], []
+    deleter = threading.get_ident()
+
+    def _commit_bill_between(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() != deleter:
+            return
+        if writing or not statement.lstrip().upper().startswith("SELECT"):
+            writing.append(statement)
+            return
+        def add_bill():
+            with file_app.app_context():
+                committed.append(bill_services.add_bill_service(
+                    user2_id, f"Lunch {len(committed)}", 15, [user1_id, user2_id], group.id))
+        thread = threading.Thread(target=add_bill)
+        thread.start()
+        thread.join()
+
+    event.listen(db.engine, "after_cursor_execute", _commit_bill_between)
+    try:
+        bill_services.delete_bill_service(taxi.id, user2_id, group.id)
+    finally:
+        event.remove(db.engine, "after_cursor_execute", _commit_bill_between)
+
+    assert committed
+    net_cents = GroupBalanceRepository().get_net_cents(group.id)
+    assert {user_id: cents for user_id, cents in net_cents.items() if cents} == \
+        {user_id: cents for user_id, cents in GroupBalanceRepository().recompute(group.id).items() if cents}
+    assert net_cents[user2_id] == 750 * len(committed)
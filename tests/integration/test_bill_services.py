@@ -4,7 +4,7 @@ from Splity.adapters.repository import (
     GroupRepository,
     UserRepository,
 )
-from Splity.domainmodel.models import User
+from Splity.domainmodel.models import User, UserSummary
 from Splity.services import bill_services, groups_services
 
 
@@ -34,7 +34,7 @@ def test_add_bill_creates_participants_and_splits(app):
     participants = BillParticipantRepository().all_participants_in_group(bill.id)
 
     assert len(participants) == len(members)
-    assert all(p.amount_owed == 15 for p in participants)
+    assert all(p.amount_owed == 1500 for p in participants)
 
 
 def test_settling_algorithm_returns_balances(app):
@@ -61,3 +61,171 @@ def test_settling_algorithm_returns_balances(app):
         settlement[0] == "User Two" and settlement[2] == "User One"
         for settlement in settlements
     )
+
+
+def test_settling_algorithm_keeps_members_with_same_name_apart(app):
+    user_repo = UserRepository()
+    group_repo = GroupRepository()
+    sam_a = _add_user(user_repo, "Sam", "sam_a", "sam_a@test.com")
+    sam_b = _add_user(user_repo, "Sam", "sam_b", "sam_b@test.com")
+    alex = _add_user(user_repo, "Alex", "alex", "alex@test.com")
+    jo = _add_user(user_repo, "Jo", "jo", "jo@test.com")
+    groups_services.create_group("Two Sams", "Group", "USD", sam_a)
+    group = group_repo.get_by_name_and_creator("Two Sams", sam_a)
+    for user_id in (sam_b, alex, jo):
+        group_repo.join_by_code(user_id, group.invite_code)
+
+    bill_services.add_bill_service(sam_a, "Hotel", 50, [sam_a, alex], group.id)
+    bill_services.add_bill_service(sam_b, "Taxi", 20, [sam_b, jo], group.id)
+    settlements, net_balances = bill_services.settling_algorithm(group.id)
+
+    # Keyed by name, the two Sams would merge into one creditor owed 35
+    assert net_balances[sam_a] == ["Sam", 2500] and net_balances[sam_b] == ["Sam", 1000]
+    assert settlements == [["Alex", 2500, "Sam"], ["Jo", 1000, "Sam"]]
+
+
+def test_add_bill_writes_bill_and_participants_in_one_commit(app):
+    from sqlalchemy import event
+    from Splity.adapters.database import db
+
+    user_repo = UserRepository()
+    group_repo = GroupRepository()
+
+    user1_id = _add_user(user_repo, "User One", "user1", "user1@test.com")
+    user2_id = _add_user(user_repo, "User Two", "user2", "user2@test.com")
+    user3_id = _add_user(user_repo, "User Three", "user3", "user3@test.com")
+
+    groups_services.create_group("Bulk", "Group", "USD", user1_id)
+    group = group_repo.get_by_name_and_creator("Bulk", user1_id)
+    group_repo.join_by_code(user2_id, group.invite_code)
+    group_repo.join_by_code(user3_id, group.invite_code)
+
+    commits = []
+
+    def _count_commit(conn):
+        commits.append(conn)
+
+    event.listen(db.engine, "commit", _count_commit)
+    try:
+        bill = bill_services.add_bill_service(user1_id, "Groceries", 30, [user1_id, user2_id, user3_id], group.id)
+    finally:
+        event.remove(db.engine, "commit", _count_commit)
+
+    assert len(commits) == 1
+    assert bill.id is not None
+    participants = BillParticipantRepository().all_participants_in_group(bill.id)
+    assert sorted(p.user_id for p in participants) == sorted([user1_id, user2_id, user3_id])
+    assert all(p.amount_owed == 1000 for p in participants)
+
+
+def test_settling_algorithm_query_count_does_not_grow_with_bills(app):
+    from sqlalchemy import event
+    from Splity.adapters.database import db
+
+    user_repo = UserRepository()
+    group_repo = GroupRepository()
+
+    user1_id = _add_user(user_repo, "User One", "user1", "user1@test.com")
+    user2_id = _add_user(user_repo, "User Two", "user2", "user2@test.com")
+
+    groups_services.create_group("Many Bills", "Group", "USD", user1_id)
+    group = group_repo.get_by_name_and_creator("Many Bills", user1_id)
+    group_repo.join_by_code(user2_id, group.invite_code)
+
+    def _count_settling_queries():
+        statements = []
+
+        def _on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        db.session.expire_all()
+        event.listen(db.engine, "before_cursor_execute", _on_execute)
+        try:
+            result = bill_services.settling_algorithm(group.id)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _on_execute)
+        return len(statements), result
+
+    bill_services.add_bill_service(user1_id, "Bill 0", 20, [user1_id, user2_id], group.id)
+    few_queries, _ = _count_settling_queries()
+
+    for i in range(1, 9):
+        bill_services.add_bill_service(user2_id if i % 2 else user1_id, f"Bill {i}", 20, [user1_id, user2_id], group.id)
+    many_queries, (settlements, net_balances) = _count_settling_queries()
+
+    assert many_queries == few_queries
+    assert net_balances[user1_id][1] == 1000
+    assert net_balances[user2_id][1] == -1000
+    assert settlements == [["User Two", 1000, "User One"]]
+
+
+def test_bills_and_creators_listing_is_a_single_query(app):
+    from sqlalchemy import event
+    from Splity.adapters.database import db
+
+    user_repo = UserRepository()
+    group_repo = GroupRepository()
+
+    user1_id = _add_user(user_repo, "User One", "user1", "user1@test.com")
+    user2_id = _add_user(user_repo, "User Two", "user2", "user2@test.com")
+
+    groups_services.create_group("Listing", "Group", "USD", user1_id)
+    group = group_repo.get_by_name_and_creator("Listing", user1_id)
+    group_repo.join_by_code(user2_id, group.invite_code)
+    for i in range(6):
+        bill_services.add_bill_service(user1_id if i % 2 else user2_id, f"Bill {i}", 10, [user1_id, user2_id], group.id)
+
+    statements = []
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    db.session.expire_all()
+    event.listen(db.engine, "before_cursor_execute", _on_execute)
+    try:
+        bill_data = bill_services.get_bills_and_creators_service(group.id)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _on_execute)
+
+    assert len(statements) == 1
+    assert [bill.description for bill, _ in bill_data] == [f"Bill {i}" for i in range(6)]
+    assert [creator.name for _, creator in bill_data] == ["User Two", "User One"] * 3
+    assert all(isinstance(creator, UserSummary) for _, creator in bill_data)
+
+
+def test_bill_pages_walk_every_bill_newest_first(app):
+    from datetime import datetime
+
+    from Splity.adapters.unit_of_work import UnitOfWork
+    from Splity.domainmodel.models import Bill
+
+    user_repo = UserRepository()
+    user1_id = _add_user(user_repo, "User One", "user1", "user1@test.com")
+    groups_services.create_group("Pages", "Group", "USD", user1_id)
+    group = GroupRepository().get_by_name_and_creator("Pages", user1_id)
+    # Several bills share a timestamp, so the id has to break the tie
+    same_time = datetime(2025, 1, 1, 12, 0)
+    with UnitOfWork():
+        for i in range(7):
+            BillRepository().create_with_participants(
+                Bill(user_id=user1_id, description=f"Bill {i}", amount=1000,
+                     created_date=same_time if i % 2 else datetime(2025, 1, i + 1), group_id=group.id),
+                [(user1_id, 1000)])
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = bill_services.get_bills_page_service(group.id, cursor, limit=3)
+        seen.extend(bill.description for bill, _ in page)
+        if cursor is None:
+            break
+
+    expected = sorted((BillRepository().get_by_id(i) for i in range(1, 8)), key=lambda b: (b.date, b.id), reverse=True)
+    assert seen == [bill.description for bill in expected]
+    assert bill_services.total_group_spending(group.id) == 7000
+
+
+def test_bad_page_cursor_is_rejected(app):
+    import pytest
+
+    with pytest.raises(bill_services.BillServiceException):
+        bill_services.get_bills_page_service(1, "not-a-cursor")
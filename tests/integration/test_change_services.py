@@ -0,0 +1,134 @@
+import io
+
+import pytest
+
+from Splity.adapters.database import db
+from Splity.adapters.repository import GroupBalanceRepository, GroupRepository, UserRepository
+from Splity.adapters.unit_of_work import UnitOfWork
+from Splity.domainmodel.models import User
+from Splity.services import bill_services, change_services, groups_services, import_services
+
+
+@pytest.fixture
+def group(app):
+    user_repo = UserRepository()
+    with UnitOfWork():
+        user_ids = [user_repo.add(User(name=f"User {i}", username=f"user{i}", email=f"user{i}@test.com", password="x"))
+                    for i in range(1, 4)]
+    groups_services.create_group("Sync", "Group", "USD", user_ids[0])
+    return GroupRepository().get_by_name_and_creator("Sync", user_ids[0])
+
+
+def _kinds(changes):
+    return [(change["seq"], change["kind"], change["entity_id"]) for change in changes["changes"]]
+
+
+def test_services_log_each_change_with_a_per_group_sequence(group):
+    groups_services.join_group(group.invite_code, 2)
+    groups_services.join_group(group.invite_code, 3)
+    bill = bill_services.add_bill_service(1, "Dinner", 30, [1, 2], group.id)
+    bill_services.delete_bill_service(bill.id, 1, group.id)
+    groups_services.edit_group("Renamed", "Edited", group.id, 1)
+    groups_services.leave_from_group(group.id, 2)
+    groups_services.remove_user(group.id, 3, 1)
+
+    changes = change_services.get_changes_since(group.id, 0)
+
+    assert _kinds(changes) == [
+        (1, "member_joined", 2), (2, "member_joined", 3), (3, "bill_created", bill.id), (4, "bill_deleted", bill.id),
+        (5, "group_edited", None), (6, "member_left", 2), (7, "member_left", 3),
+    ]
+    assert changes["changes"][2]["data"]["participants"] == [{"user_id": 1, "amount_owed": 15.0},
+                                                             {"user_id": 2, "amount_owed": 15.0}]
+    assert changes["changes"][4]["data"] == {"name": "Renamed", "description": "Edited"}
+    assert changes["latest"] == 7 and changes["has_more"] is False
+
+
+def test_changes_since_returns_only_newer_entries_a_page_at_a_time(group):
+    for i in range(5):
+        bill_services.add_bill_service(1, f"Bill {i}", 10, [1], group.id)
+
+    first = change_services.get_changes_since(group.id, 1, limit=2)
+    rest = change_services.get_changes_since(group.id, first["latest"], limit=2)
+
+    assert [change["seq"] for change in first["changes"]] == [2, 3] and first["has_more"]
+    assert [change["seq"] for change in rest["changes"]] == [4, 5] and not rest["has_more"]
+    assert change_services.get_changes_since(group.id, 5)["changes"] == []
+    with pytest.raises(change_services.ChangeServiceException):
+        change_services.get_changes_since(group.id, -1)
+
+
+def test_sequences_are_independent_per_group(group):
+    groups_services.create_group("Other", "Group", "USD", 1)
+    other = GroupRepository().get_by_name_and_creator("Other", 1)
+    bill_services.add_bill_service(1, "Dinner", 10, [1], group.id)
+    bill_services.add_bill_service(1, "Dinner", 10, [1], other.id)
+
+    assert change_services.latest_seq(group.id) == 1
+    assert change_services.latest_seq(other.id) == 1
+
+
+def test_change_entry_rolls_back_with_its_write(group):
+    with pytest.raises(RuntimeError):
+        with UnitOfWork():
+            GroupRepository().edit_group_name(group.id, "Half done")
+            change_services.record_changes(group.id, [change_services.group_edited(name="Half done")])
+            raise RuntimeError("boom")
+
+    db.session.expire_all()
+    assert change_services.latest_seq(group.id) == 0
+
+
+def test_import_logs_one_entry_per_bill(group):
+    import_services.import_bills(group.id, io.StringIO(
+        "payer,description,amount,participants\nuser1,Dinner,30,user1\nuser1,Taxi,12.50,user1\n"))
+
+    changes = change_services.get_changes_since(group.id, 0)
+
+    assert [change["data"]["description"] for change in changes["changes"]] == ["Dinner", "Taxi"]
+    assert changes["changes"][1]["data"]["amount"] == 12.5
+
+
+def test_summary_seq_never_runs_ahead_of_its_balances(group, monkeypatch):
+    groups_services.join_group(group.invite_code, 2)
+    bill_services.add_bill_service(1, "Dinner", 10, [1, 2], group.id)
+    read_net_cents = GroupBalanceRepository.get_net_cents
+    late_bill = []
+
+    def _bill_commits_after_balances_read(self, group_id):
+        net_cents = read_net_cents(self, group_id)
+        if not late_bill:
+            late_bill.append(bill_services.add_bill_service(2, "Taxi", 20, [1, 2], group.id))
+        return net_cents
+
+    monkeypatch.setattr(GroupBalanceRepository, "get_net_cents", _bill_commits_after_balances_read)
+    summary = bill_services.group_summary(group.id)
+
+    # The summary predates the taxi, so the changes after its seq must bring it
+    assert [member["net_balance"] for member in summary["members"]] == [5.0, -5.0]
+    changes = change_services.get_changes_since(group.id, summary["group"]["change_seq"])
+    assert ("bill_created", late_bill[0].id) in [(c["kind"], c["entity_id"]) for c in changes["changes"]]
+
+
+def test_append_claims_seqs_past_a_write_it_never_saw(app, group):
+    import threading
+
+    with app.test_request_context():
+        app.preprocess_request()
+        # This worker has read the log position; another then commits a change
+        assert change_services.latest_seq(group.id) == 0
+        worker = threading.Thread(target=lambda: _add_bill_in_own_context(app, group.id))
+        worker.start()
+        worker.join()
+
+        with UnitOfWork():
+            seq = change_services.record_changes(group.id, [change_services.group_edited(name="Renamed")])
+
+    assert seq == 2
+    assert _kinds(change_services.get_changes_since(group.id, 0)) == [
+        (1, "bill_created", 1), (2, "group_edited", None)]
+
+
+def _add_bill_in_own_context(app, group_id):
+    with app.app_context():
+        bill_services.add_bill_service(1, "Taxi", 10, [1], group_id)
@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+import sys
+
+import pytest
+from sqlalchemy import text
+
+from Splity.adapters.database import db
+from Splity.services import export_services
+
+LARGE_BILLS = 250_000
+PARTICIPANTS_PER_BILL = 4
+
+
+def _peak_rss_bytes():
+    resource = pytest.importorskip("resource")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _seed_users_and_group(user_count):
+    db.session.execute(text(
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :count) "
+        "INSERT INTO users (id, name, username, email, password) "
+        "SELECT i, 'User ' || i, 'user' || i, 'user' || i || '@test.com', 'x' FROM n"
+    ), {"count": user_count})
+    db.session.execute(text(
+        "INSERT INTO groups (id, name, description, currency, created_at, creator_id, invite_code, simplify_debts, version) "
+        "VALUES (1, 'Export', 'Group', 'USD', '2025-01-01 00:00:00', 1, 'EXPORT', 0, 0)"
+    ))
+
+
+@pytest.fixture
+def large_group(app):
+    """One group with a million participant rows, built in SQL so setup stays quick"""
+    _seed_users_and_group(PARTICIPANTS_PER_BILL)
+    db.session.execute(text(
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :count) "
+        "INSERT INTO bills (id, user_id, description, date, amount, group_id) "
+        "SELECT i, 1, 'Bill ' || i, datetime('2020-01-01', '+' || i || ' minutes'), 4000, 1 FROM n"
+    ), {"count": LARGE_BILLS})
+    db.session.execute(text(
+        "INSERT INTO bill_participants (bill_id, user_id, amount_owed, has_paid) "
+        "SELECT bills.id, users.id, 1000, 0 FROM bills CROSS JOIN users"
+    ))
+    db.session.commit()
+    return 1
+
+
+def test_csv_export_has_header_and_a_row_per_participant(app):
+    _seed_users_and_group(2)
+    db.session.execute(text(
+        "INSERT INTO bills (id, user_id, description, date, amount, group_id) VALUES "
+        "(1, 1, 'Dinner, with wine', '2025-01-02 19:00:00', 3000, 1), (2, 2, 'Solo', '2025-01-01 08:00:00', 500, 1)"
+    ))
+    db.session.execute(text(
+        "INSERT INTO bill_participants (bill_id, user_id, amount_owed, has_paid) VALUES (1, 1, 1500, 0), (1, 2, 1500, 1)"
+    ))
+    db.session.commit()
+
+    rows = list(csv.reader(io.StringIO("".join(export_services.export_csv(1)))))
+
+    assert rows[0] == list(export_services.EXPORT_COLUMNS)
+    # Oldest bill first; a bill without participants still gets a row
+    assert rows[1] == ["2", "2025-01-01T08:00:00", "Solo", "5.00", "user2", "", "", ""]
+    assert rows[2:] == [
+        ["1", "2025-01-02T19:00:00", "Dinner, with wine", "30.00", "user1", "user1", "15.00", "False"],
+        ["1", "2025-01-02T19:00:00", "Dinner, with wine", "30.00", "user1", "user2", "15.00", "True"],
+    ]
+
+
+def test_jsonl_export_is_one_object_per_line(app):
+    _seed_users_and_group(1)
+    db.session.execute(text(
+        "INSERT INTO bills (id, user_id, description, date, amount, group_id) "
+        "VALUES (1, 1, 'Taxi', '2025-01-01 00:00:00', 1250, 1)"
+    ))
+    db.session.execute(text("INSERT INTO bill_participants (bill_id, user_id, amount_owed, has_paid) VALUES (1, 1, 1250, 0)"))
+    db.session.commit()
+
+    lines = "".join(export_services.export_jsonl(1)).splitlines()
+
+    assert [json.loads(line) for line in lines] == [{
+        "bill_id": 1, "date": "2025-01-01T00:00:00", "description": "Taxi", "amount": 12.5,
+        "paid_by": "user1", "participant": "user1", "amount_owed": 12.5, "has_paid": False,
+    }]
+
+
+def test_export_memory_stays_flat_on_a_million_rows(large_group):
+    # The fixture itself has already pushed the peak up; the export must not
+    # move it. Process peak RSS is used rather than tracemalloc, which would
+    # make a million rows several times slower.
+    peak_before = _peak_rss_bytes()
+    rows = 0
+    size = 0
+    for chunk in export_services.export_csv(large_group):
+        rows += chunk.count("\n")
+        size += len(chunk)
+
+    assert rows == LARGE_BILLS * PARTICIPANTS_PER_BILL + 1
+    # ~60 MB of CSV went through; only a batch at a time was ever held
+    assert size > 50_000_000
+    assert _peak_rss_bytes() - peak_before < 16 * 1024 * 1024
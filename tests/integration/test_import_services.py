@@ -0,0 +1,95 @@
+import io
+
+import pytest
+
+from Splity.adapters.instrumentation import record_queries
+from Splity.adapters.repository import BillParticipantRepository, BillRepository, GroupRepository, UserRepository
+from Splity.adapters.unit_of_work import UnitOfWork
+from Splity.domainmodel.models import User
+from Splity.services import balance_services, bill_services, groups_services, import_services
+
+
+@pytest.fixture
+def group(app):
+    user_repo = UserRepository()
+    with UnitOfWork():
+        user_ids = [user_repo.add(User(name=f"User {i}", username=f"user{i}", email=f"user{i}@test.com", password="x"))
+                    for i in range(1, 4)]
+    groups_services.create_group("Import", "Group", "USD", user_ids[0])
+    group = GroupRepository().get_by_name_and_creator("Import", user_ids[0])
+    groups_services.join_group(group.invite_code, user_ids[1])
+    return group
+
+
+def _csv(*rows):
+    return io.StringIO("payer,description,amount,participants\n" + "".join(f"{row}\n" for row in rows))
+
+
+def test_import_creates_bills_participants_and_balances(group):
+    report = import_services.import_bills(group.id, _csv(
+        "user1,Dinner,30,user1;user2",
+        "@user2,Taxi,12.50,@user1",
+    ))
+
+    assert (report.imported, report.skipped) == (2, 0)
+    dinner = BillRepository().get_bill_by_name_and_group_id("Dinner", group.id)
+    participants = BillParticipantRepository().get_participants_for_bill(dinner.id)
+    assert sorted(p.amount_owed for p in participants) == [1500, 1500]
+    assert bill_services.get_user_net_balances(
+        bill_services.settling_algorithm(group.id)[1], 1) == ["User 1", 250]
+    assert balance_services.verify_balances() == {}
+
+
+def test_import_applies_add_bill_rules_and_skips_bad_rows(group):
+    bill_services.add_bill_service(1, "Dinner", 10, [1, 2], group.id)
+
+    report = import_services.import_bills(group.id, _csv(
+        "user1,Dinner,30,user1",          # already in the group
+        "user1,Lunch,20,user2",
+        "user2,Lunch,20,user1",           # repeated within the file
+        "user1, ,5,user1",                # empty description
+        "user3,Cinema,5,user1",           # user3 is not a member
+        "user1,Snacks,abc,user1",
+        "user1,Water,-2,user1",
+        "user1,Nobody,5,",
+    ))
+
+    assert report.imported == 1
+    assert report.skipped == 7
+    messages = dict(report.errors)
+    assert messages[2] == "You already have a bill with the same description 'Dinner'."
+    assert messages[4] == "You already have a bill with the same description 'Lunch'."
+    assert messages[5] == "Bill description cannot be empty."
+    assert messages[6] == "Not in this group: user3."
+    assert "Invalid amount" in messages[7]
+
+
+def test_import_queries_per_chunk_not_per_row(group):
+    rows = [f"user1,Bill {i},10,user1;user2" for i in range(200)]
+
+    with record_queries() as stats:
+        report = import_services.import_bills(group.id, _csv(*rows), chunk_size=100)
+
+    assert report.imported == 200
+    assert stats.commits == 2
+    # Group lookup, then per chunk: usernames (first chunk only), descriptions,
+    # bills, participants, ledger read/write and version bump
+    assert stats.count <= 20
+
+
+def test_import_requires_the_columns_and_the_creator(group):
+    with pytest.raises(import_services.BillImportException, match="missing column"):
+        import_services.import_bills(group.id, io.StringIO("payer,amount\nuser1,5\n"))
+    with pytest.raises(import_services.BillImportException, match="Only the creator"):
+        import_services.import_bills(group.id, _csv("user1,Dinner,30,user1"), requester_id=2)
+
+
+def test_import_bills_command(group, app, tmp_path):
+    path = tmp_path / "bills.csv"
+    path.write_text(_csv("user1,Dinner,30,user1;user2", "user9,Ghost,5,user1").getvalue(), encoding="utf-8")
+
+    result = app.test_cli_runner().invoke(args=["import-bills", str(group.id), str(path)])
+
+    assert result.exit_code == 0
+    assert "Imported 1 bill(s), skipped 1." in result.output
+    assert BillRepository().get_bill_by_name_and_group_id("Dinner", group.id) is not None
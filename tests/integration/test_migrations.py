@@ -0,0 +1,127 @@
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+from Splity import create_app
+from Splity.adapters.database import db
+
+
+def _file_app(tmp_path):
+    return create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'splity.db'}",
+        "WTF_CSRF_ENABLED": False,
+        "CURRENCY_BACKGROUND_REFRESH": False,
+    })
+
+
+def test_migrations_match_models(tmp_path):
+    app = _file_app(tmp_path)
+    with app.app_context():
+        with db.engine.connect() as connection:
+            diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+        db.session.remove()
+        db.engine.dispose()
+    assert diff == []
+
+
+# Schema exactly as db.create_all() used to build it, before migrations existed
+PRE_MIGRATION_SCHEMA = (
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, "
+    "username VARCHAR(80) NOT NULL UNIQUE, email VARCHAR(200) NOT NULL UNIQUE, password VARCHAR(200) NOT NULL)",
+    "CREATE TABLE groups (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, description VARCHAR(200) NOT NULL, "
+    "currency VARCHAR(200) NOT NULL, created_at DATETIME NOT NULL, creator_id INTEGER NOT NULL REFERENCES users (id), "
+    "invite_code VARCHAR(10) NOT NULL UNIQUE)",
+    "CREATE TABLE user_groups (user_id INTEGER NOT NULL REFERENCES users (id), "
+    "group_id INTEGER NOT NULL REFERENCES groups (id), PRIMARY KEY (user_id, group_id))",
+    "CREATE TABLE bills (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES users (id), "
+    "description VARCHAR(200) NOT NULL, date DATETIME NOT NULL, amount FLOAT NOT NULL, "
+    "group_id INTEGER REFERENCES groups (id))",
+    "CREATE TABLE bill_participants (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES users (id), "
+    "bill_id INTEGER NOT NULL REFERENCES bills (id), amount_owed FLOAT NOT NULL, has_paid BOOLEAN NOT NULL)",
+)
+
+
+def test_pre_migration_database_is_stamped_and_upgraded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'splity.db'}")
+    with engine.begin() as connection:
+        for statement in PRE_MIGRATION_SCHEMA + (
+            "INSERT INTO users VALUES (1, 'One', 'one', 'one@test.com', 'x'), (2, 'Two', 'two', 'two@test.com', 'x')",
+            "INSERT INTO groups VALUES (1, 'Trip', 'Old', 'USD', '2025-01-01 00:00:00', 1, 'ABC123')",
+            "INSERT INTO user_groups VALUES (1, 1), (2, 1)",
+            "INSERT INTO bills VALUES (1, 1, 'Dinner', '2025-01-01 00:00:00', 30.0, 1)",
+            "INSERT INTO bill_participants VALUES (1, 1, 1, 15.0, 0), (2, 2, 1, 15.0, 0)",
+        ):
+            connection.execute(text(statement))
+    engine.dispose()
+
+    app = _file_app(tmp_path)
+    with app.app_context():
+        rows = db.session.execute(
+            text("SELECT user_id, net_cents FROM group_balances WHERE group_id = 1 ORDER BY user_id")
+        ).all()
+        simplify = db.session.execute(text("SELECT simplify_debts FROM groups WHERE id = 1")).scalar()
+        db.session.remove()
+        db.engine.dispose()
+    assert [tuple(row) for row in rows] == [(1, 1500), (2, -1500)]
+    assert not simplify
+
+
+def test_float_amounts_become_exact_minor_units(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'splity.db'}")
+    with engine.begin() as connection:
+        for statement in PRE_MIGRATION_SCHEMA + (
+            "INSERT INTO users VALUES (1, 'One', 'one', 'one@test.com', 'x'), (2, 'Two', 'two', 'two@test.com', 'x'), "
+            "(3, 'Three', 'three', 'three@test.com', 'x')",
+            "INSERT INTO groups VALUES (1, 'Trip', 'Old', 'USD', '2025-01-01 00:00:00', 1, 'ABC123'), "
+            "(2, 'Tokyo', 'Old', 'JPY', '2025-01-01 00:00:00', 1, 'JPY123')",
+            "INSERT INTO user_groups VALUES (1, 1), (2, 1), (3, 1), (1, 2), (2, 2), (3, 2)",
+            # 10 / 3 as floats, and 1000 yen the same way
+            "INSERT INTO bills VALUES (1, 1, 'Taxi', '2025-01-01 00:00:00', 10.0, 1), "
+            "(2, 2, 'Ramen', '2025-01-01 00:00:00', 1000.0, 2)",
+            "INSERT INTO bill_participants VALUES (1, 1, 1, 3.3333333333333335, 0), (2, 2, 1, 3.3333333333333335, 0), "
+            "(3, 3, 1, 3.3333333333333335, 0), (4, 1, 2, 333.3333333333333, 0), (5, 2, 2, 333.3333333333333, 0), "
+            "(6, 3, 2, 333.3333333333333, 0)",
+        ):
+            connection.execute(text(statement))
+    engine.dispose()
+
+    app = _file_app(tmp_path)
+    with app.app_context():
+        amounts = db.session.execute(text("SELECT id, amount FROM bills ORDER BY id")).all()
+        shares = db.session.execute(
+            text("SELECT bill_id, user_id, amount_owed FROM bill_participants ORDER BY bill_id, user_id")).all()
+        ledger = db.session.execute(
+            text("SELECT group_id, SUM(net_cents), MAX(net_cents) FROM group_balances GROUP BY group_id")).all()
+        db.session.remove()
+        db.engine.dispose()
+    assert [tuple(row) for row in amounts] == [(1, 1000), (2, 1000)]
+    assert [tuple(row) for row in shares] == [(1, 1, 334), (1, 2, 333), (1, 3, 333),
+                                               (2, 1, 334), (2, 2, 333), (2, 3, 333)]
+    # Payers are up by the others' shares and every group nets to exactly zero
+    assert [tuple(row) for row in ledger] == [(1, 0, 666), (2, 0, 667)]
+
+
+def test_bills_of_deleted_groups_are_removed(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'splity.db'}")
+    with engine.begin() as connection:
+        for statement in PRE_MIGRATION_SCHEMA + (
+            "INSERT INTO users VALUES (1, 'One', 'one', 'one@test.com', 'x'), (2, 'Two', 'two', 'two@test.com', 'x')",
+            "INSERT INTO groups VALUES (1, 'Trip', 'Old', 'USD', '2025-01-01 00:00:00', 1, 'ABC123')",
+            "INSERT INTO user_groups VALUES (1, 1), (2, 1)",
+            # Bill 2 belonged to group 2, deleted before the fix
+            "INSERT INTO bills VALUES (1, 1, 'Dinner', '2025-01-01 00:00:00', 30.0, 1), "
+            "(2, 1, 'PrivateDinner', '2025-01-01 00:00:00', 40.0, 2)",
+            "INSERT INTO bill_participants VALUES (1, 1, 1, 15.0, 0), (2, 2, 1, 15.0, 0), "
+            "(3, 1, 2, 20.0, 0), (4, 2, 2, 20.0, 0)",
+        ):
+            connection.execute(text(statement))
+    engine.dispose()
+
+    app = _file_app(tmp_path)
+    with app.app_context():
+        bills = db.session.execute(text("SELECT id FROM bills")).scalars().all()
+        participants = db.session.execute(text("SELECT DISTINCT bill_id FROM bill_participants")).scalars().all()
+        db.session.remove()
+        db.engine.dispose()
+    assert bills == [1]
+    assert participants == [1]
@@ -0,0 +1,134 @@
+import re
+
+import pytest
+from sqlalchemy import event
+
+from Splity.adapters.database import db
+from Splity.adapters.repository import (
+    BillParticipantRepository,
+    BillRepository,
+    GroupBalanceRepository,
+    GroupChangeRepository,
+    GroupRepository,
+    UserRepository,
+)
+from Splity.domainmodel.models import User
+from Splity.services import bill_services, groups_services
+
+HOT_TABLES = {"users", "groups", "user_groups", "bills", "bill_participants", "group_balances", "group_changes"}
+# A plain "SCAN <table>" (no index) means a full table scan
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@pytest.fixture
+def seeded(app):
+    user_repo = UserRepository()
+    group_repo = GroupRepository()
+    user_ids = [
+        user_repo.add(User(name=f"User {i}", username=f"user{i}", email=f"user{i}@test.com", password="x"))
+        for i in range(3)
+    ]
+    groups_services.create_group("Plans", "Group", "USD", user_ids[0])
+    group = group_repo.get_by_name_and_creator("Plans", user_ids[0])
+    for user_id in user_ids[1:]:
+        group_repo.join_by_code(user_id, group.invite_code)
+    bill = bill_services.add_bill_service(user_ids[0], "Dinner", 30, user_ids, group.id)
+    return group, bill, user_ids
+
+
+def _statements_for(call):
+    statements = []
+
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    db.session.expire_all()
+    event.listen(db.engine, "before_cursor_execute", _on_execute)
+    try:
+        call()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _on_execute)
+    db.session.rollback()
+    return statements
+
+
+def _full_scans(statement, parameters):
+    connection = db.session.connection().connection.driver_connection
+    plan = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    details = [row[-1] for row in plan]
+    return [detail for detail in details
+            if (match := FULL_SCAN.match(detail)) and match.group(1) in HOT_TABLES]
+
+
+def _repository_calls(group, bill, user_ids):
+    user_repo = UserRepository()
+    bill_repo = BillRepository()
+    participant_repo = BillParticipantRepository()
+    group_repo = GroupRepository()
+    balance_repo = GroupBalanceRepository()
+    change_repo = GroupChangeRepository()
+    user_id = user_ids[1]
+    return {
+        "UserRepository.get_by_id": lambda: user_repo.get_by_id(user_id),
+        "UserRepository.get_summary_by_id": lambda: user_repo.get_summary_by_id(user_id),
+        "UserRepository.get_by_email": lambda: user_repo.get_by_email("user1@test.com"),
+        "UserRepository.get_by_username": lambda: user_repo.get_by_username("user1"),
+        "UserRepository.get_login_by_username": lambda: user_repo.get_login_by_username("user1"),
+        "BillRepository.get_by_id": lambda: bill_repo.get_by_id(bill.id),
+        "BillRepository.get_bills_by_user": lambda: bill_repo.get_bills_by_user(user_id),
+        "BillRepository.get_bill_by_name_and_group_id": lambda: bill_repo.get_bill_by_name_and_group_id("Dinner", group.id),
+        "BillRepository.get_bills_created_by_user": lambda: bill_repo.get_bills_created_by_user(user_ids[0]),
+        "BillRepository.get_all_bills": lambda: bill_repo.get_all_bills(group.id),
+        "BillRepository.get_all_bills_with_creators": lambda: bill_repo.get_all_bills_with_creators(group.id),
+        "BillRepository.get_bills_page": lambda: bill_repo.get_bills_page(group.id, 10, (bill.date, bill.id)),
+        "BillRepository.get_total_spending": lambda: bill_repo.get_total_spending(group.id),
+        "BillRepository.get_all_bills_in_group_by_user": lambda: bill_repo.get_all_bills_in_group_by_user(group.id, user_id),
+        "BillParticipantRepository.get_participants_for_bill": lambda: participant_repo.get_participants_for_bill(bill.id),
+        "BillParticipantRepository.get_bills_for_user": lambda: participant_repo.get_bills_for_user(user_id),
+        "BillParticipantRepository.all_participants_in_group": lambda: participant_repo.all_participants_in_group(bill.id),
+        "GroupRepository.get_by_name_and_creator": lambda: group_repo.get_by_name_and_creator("Plans", user_ids[0]),
+        "GroupRepository.get_by_name_and_membership": lambda: group_repo.get_by_name_and_membership("Plans", user_id),
+        "GroupRepository.get_by_invite_code": lambda: group_repo.get_by_invite_code(group.invite_code),
+        "GroupRepository.get_user_groups": lambda: group_repo.get_user_groups(user_id),
+        "GroupRepository.get_by_id": lambda: group_repo.get_by_id(group.id),
+        "GroupRepository.get_group_members": lambda: group_repo.get_group_members(group.id),
+        "GroupRepository.is_member": lambda: group_repo.is_member(group.id, user_id),
+        "GroupRepository.get_version_for_member": lambda: group_repo.get_version_for_member(group.id, user_id),
+        "GroupChangeRepository.get_since": lambda: change_repo.get_since(group.id, 0, 100),
+        "GroupChangeRepository.get_latest_seq": lambda: change_repo.get_latest_seq(group.id),
+        "GroupBalanceRepository.get_net_cents": lambda: balance_repo.get_net_cents(group.id),
+        "GroupBalanceRepository.recompute": lambda: balance_repo.recompute(group.id),
+    }
+
+
+def test_repository_reads_use_indexes(seeded):
+    group, bill, user_ids = seeded
+    for name, call in _repository_calls(group, bill, user_ids).items():
+        statements = _statements_for(call)
+        assert statements, f"{name} issued no queries"
+        for statement, parameters in statements:
+            scans = _full_scans(statement, parameters)
+            assert not scans, f"{name} does a full table scan ({scans}):\n{statement}"
+
+
+def test_bill_pages_are_read_in_index_order(seeded):
+    group, bill, _ = seeded
+    statements = _statements_for(lambda: BillRepository().get_bills_page(group.id, 10, (bill.date, bill.id)))
+    connection = db.session.connection().connection.driver_connection
+    for statement, parameters in statements:
+        plan = [row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        assert any("ix_bills_group_id_date_id" in detail for detail in plan), plan
+        assert not any("TEMP B-TREE" in detail for detail in plan), plan
+
+
+def test_ledger_sums_read_only_covering_indexes(seeded):
+    group, _, _ = seeded
+    connection = db.session.connection().connection.driver_connection
+    for call in (lambda: GroupBalanceRepository().recompute(group.id),
+                 lambda: BillRepository().get_total_spending(group.id)):
+        for statement, parameters in _statements_for(call):
+            plan = [row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            bill_reads = [detail for detail in plan if re.match(r"^(SEARCH|SCAN) (bills|bill_participants)\b", detail)]
+            assert bill_reads, plan
+            assert all("COVERING INDEX" in detail for detail in bill_reads), plan
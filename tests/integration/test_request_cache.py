@@ -0,0 +1,68 @@
+from Splity.adapters.database import db
+from Splity.adapters.instrumentation import record_queries
+from Splity.adapters.repository import BillRepository, GroupRepository, UserRepository
+from Splity.domainmodel.models import User
+from Splity.services import groups_services
+
+
+def _group(app):
+    user_id = UserRepository().add(User(name="User One", username="user1", email="user1@test.com", password="x"))
+    groups_services.create_group("Cached", "Group", "USD", user_id)
+    return GroupRepository().get_by_name_and_creator("Cached", user_id), user_id
+
+
+def test_reads_hit_database_once_per_request(app):
+    group, _ = _group(app)
+    repo = GroupRepository()
+
+    with app.test_request_context():
+        app.preprocess_request()
+        with record_queries() as stats:
+            first = repo.get_by_id(group.id)
+            second = repo.get_by_id(group.id)
+            repo.get_group_members(group.id)
+            repo.get_group_members(group.id)
+            BillRepository().get_all_bills(group.id)
+            BillRepository().get_all_bills(group.id)
+        assert first is second
+        assert stats.count == 3
+
+
+def test_write_in_same_request_invalidates_reads(app):
+    group, _ = _group(app)
+    repo = GroupRepository()
+
+    with app.test_request_context():
+        app.preprocess_request()
+        assert repo.get_by_id(group.id).name == "Cached"
+        repo.edit_group_name(group.id, "Renamed")
+        assert repo.get_by_id(group.id).name == "Renamed"
+
+
+def test_reads_are_not_cached_outside_a_request(app):
+    group, _ = _group(app)
+    repo = GroupRepository()
+
+    with record_queries() as stats:
+        repo.get_by_id(group.id)
+        db.session.expire_all()
+        repo.get_by_id(group.id)
+    assert stats.count == 2
+
+
+def test_group_details_issues_each_query_once(authenticated_client):
+    authenticated_client.post('/create_group', data={
+        "name": "Details", "description": "Once", "currency": "USD"
+    }, follow_redirects=True)
+    creator = UserRepository().get_by_username("testuser")
+    group = GroupRepository().get_user_groups(creator.id)[0]
+    for i in range(3):
+        authenticated_client.post(f'/group/{group.id}/create_bill', data={
+            "description": f"Bill {i}", "names": ["Test User | @testuser"], "amount": 10
+        })
+
+    db.session.remove()
+    with record_queries() as stats:
+        authenticated_client.get(f'/group/{group.id}')
+
+    assert len(stats.statements) == len(set(stats.statements))
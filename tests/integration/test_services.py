@@ -42,3 +42,156 @@ def test_create_and_retrieve_group(app, client):
     # Ensure the group was created and can be looked up
     user_groups = groups_services.get_user_groups(user.id)
     assert any(g.name == "Ski Trip" for g in user_groups)
+
+
+def test_session_user_loader_caches_slim_user(app, client):
+    from Splity.services import authentication_services
+
+    client.post('/register', data={
+        "name": "Bob", "username": "bob", "email": "bob@test.com",
+        "password": "pass", "password2": "pass"
+    }, follow_redirects=True)
+    user_id = UserRepository().get_by_username("bob").id
+    groups_services.create_group("Ski Trip", "Fun", "USD", user_id)
+
+    first = authentication_services.load_session_user(user_id)
+    second = authentication_services.load_session_user(user_id)
+
+    # Same cached row, but each request gets its own instance
+    assert first is not second and first.id == second.id
+    first.set_name("Mutated")
+    assert authentication_services.load_session_user(user_id).name == "Bob"
+    first = second
+    assert first.name == "Bob"
+    assert first.password is None
+    assert first.groups == []
+    stats = authentication_services.session_user_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_session_user_cache_invalidated_by_user_write(app, client):
+    from Splity.adapters.database import db
+    from Splity.adapters.orm import UserORM
+    from Splity.services import authentication_services
+
+    client.post('/register', data={
+        "name": "Bob", "username": "bob", "email": "bob@test.com",
+        "password": "pass", "password2": "pass"
+    }, follow_redirects=True)
+    user_id = UserRepository().get_by_username("bob").id
+    assert authentication_services.load_session_user(user_id).name == "Bob"
+
+    db.session.get(UserORM, user_id).name = "Robert"
+    db.session.commit()
+
+    assert authentication_services.load_session_user(user_id).name == "Robert"
+
+
+def test_session_user_cache_invalidated_only_on_commit(app, client):
+    from Splity.adapters.database import db
+    from Splity.adapters.orm import UserORM
+    from Splity.services import authentication_services
+
+    client.post('/register', data={
+        "name": "Bob", "username": "bob", "email": "bob@test.com",
+        "password": "pass", "password2": "pass"
+    }, follow_redirects=True)
+    user_id = UserRepository().get_by_username("bob").id
+    authentication_services.load_session_user(user_id)
+    version = authentication_services._user_versions.get(user_id, 0)
+
+    db.session.get(UserORM, user_id).name = "Robert"
+    db.session.flush()
+    # Other connections still see Bob; a bump now would let them cache him as current
+    assert authentication_services._user_versions.get(user_id, 0) == version
+
+    db.session.rollback()
+    assert authentication_services._user_versions.get(user_id, 0) == version
+
+    db.session.get(UserORM, user_id).name = "Robert"
+    db.session.commit()
+    assert authentication_services._user_versions[user_id] == version + 1
+    assert authentication_services.load_session_user(user_id).name == "Robert"
+
+
+def test_session_user_cache_expires_writes_from_other_workers(app, client, monkeypatch):
+    from sqlalchemy import text
+
+    from Splity.adapters import cache
+    from Splity.adapters.database import db
+    from Splity.services import authentication_services
+
+    client.post('/register', data={
+        "name": "Bob", "username": "bob", "email": "bob@test.com",
+        "password": "pass", "password2": "pass"
+    }, follow_redirects=True)
+    user_id = UserRepository().get_by_username("bob").id
+    assert authentication_services.load_session_user(user_id).name == "Bob"
+
+    # Plain SQL fires no mapper events, like a write from another process
+    db.session.execute(text("UPDATE users SET name = 'Robert' WHERE id = :id"), {"id": user_id})
+    db.session.commit()
+    assert authentication_services.load_session_user(user_id).name == "Bob"
+
+    now = cache.time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + app.config["SESSION_USER_CACHE_TTL"] + 1)
+    assert authentication_services.load_session_user(user_id).name == "Robert"
+
+
+def test_login_manager_uses_session_user_cache(app, client, assert_max_queries):
+    from Splity import load_user
+    from Splity.services import authentication_services
+
+    client.post('/register', data={
+        "name": "Bob", "username": "bob", "email": "bob@test.com",
+        "password": "pass", "password2": "pass"
+    }, follow_redirects=True)
+    user_id = UserRepository().get_by_username("bob").id
+
+    load_user(str(user_id))
+    with assert_max_queries(0):
+        assert load_user(str(user_id)).username == "bob"
+    assert authentication_services.session_user_cache_stats()["hits"] == 1
+
+
+
+def test_require_membership_checks_with_single_query(app, client, assert_max_queries):
+    client.post('/register', data={
+        "name": "Bob", "username": "bob", "email": "bob@test.com",
+        "password": "pass", "password2": "pass"
+    }, follow_redirects=True)
+    client.post('/register', data={
+        "name": "Eve", "username": "eve", "email": "eve@test.com",
+        "password": "pass", "password2": "pass"
+    }, follow_redirects=True)
+    bob = UserRepository().get_by_username("bob")
+    eve = UserRepository().get_by_username("eve")
+    groups_services.create_group("Ski Trip", "Fun", "USD", bob.id)
+    group_id = groups_services.get_user_groups(bob.id)[0].id
+
+    with assert_max_queries(1):
+        groups_services.require_membership(group_id, bob.id)
+
+    with pytest.raises(groups_services.GroupServiceException) as exc:
+        groups_services.require_membership(group_id, eve.id)
+    assert "You are not in Group Ski Trip" in str(exc.value)
+
+    with pytest.raises(groups_services.GroupServiceException) as exc:
+        groups_services.require_membership(9999, bob.id)
+    assert "Group not found" in str(exc.value)
+
+
+def test_authenticate_returns_slim_user_in_one_query(app, client, assert_max_queries):
+    from Splity.services import authentication_services
+    client.post('/register', data={
+        "name": "Bob", "username": "bob", "email": "bob@test.com",
+        "password": "pass", "password2": "pass"
+    }, follow_redirects=True)
+    groups_services.create_group("Ski Trip", "Fun", "USD", UserRepository().get_by_username("bob").id)
+
+    with assert_max_queries(1):
+        user = authentication_services.authenticate_user_service("bob", "pass")
+    assert (user.username, user.password, user.groups) == ("bob", None, [])
+
+    with pytest.raises(authentication_services.AuthenticationException):
+        authentication_services.authenticate_user_service("bob", "wrong")
@@ -0,0 +1,121 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from Splity.adapters.database import db
+from Splity.adapters.repository import BillRepository, GroupBalanceRepository, GroupRepository, UserRepository
+from Splity.adapters.unit_of_work import UnitOfWork
+from Splity.domainmodel.models import User
+from Splity.services import bill_services, groups_services
+
+
+@pytest.fixture
+def group(file_app):
+    user_repo = UserRepository()
+    with UnitOfWork():
+        user_ids = [
+            user_repo.add(User(name=f"User {i}", username=f"user{i}", email=f"user{i}@test.com", password="x"))
+            for i in range(4)
+        ]
+    group = groups_services.create_group("Stress", "Group", "USD", user_ids[0])
+    for user_id in user_ids[1:]:
+        groups_services.join_group(group.invite_code, user_id)
+    group_id = GroupRepository().get_by_invite_code(group.invite_code).id
+    for i in range(30):
+        bill_services.add_bill_service(user_ids[i % 4], f"Seed {i}", "12.00", user_ids, group_id)
+    # Workers get their own sessions; leave nothing open on this one
+    db.session.remove()
+    return group_id, user_ids
+
+
+def _pragma(name):
+    return db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_file_database_gets_production_profile(file_app):
+    assert _pragma("journal_mode") == "wal"
+    assert _pragma("synchronous") == 1  # NORMAL
+    assert _pragma("busy_timeout") == file_app.config["SQLITE_PRAGMAS"]["busy_timeout"]
+    assert _pragma("cache_size") == file_app.config["SQLITE_PRAGMAS"]["cache_size"]
+    assert isinstance(db.engine.pool, QueuePool)
+    assert db.engine.pool.size() == file_app.config["SQLALCHEMY_ENGINE_OPTIONS"]["pool_size"]
+
+
+def test_in_memory_database_keeps_its_single_connection(app):
+    assert isinstance(db.engine.pool, StaticPool)
+
+
+def test_bill_commits_while_an_export_is_streaming(file_app, group):
+    group_id, user_ids = group
+    streaming, written = threading.Event(), threading.Event()
+    exported = []
+
+    def export():
+        with file_app.app_context():
+            batches = BillRepository().iter_ledger_rows(group_id, batch_size=10)
+            exported.extend(next(batches))
+            streaming.set()
+            written.wait(10)
+            for batch in batches:
+                exported.extend(batch)
+
+    reader = threading.Thread(target=export)
+    reader.start()
+    try:
+        assert streaming.wait(10)
+        # Before WAL this waited out the busy timeout on the open read, then failed
+        bill_services.add_bill_service(user_ids[0], "During export", "10.00", user_ids, group_id)
+    finally:
+        written.set()
+        reader.join()
+    # The export reads one snapshot: the bill written meanwhile is not in it
+    assert len(exported) == 30 * len(user_ids)
+    assert BillRepository().get_bill_by_name_and_group_id("During export", group_id) is not None
+
+
+def test_reads_keep_flowing_while_writers_commit(file_app, group):
+    group_id, user_ids = group
+    writers, bills_each = 3, 15
+    errors, reads = [], []
+    writing = threading.Event()
+    done = threading.Event()
+
+    def write(n):
+        with file_app.app_context():
+            writing.set()
+            for i in range(bills_each):
+                try:
+                    bill_services.add_bill_service(user_ids[n], f"Writer {n} bill {i}", "10.00", user_ids, group_id)
+                except Exception as e:
+                    errors.append(e)
+                db.session.remove()
+
+    def read():
+        writing.wait(10)
+        with file_app.app_context():
+            while not done.is_set():
+                try:
+                    bill_services.get_bills_page_service(group_id, None, 20)
+                    GroupBalanceRepository().get_net_cents(group_id)
+                    reads.append(1)
+                except Exception as e:
+                    errors.append(e)
+                db.session.remove()
+
+    write_threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+    read_threads = [threading.Thread(target=read) for _ in range(3)]
+    for thread in read_threads + write_threads:
+        thread.start()
+    for thread in write_threads:
+        thread.join()
+    reads_during_writes = len(reads)
+    done.set()
+    for thread in read_threads:
+        thread.join()
+
+    assert not errors, errors[:3]
+    assert reads_during_writes > 0
+    assert len(BillRepository().get_all_bills(group_id)) == 30 + writers * bills_each
+    assert sum(GroupBalanceRepository().get_net_cents(group_id).values()) == 0
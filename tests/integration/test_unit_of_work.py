@@ -0,0 +1,70 @@
+import pytest
+
+from Splity.adapters.database import db
+from Splity.adapters.instrumentation import record_queries
+from Splity.adapters.repository import GroupRepository, UserRepository
+from Splity.adapters.unit_of_work import UnitOfWork
+from Splity.domainmodel.models import User
+from Splity.services import groups_services
+
+
+def _setup_group(app):
+    with UnitOfWork():
+        user_id = UserRepository().add(User(name="User One", username="user1", email="user1@test.com",
+                                            password="x"))
+    group = groups_services.create_group("Trip", "Original", "USD", user_id)
+    return user_id, GroupRepository().get_by_name_and_creator("Trip", user_id)
+
+
+def test_edit_group_commits_name_and_description_once(app):
+    user_id, group = _setup_group(app)
+
+    with record_queries() as stats:
+        groups_services.edit_group("Renamed", "Edited", group.id, user_id)
+
+    assert stats.commits == 1
+    db.session.expire_all()
+    group = GroupRepository().get_by_id(group.id)
+    assert (group.name, group.description) == ("Renamed", "Edited")
+
+
+def test_unit_of_work_rolls_back_flushed_writes_on_error(app):
+    user_id, group = _setup_group(app)
+    repo = GroupRepository()
+
+    with pytest.raises(RuntimeError):
+        with UnitOfWork():
+            repo.edit_group_name(group.id, "Half done")
+            raise RuntimeError("boom")
+
+    db.session.expire_all()
+    assert repo.get_by_id(group.id).name == "Trip"
+
+
+def test_rollback_drops_reads_memoised_inside_the_failed_unit(app):
+    user_id, group = _setup_group(app)
+    repo = GroupRepository()
+
+    with app.test_request_context():
+        app.preprocess_request()
+        with pytest.raises(RuntimeError):
+            with UnitOfWork():
+                repo.edit_group_name(group.id, "Half done")
+                assert repo.get_by_id(group.id).name == "Half done"
+                raise RuntimeError("boom")
+
+        assert repo.get_by_id(group.id).name == "Trip"
+
+
+def test_nested_units_commit_once_at_the_outermost(app):
+    user_id, group = _setup_group(app)
+    repo = GroupRepository()
+
+    with record_queries() as stats:
+        with UnitOfWork():
+            with UnitOfWork():
+                repo.edit_group_name(group.id, "Inner")
+            assert stats.commits == 0
+            repo.edit_group_description(group.id, "Outer")
+
+    assert stats.commits == 1
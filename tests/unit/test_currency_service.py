@@ -1,3 +1,9 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
 from Splity.services import currency_service
 
 
@@ -12,3 +18,89 @@ def test_get_currency_fallback_on_failure(monkeypatch):
     assert ("USD", "US Dollar") in currencies
     assert ("EUR", "Euro") in currencies
     assert ("GBP", "British Pound") in currencies
+
+
+@pytest.fixture
+def currency_server():
+    """Local stand-in for the currency CDN."""
+    state = {"payload": {"usd": "US Dollar", "nzd": "New Zealand Dollar"}, "hits": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["hits"] += 1
+            body = json.dumps(state["payload"]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/currencies.json"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def _closed_port_url():
+    server = HTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    port = server.server_port
+    server.server_close()
+    return f"http://127.0.0.1:{port}/currencies.json"
+
+
+def test_catalogue_serves_bundled_snapshot_offline(tmp_path):
+    catalogue = currency_service.CurrencyCatalogue(snapshot_path=str(tmp_path / "currencies.json"),
+                                                   url=_closed_port_url(), timeout=1)
+
+    assert catalogue.refresh() is False
+    choices = catalogue.choices()
+    assert ("USD", "US Dollar") in choices
+    assert len(choices) > 100
+    assert not (tmp_path / "currencies.json").exists()
+
+
+def test_catalogue_refresh_updates_memory_and_disk(tmp_path, currency_server):
+    snapshot = tmp_path / "currencies.json"
+    catalogue = currency_service.CurrencyCatalogue(snapshot_path=str(snapshot), url=currency_server["url"])
+
+    assert catalogue.refresh() is True
+    assert catalogue.choices() == [("USD", "US Dollar"), ("NZD", "New Zealand Dollar")]
+    assert json.loads(snapshot.read_text()) == currency_server["payload"]
+    assert not catalogue.is_stale()
+
+    # A fresh process starts from the persisted snapshot without any request
+    restarted = currency_service.CurrencyCatalogue(snapshot_path=str(snapshot), url=_closed_port_url())
+    assert restarted.choices() == [("USD", "US Dollar"), ("NZD", "New Zealand Dollar")]
+    assert not restarted.is_stale()
+    assert currency_server["hits"] == 1
+
+
+def test_catalogue_rejects_bad_payload(tmp_path, currency_server):
+    currency_server["payload"] = []
+    catalogue = currency_service.CurrencyCatalogue(snapshot_path=str(tmp_path / "currencies.json"),
+                                                   url=currency_server["url"])
+
+    assert catalogue.refresh() is False
+    assert ("USD", "US Dollar") in catalogue.choices()
+
+
+def test_background_thread_refreshes_stale_catalogue(tmp_path, currency_server):
+    catalogue = currency_service.CurrencyCatalogue(snapshot_path=str(tmp_path / "currencies.json"),
+                                                   url=currency_server["url"], ttl=3600)
+    catalogue.start()
+    try:
+        for _ in range(100):
+            if currency_server["hits"]:
+                break
+            threading.Event().wait(0.05)
+    finally:
+        catalogue.stop()
+
+    assert currency_server["hits"] == 1
+    assert ("NZD", "New Zealand Dollar") in catalogue.choices()
@@ -0,0 +1,66 @@
+from Splity.adapters.cache import FragmentCache
+
+
+def test_hit_only_for_the_same_version():
+    cache = FragmentCache(maxsize=8)
+    cache.set("group-1", 3, "<p>v3</p>")
+
+    assert cache.get("group-1", 3) == "<p>v3</p>"
+    assert cache.get("group-1", 4) is None
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+def test_get_or_set_renders_once_per_version():
+    cache = FragmentCache(maxsize=8)
+    renders = []
+
+    def render():
+        renders.append(1)
+        return {"html": "<ul></ul>"}
+
+    assert cache.get_or_set("group-1", 0, render) == ({"html": "<ul></ul>"}, False)
+    assert cache.get_or_set("group-1", 0, render) == ({"html": "<ul></ul>"}, True)
+    cache.get_or_set("group-1", 1, render)
+    assert len(renders) == 2
+
+
+def test_memory_is_bounded():
+    cache = FragmentCache(maxsize=2)
+    for group_id in range(5):
+        cache.set(f"group-{group_id}", 0, "x")
+
+    assert cache.stats()["size"] == 2
+    assert cache.get("group-0", 0) is None
+    assert cache.get("group-4", 0) == "x"
+
+
+def test_disk_is_shared_between_caches(tmp_path):
+    writer = FragmentCache(maxsize=8, directory=str(tmp_path))
+    reader = FragmentCache(maxsize=8, directory=str(tmp_path))
+    writer.set("group-1", 2, {"total": 12.5})
+
+    assert reader.get("group-1", 2) == {"total": 12.5}
+    assert reader.get("group-1", 3) is None
+    assert reader.stats()["disk_hits"] == 1
+
+    # A newer version replaces the file rather than adding another
+    writer.set("group-1", 3, {"total": 20.0})
+    assert reader.get("group-1", 3) == {"total": 20.0}
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_discard_and_prune_remove_files(tmp_path):
+    cache = FragmentCache(maxsize=8, directory=str(tmp_path))
+    for name in ("group-1", "group-2", "group-3", "group-3-bills-2024_01_01_9-50"):
+        cache.set(name, 0, "x")
+
+    cache.set("group-1", 1, "y")
+    cache.discard("group-1")
+    cache.discard("group-1")  # already gone
+    assert not (tmp_path / "group-1.json").exists()
+    # Every version goes from memory too, not just the file
+    assert cache.get("group-1", 0) is None and cache.get("group-1", 1) is None
+
+    assert cache.prune(["group-2", "group-4"]) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["group-2.json"]
+    assert FragmentCache(maxsize=8).prune(["group-2"]) == 0
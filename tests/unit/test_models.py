@@ -1,10 +1,28 @@
-from Splity.domainmodel.models import Group, User
+import pytest
+
+from Splity.domainmodel.models import BillSummary, Group, User
 
 def test_new_group_generates_invite_code():
-    group = Group(name="Trip", description="Italy", currency="EUR", creator_id=1)
+    group = Group.create(name="Trip", description="Italy", currency="EUR", creator_id=1)
     assert len(group.invite_code) == 6
     # assert group.invite_code.isupper()
 
+def test_loaded_group_keeps_its_invite_code():
+    assert Group(name="Trip", description="Italy", currency="EUR", invite_code="ABC123").invite_code == "ABC123"
+    assert Group(name="Trip", description="Italy", currency="EUR").invite_code is None
+
 def test_user_get_id_returns_string():
     user = User("Alice", "alice", "a@a.com", user_id=99)
-    assert user.get_id() == "99"
\ No newline at end of file
+    assert user.get_id() == "99"
+
+def test_entities_have_no_instance_dict():
+    user = User("Alice", "alice", "a@a.com", user_id=99)
+    assert not hasattr(user, "__dict__")
+    with pytest.raises(AttributeError):
+        user.nickname = "Al"
+
+def test_bill_summary_is_read_only():
+    bill = BillSummary(1, 2, "Dinner", 1250, None, 3)
+    assert (bill.id, bill.amount) == (1, 1250)
+    with pytest.raises(AttributeError):
+        bill.amount = 0
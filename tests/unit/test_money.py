@@ -0,0 +1,52 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from Splity.domainmodel import money
+
+
+def test_exponent_follows_the_currency():
+    assert money.exponent("USD") == 2
+    assert money.exponent("jpy") == 0
+    assert money.exponent("KWD") == 3
+    assert money.exponent("BTC") == money.DEFAULT_EXPONENT
+
+
+def test_to_minor_is_exact_and_refuses_to_round():
+    assert money.to_minor(Decimal("12.50"), 2) == 1250
+    assert money.to_minor("0.1", 2) == 10
+    assert money.to_minor(0.29, 2) == 29
+    assert money.to_minor("1250", 0) == 1250
+    with pytest.raises(ValueError, match="at most 2 decimal"):
+        money.to_minor("10.005", 2)
+    with pytest.raises(ValueError, match="at most 0 decimal"):
+        money.to_minor("10.5", 0)
+    for bad in ("abc", "", "NaN", "Infinity"):
+        with pytest.raises(ValueError, match="Invalid amount"):
+            money.to_minor(bad, 2)
+
+
+def test_format_amount_uses_the_currency_decimals():
+    assert money.format_amount(1250, "USD") == "12.50"
+    assert money.format_amount(-5, "USD") == "-0.05"
+    assert money.format_amount(1250, "JPY") == "1250"
+    assert money.format_amount(1250, "KWD") == "1.250"
+    assert money.to_major(1250, 2) == 12.5
+
+
+def test_split_evenly_spreads_the_remainder_to_the_lowest_ids():
+    assert money.split_evenly(1000, [7, 3, 5]) == [(7, 333), (3, 334), (5, 333)]
+    assert money.split_evenly(1001, [7, 3, 5]) == [(7, 333), (3, 334), (5, 334)]
+    assert money.split_evenly(2, [1, 2, 3]) == [(1, 1), (2, 1), (3, 0)]
+    assert money.split_evenly(500, []) == []
+
+
+def test_split_evenly_always_adds_up():
+    rng = random.Random(4217)
+    for _ in range(500):
+        total = rng.randint(1, 10 ** 7)
+        user_ids = rng.sample(range(1, 100), rng.randint(1, 12))
+        shares = [share for _, share in money.split_evenly(total, user_ids)]
+        assert sum(shares) == total
+        assert max(shares) - min(shares) <= 1
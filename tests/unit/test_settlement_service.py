@@ -0,0 +1,104 @@
+import random
+
+from Splity.services import settlement_service
+
+
+def _legacy_greedy(balances):
+    """The original settling_algorithm loop, keyed by user id instead of name."""
+    balances = dict(balances)
+    texts = []
+    while max(balances.values()) > 0.01:
+        debtor_id, debtor_bal = min(balances.items(), key=lambda x: x[1])
+        creditor_id, creditor_bal = max(balances.items(), key=lambda x: x[1])
+        amount_to_transfer = min(abs(debtor_bal), creditor_bal)
+        balances[debtor_id] += amount_to_transfer
+        balances[creditor_id] -= amount_to_transfer
+        texts.append([debtor_id, round(amount_to_transfer, 2), creditor_id])
+    return texts
+
+
+def _random_balances(rng, size):
+    # Minor units, as the ledger stores them
+    balances = {user_id: rng.randint(-50000, 50000) for user_id in range(1, size)}
+    balances[size] = -sum(balances.values())
+    return balances
+
+
+def test_settle_balances_matches_legacy_greedy():
+    rng = random.Random(235)
+    for size in (2, 3, 5, 10, 25, 60):
+        for _ in range(20):
+            balances = _random_balances(rng, size)
+            assert settlement_service.settle_balances(balances) == _legacy_greedy(balances)
+
+
+def test_settle_balances_matches_legacy_greedy_with_ties():
+    balances = {1: 3000, 2: 3000, 3: -2000, 4: -2000, 5: -2000, 6: 0}
+    assert settlement_service.settle_balances(balances) == _legacy_greedy(balances)
+
+
+def test_settle_balances_keeps_each_user_id_separate():
+    # Keyed by user id, so two creditors never merge; the same-name case
+    # through settling_algorithm is covered in the integration tests
+    balances = {1: 2500, 2: -2500, 3: 1000, 4: -1000}
+    transfers = settlement_service.settle_balances(balances)
+    assert transfers == [[2, 2500, 1], [4, 1000, 3]]
+
+
+def test_settle_balances_everyone_even():
+    assert settlement_service.settle_balances({1: 0, 2: 0}) == []
+
+
+def _settles_everyone(balances, transfers):
+    remaining = dict(balances)
+    for debtor_id, amount, creditor_id in transfers:
+        remaining[debtor_id] += amount
+        remaining[creditor_id] -= amount
+    return all(balance == 0 for balance in remaining.values())
+
+
+def test_simplify_balances_uses_fewer_transfers_than_greedy():
+    balances = {1: -600, 2: -500, 3: -200, 4: -900, 5: 700, 6: 1500}
+    greedy = settlement_service.settle_balances(balances)
+    simplified = settlement_service.simplify_balances(balances)
+    assert len(greedy) == 5
+    assert len(simplified) == 4
+    assert _settles_everyone(balances, simplified)
+
+
+def test_simplify_balances_settles_independent_subgroups_separately():
+    balances = {1: 1000, 2: -1000, 3: 700, 4: -300, 5: -400}
+    transfers = settlement_service.simplify_balances(balances)
+    assert transfers == [[2, 1000, 1], [5, 400, 3], [4, 300, 3]]
+
+
+def test_simplify_balances_never_worse_than_greedy():
+    rng = random.Random(42)
+    for size in (3, 6, 9, 12):
+        for _ in range(10):
+            balances = {user_id: rng.randint(-2000, 2000) for user_id in range(1, size)}
+            balances[size] = -sum(balances.values())
+            simplified = settlement_service.simplify_balances(balances)
+            assert len(simplified) <= len(settlement_service.settle_balances(balances))
+            assert _settles_everyone(balances, simplified)
+
+
+def test_simplify_balances_falls_back_to_greedy_when_out_of_time():
+    balances = {user_id: user_id * 100 for user_id in range(1, 15)}
+    balances[15] = -sum(balances.values())
+    assert settlement_service.simplify_balances(balances, time_budget=0) == settlement_service.settle_balances(balances)
+
+
+def test_simplify_balances_falls_back_to_greedy_for_large_groups():
+    balances = _random_balances(random.Random(7), settlement_service.SIMPLIFY_MAX_BALANCES + 5)
+    assert settlement_service.simplify_balances(balances) == settlement_service.settle_balances(balances)
+
+
+def test_settle_balances_leaves_nobody_owing_a_fraction():
+    # Float balances used to leave 0.0000001-style residue that a 0.01
+    # threshold had to swallow; integer minor units settle to exactly zero
+    rng = random.Random(11)
+    for size in (2, 5, 30):
+        for _ in range(20):
+            balances = _random_balances(rng, size)
+            assert _settles_everyone(balances, settlement_service.settle_balances(balances))